@@ -0,0 +1,72 @@
+"""
+Benchmark du chargement à froid de l'historique de la page Performance.
+
+Compare l'ancienne boucle séquentielle (une requête history() par ticker)
+à la requête groupée de data_loader.fetch_history_batch (portefeuille + indices).
+
+Usage:
+    python benchmarks/bench_historical_data.py --start 2015-01-01 --repeat 3
+
+Hors ligne, avec le fournisseur rejoué et une latence simulée :
+    python benchmarks/bench_historical_data.py --replay data/replay --latency 0.3
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+os.chdir(ROOT)
+
+import pandas as pd
+
+from data_loader import fetch_history_batch
+from market_data import ReplayProvider, get_provider, set_provider
+
+INDICES = ["^FCHI", "^GSPC", "^IXIC", "^STOXX50E"]
+
+
+def sequential_history(tickers, start_date, end_date):
+    """Ancien chemin : un aller-retour réseau par ticker."""
+    data = {}
+    for ticker in tickers:
+        data[ticker] = get_provider().history(ticker, start=start_date, end=end_date)
+    return data
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--start", default="2023-01-01")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--replay", help="Dossier de données rejouées (hors ligne)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence simulée par requête (s)")
+    args = parser.parse_args()
+
+    if args.replay:
+        set_provider(ReplayProvider(args.replay, latency=args.latency))
+
+    portfolio = pd.read_csv("data/Portefeuille_10_business_models.csv")["Ticker"].tolist()
+    tickers = portfolio + INDICES
+    start_date = datetime.fromisoformat(args.start)
+    end_date = datetime.now()
+
+    print(f"{len(tickers)} tickers depuis {start_date:%Y-%m-%d}, {args.repeat} répétitions")
+    for name, fn in [("boucle séquentielle", sequential_history), ("requête groupée", fetch_history_batch)]:
+        durations = []
+        for _ in range(args.repeat):
+            elapsed, data = timed(fn, tickers, start_date, end_date)
+            durations.append(elapsed)
+        rows = sum(len(h) for h in data.values())
+        print(f"{name:<22} min {min(durations):6.2f}s  moy {sum(durations) / len(durations):6.2f}s  ({rows} lignes)")
+
+
+if __name__ == "__main__":
+    main()
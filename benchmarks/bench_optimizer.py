@@ -0,0 +1,71 @@
+"""
+Temps de résolution de l'optimiseur de pondérations à 10, 100 et 500 titres.
+
+Pour chaque taille, mesure la première résolution (démarrage à froid) puis
+une nouvelle résolution après une légère mise à jour des estimations
+(démarrage à chaud, comme lors d'un changement de date ou d'un nouveau
+point de frontière). Les rendements et la covariance sont tirés d'un
+modèle à facteurs synthétique : aucune donnée de marché n'est nécessaire.
+
+Usage:
+    python benchmarks/bench_optimizer.py --sizes 10 100 500 --frontier 25
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+os.chdir(ROOT)
+
+import numpy as np
+
+from optimizer import PortfolioOptimizer
+
+PROBLEMS = ["min_variance", "max_sharpe", "risk_parity"]
+
+
+def synthetic_moments(n, rng, factors=5):
+    """Rendements quotidiens moyens et covariance d'un modèle à facteurs."""
+    loadings = rng.normal(0, 0.01, (n, factors))
+    cov = loadings @ loadings.T + np.diag(rng.uniform(1e-4, 4e-4, n))
+    mean = rng.normal(4e-4, 3e-4, n)
+    return mean, cov
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="*", type=int, default=[10, 100, 500])
+    parser.add_argument("--frontier", type=int, default=25, help="Points de frontière efficiente")
+    parser.add_argument("--max-weight", type=float, default=None,
+                        help="Pondération maximale (défaut : max(0.05, 2 / n))")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'titres':>6} {'problème':<14} {'froid':>9} {'chaud':>9}")
+    for n in args.sizes:
+        mean, cov = synthetic_moments(n, rng)
+        hi = args.max_weight or max(0.05, 2 / n)
+        optimizer = PortfolioOptimizer(mean, cov, bounds=(0.0, hi))
+        for problem in PROBLEMS:
+            _, cold = timed(getattr(optimizer, problem))
+            # Estimations légèrement modifiées (une séance de plus)
+            optimizer.update(mean * 1.01, cov * 1.005)
+            _, warm = timed(getattr(optimizer, problem))
+            optimizer.update(mean, cov)
+            print(f"{n:>6} {problem:<14} {cold:8.3f}s {warm:8.3f}s")
+
+        frontier, elapsed = timed(optimizer.efficient_frontier, args.frontier)
+        print(f"{n:>6} {'frontière':<14} {elapsed:8.3f}s  ({len(frontier)} points, {elapsed / len(frontier) * 1000:.0f} ms/point)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Nombre d'appels au fournisseur et durée de get_stock_data(detailed=True).
+
+La fiche détaillée d'une société doit provenir d'un seul appel .info et
+d'un seul historique sur 1 an. Le script échoue si ce n'est plus le cas.
+
+Usage:
+    python src/market_data.py synthetic GOOGL RR.L --root data/replay
+    python benchmarks/bench_stock_snapshot.py --replay data/replay --latency 0.3
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+os.chdir(ROOT)
+
+import pandas as pd
+
+import price_store
+from data_loader import get_stock_data
+from market_data import ReplayProvider, set_provider
+from shared_cache import SharedCache, set_shared_cache
+
+EXPECTED_CALLS = {"info": 1, "history": 1}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--replay", default="data/replay", help="Dossier de données rejouées")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence simulée par requête (s)")
+    parser.add_argument("--tickers", nargs="*")
+    args = parser.parse_args()
+
+    tickers = args.tickers or pd.read_csv("data/Portefeuille_10_business_models.csv")["Ticker"].tolist()
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for ticker in tickers:
+            # Cache partagé et stockage des historiques vides : chaque ticker
+            # part d'un démarrage à froid, sans toucher au dossier data/
+            set_shared_cache(SharedCache(os.path.join(tmp, f"{ticker}.sqlite")))
+            price_store.PRICE_STORE_DIR = os.path.join(tmp, ticker, "prices")
+            provider = ReplayProvider(args.replay, latency=args.latency)
+            set_provider(provider)
+            get_stock_data.clear()
+
+            t0 = time.perf_counter()
+            get_stock_data(ticker, detailed=True)
+            elapsed = time.perf_counter() - t0
+
+            calls = dict(provider.calls)
+            print(f"{ticker:<10} {elapsed:6.3f}s  appels: {calls}")
+            if calls != EXPECTED_CALLS:
+                failures.append(ticker)
+
+    if failures:
+        sys.exit(f"Appels inattendus (attendu {EXPECTED_CALLS}) pour : {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    main()
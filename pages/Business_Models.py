@@ -9,8 +9,8 @@ import streamlit.components.v1 as components
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 
 # Importer les modules personnalisés
-from data_loader import load_portfolio_data, get_stock_data, load_sector_country_data
-from stock_utils import get_currency_mapping, get_dividend_yields, determine_currency
+from data_loader import load_portfolio_data, get_stock_data, get_quotes, load_sector_country_data, get_returns_table
+from stock_utils import get_currency_mapping, determine_currency
 from ui_components import apply_custom_css, create_scrolling_ticker, create_title, create_footer
 from visualization import create_stock_chart, create_portfolio_table
 
@@ -75,17 +75,9 @@ st.markdown("---")
 # Chargement des données
 portfolio_df = load_portfolio_data()
 currency_mapping = get_currency_mapping()
-dividend_yields = get_dividend_yields()
-
-@st.cache_data(ttl=60)
-def get_all_stock_data(tickers):
-    d = {}
-    for t in tickers:
-        d[t] = get_stock_data(t)
-    return d
 
 tickers = portfolio_df['Ticker'].tolist()
-stock_data_dict = get_all_stock_data(tickers)
+stock_data_dict = get_quotes(tickers)
 
 # Charger les données secteur/pays
 df_sc = load_sector_country_data(tickers)
@@ -113,6 +105,9 @@ business_model = company_data['Business_models']
 # Récupérer les données boursières et financières
 stock_data = get_stock_data(ticker, detailed=True)
 
+# Rendements par horizon : lecture dans le tableau calculé une fois par jour
+ticker_returns = get_returns_table().reindex([ticker]).iloc[0]
+
 # Récupérer la devise
 currency = determine_currency(ticker)
 
@@ -141,7 +136,7 @@ cols = st.columns(5)
 metrics = [
     ("Valorisation",   stock_data["pe_ratio"],        "PER",        False),
     ("Rendement",      stock_data["dividend_yield"],  "Dividende",  True),
-    ("Performance",    stock_data["ytd_change"],      "YTD",        True),
+    ("Performance",    ticker_returns["YTD"],         "YTD",        True),
     ("BPA",            stock_data["eps"],             "Par action", False),
     ("Capitalisation", stock_data["market_cap"],      "Milliards",  False),
 ]
@@ -149,7 +144,7 @@ beige = "#f9f5f2"
 
 for col, (title, val, subtitle, is_pct) in zip(cols, metrics):
     color = "#28a745" if is_pct and val >= 0 else "#dc3545" if is_pct else "#102040"
-    disp  = f"{val:+.2f}%" if is_pct else f"{val:.2f}"
+    disp  = "–" if pd.isna(val) else f"{val:+.2f}%" if is_pct else f"{val:.2f}"
     with col:
         st.markdown(f"""
         <div style="background:{beige}; padding:20px; border-radius:10px; text-align:center;">
@@ -158,6 +153,19 @@ for col, (title, val, subtitle, is_pct) in zip(cols, metrics):
           <div style="font-size:14px; color:#888;">{subtitle}</div>
         </div>
         """, unsafe_allow_html=True)
+
+# Rendements sur tous les horizons
+horizon_cells = "".join(
+    f'<div style="flex:1; text-align:center;">'
+    f'<div style="font-size:13px; color:#693112;">{label}</div>'
+    f'<div style="font-size:17px; font-weight:bold; color:{"#888" if pd.isna(value) else "#28a745" if value >= 0 else "#dc3545"};">'
+    f'{"–" if pd.isna(value) else f"{value:+.2f}%"}</div></div>'
+    for label, value in ticker_returns.drop("Dernière séance").items()
+)
+st.markdown(
+    f'<div style="display:flex; background:{beige}; padding:12px; border-radius:10px; margin-top:15px;">{horizon_cells}</div>',
+    unsafe_allow_html=True
+)
 st.markdown('</div>', unsafe_allow_html=True)
 
 # Performance sur 52 semaines
@@ -166,8 +174,8 @@ st.markdown('<div class="section-title">Performance sur 52 semaines</div>', unsa
 
 hist = stock_data.get("history", pd.DataFrame())
 if not hist.empty:
-    sel, *_ = st.radio("Période", ["1 mois","6 mois","1 an"], horizontal=True, index=2)
-    fig, *_ = create_stock_chart(hist, ticker, currency, sel)
+    # Période choisie par les boutons du graphique, sans nouvelle exécution
+    fig, *_ = create_stock_chart(hist, ticker, currency)
     st.plotly_chart(fig, use_container_width=True)
 else:
     st.warning("Données historiques non disponibles pour cette action.")
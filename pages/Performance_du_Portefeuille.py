@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
@@ -13,7 +12,27 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 
 # Importer les modules personnalisés
-from data_loader import load_portfolio_data
+from data_loader import (
+    load_portfolio_data, get_market_returns, get_cumulative_returns, get_risk_metrics, get_rolling_stats,
+    get_monte_carlo, get_return_moments, get_optimal_weights, get_efficient_frontier, get_value_at_risk,
+    get_attribution, get_returns_table, get_quotes, load_sector_country_data, load_watchlist_data,
+    REFERENCE_INDICES
+)
+from visualization import (
+    plot_performance, plot_portfolio_simulation, calculate_portfolio_stats, plot_rolling_metric,
+    plot_monte_carlo, plot_correlation_heatmap, plot_efficient_frontier, plot_var_contributions,
+    plot_brinson
+)
+from cache_keys import cache_stats
+from stock_utils import get_currency_mapping
+from fx import BASE_CURRENCY
+from nav_engine import REBALANCING_LABELS
+from rolling_stats import ROLLING_WINDOWS
+from monte_carlo import MONTE_CARLO_METHODS
+from risk_metrics import TRADING_DAYS
+from covariance import ESTIMATORS, to_correlation
+from optimizer import OPTIMIZATION_METHODS
+from value_at_risk import VAR_METHODS
 from ui_components import apply_custom_css
 
 # Configuration de la page Streamlit
@@ -74,18 +93,7 @@ st.markdown("""
 portfolio_df = load_portfolio_data()
 
 # Mapping des devises pour chaque ticker
-currency_mapping = {
-    "GOOGL": "$",      # Alphabet (USD)
-    "ERF.PA": "€",     # Eurofins Scientific (EUR)
-    "GTT.PA": "€",     # Gaztransport & Technigaz (EUR)
-    "GD": "$",         # General Dynamics (USD)
-    "ROG.SW": "CHF",   # Roche Holding (CHF)
-    "RR.L": "£",       # Rolls-Royce Holdings (GBP)
-    "UBSG.SW": "CHF",  # UBS Group (CHF)
-    "VIE.PA": "€",     # Veolia Environnement (EUR)
-    "RIO.L": "£",      # Rio Tinto (GBP)
-    "OTIS": "$"        # Otis Worldwide (USD)
-}
+currency_mapping = get_currency_mapping()
 
 # Titre principal
 st.markdown("<h1 style='font-size: 32px; margin-bottom: 10px;'>Komorebi - Performance du Portefeuille 10 valeurs <span style='font-size: 18px;'>(page 2/3)</span></h1>", unsafe_allow_html=True)
@@ -104,48 +112,16 @@ with col3:
 
 st.markdown("---")
 
-# Fonction pour obtenir les données boursières actuelles
-@st.cache_data(ttl=60)
-def get_stock_data(ticker):
-    try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        
-        current_price = info.get('currentPrice', info.get('regularMarketPrice', 0))
-        previous_close = info.get('previousClose', info.get('regularMarketPreviousClose', 0))
-        change = current_price - previous_close
-        percent_change = (change / previous_close) * 100 if previous_close else 0
-        
-        return {
-            'current_price': current_price,
-            'previous_close': previous_close,
-            'change': change,
-            'percent_change': percent_change
-        }
-    except Exception as e:
-        import random
-        current_price = random.uniform(500, 1000)
-        previous_close = current_price * random.uniform(0.95, 1.05)
-        change = current_price - previous_close
-        percent_change = (change / previous_close) * 100
-        
-        return {
-            'current_price': current_price,
-            'previous_close': previous_close,
-            'change': change,
-            'percent_change': percent_change
-        }
-
 # Création du bandeau défilant
-def create_scrolling_ticker():
+def create_scrolling_ticker(stock_data_dict):
     ticker_items = ""
     
     for _, row in portfolio_df.iterrows():
-        stock_data = get_stock_data(row['Ticker'])
+        stock_data = stock_data_dict.get(row['Ticker'], {})
         ticker = row['Ticker']
         currency = currency_mapping.get(ticker, "$")
         
-        if stock_data['change'] >= 0:
+        if stock_data.get('change', 0) >= 0:
             change_class = "positive"
             arrow = '<span style="font-size: 22px;">&#x25B2;</span>'
         else:
@@ -155,8 +131,8 @@ def create_scrolling_ticker():
         ticker_items += f"""
         <div class="ticker-item">
             <span class="ticker-name">{row['Société']}</span>
-            <span class="ticker-price">{currency}{stock_data['current_price']:.2f}</span>
-            <span class="ticker-change {change_class}">{arrow} {stock_data['percent_change']:.2f}%</span>
+            <span class="ticker-price">{currency}{stock_data.get('current_price', 0):.2f}</span>
+            <span class="ticker-change {change_class}">{arrow} {stock_data.get('percent_change', 0):.2f}%</span>
         </div>
         """
     
@@ -227,7 +203,7 @@ def create_scrolling_ticker():
     return iframe_html
 
 # Création du bandeau défilant pour la watchlist 
-def create_watchlist_scrolling_ticker(watchlist_df):
+def create_watchlist_scrolling_ticker(watchlist_df, stock_data_dict):
     ticker_items = ""
     
     for _, row in watchlist_df.iterrows():
@@ -235,9 +211,9 @@ def create_watchlist_scrolling_ticker(watchlist_df):
         ticker = row.get('Ticker', 'N/A')
         company = row.get('Nom complet', ticker)
         
-        # Obtenir les données en temps réel pour chaque ticker de la watchlist
+        # Données en temps réel récupérées en parallèle pour toute la watchlist
         try:
-            stock_data = get_stock_data(ticker)
+            stock_data = stock_data_dict[ticker]
             current_price = stock_data['current_price']
             percent_change = stock_data['percent_change']
             currency = row.get('Devise', '$') 
@@ -336,7 +312,7 @@ def create_watchlist_scrolling_ticker(watchlist_df):
     return iframe_html
 
 # Bandeau défilant
-st.markdown(create_scrolling_ticker(), unsafe_allow_html=True)
+st.markdown(create_scrolling_ticker(get_quotes(portfolio_df['Ticker'].tolist())), unsafe_allow_html=True)
 
 # Interface utilisateur avec espace supplémentaire
 st.markdown('<div style="margin-top: 25px;"><div class="section-title">Présentation de la Performance</div></div>', unsafe_allow_html=True)
@@ -345,7 +321,7 @@ st.markdown('<div style="margin-top: 25px;"><div class="section-title">Présenta
 tickers = portfolio_df['Ticker'].tolist()
 
 # Sélection de la période
-col1, col2 = st.columns([3, 1])
+col1, col2, col3 = st.columns([3, 1, 1])
 
 with col1:
     st.markdown("<div style='display: flex; align-items: center;'><div>Date de début d'investissement</div><div style='margin: 0 10px;'> - </div><div style='color: #693112; font-style: italic;'>Choisissez une date</div></div>", unsafe_allow_html=True)
@@ -360,12 +336,7 @@ with col1:
     end_date = datetime.now()
 
 with col2:
-    indices_options = {
-        "CAC 40": "^FCHI",
-        "S&P 500": "^GSPC",
-        "NASDAQ": "^IXIC",
-        "EURO STOXX 50": "^STOXX50E"
-    }
+    indices_options = REFERENCE_INDICES
     selected_indices = st.multiselect(
         "Indices de référence",
         options=list(indices_options.keys()),
@@ -373,242 +344,69 @@ with col2:
     )
     reference_indices = {name: indices_options[name] for name in selected_indices}
 
-# Récupérer les données historiques
-@st.cache_data(ttl=60) 
-def get_historical_data(tickers, start_date=None, end_date=None):
-    if end_date is None:
-        end_date = datetime.now()
-        
-    data = {}
-    for ticker in tickers:
-        try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start_date, end=end_date)
-            if not hist.empty:
-                hist.index = hist.index.tz_localize(None)
-                data[ticker] = hist
-        except Exception as e:
-            st.warning(f"Erreur lors de la récupération des données pour {ticker}: {e}")
-    return data
-
-# Fonction pour afficher les performances
-def plot_performance(hist_data, weights=None, reference_indices=None, end_date_ui=None):
-    if weights is None:
-        weights = [1/len(hist_data)] * len(hist_data)
-    
-    start_dates = []
-    end_dates = []
-    
-    for ticker, hist in hist_data.items():
-        if not hist.empty:
-            start_dates.append(hist.index[0])
-            end_dates.append(hist.index[-1])
-    
-    if not start_dates or not end_dates:
-        st.warning("Pas assez de données pour créer un graphique.")
-        return None
-    
-    start_date = max(start_dates)
-    end_date = end_date_ui or max(end_dates)
-    
-    fig = go.Figure()
-    date_range = pd.date_range(start=start_date, end=end_date, freq='B')
-    all_normalized = pd.DataFrame(index=date_range)
-    
-    for i, (ticker, hist) in enumerate(hist_data.items()):
-        if hist.empty:
-            continue
-            
-        filtered_hist = hist[(hist.index >= start_date) & (hist.index <= end_date)]
-        if filtered_hist.empty:
-            continue
-            
-        reindexed = filtered_hist['Close'].reindex(date_range, method='ffill')
-        normalized = reindexed / reindexed.iloc[0] * 100
-        all_normalized[ticker] = normalized
-    
-    if all_normalized.empty:
-        st.warning("Pas assez de données pour calculer la performance du portefeuille.")
-        return None
-        
-    portfolio_performance = pd.Series(0, index=date_range)
-    
-    if len(weights) < len(hist_data):
-        weights = [1/len(hist_data)] * len(hist_data)
-    
-    for i, ticker in enumerate(all_normalized.columns):
-        if i < len(weights):
-            portfolio_performance += all_normalized[ticker] * weights[i]
-    
-    fig.add_trace(go.Scatter(
-        x=portfolio_performance.index,
-        y=portfolio_performance.values,
-        mode='lines',
-        name='Portefeuille',
-        line=dict(width=3, color='#693112')
-    ))
-    
-    if reference_indices:
-        for name, ticker in reference_indices.items():
-            try:
-                reference = yf.Ticker(ticker)
-                ref_hist = reference.history(start=start_date, end=end_date)
-                if not ref_hist.empty:
-                    ref_hist.index = ref_hist.index.tz_localize(None)
-                    ref_close = ref_hist['Close'].reindex(date_range, method='ffill')
-                    ref_normalized = ref_close / ref_close.iloc[0] * 100
-                    
-                    fig.add_trace(go.Scatter(
-                        x=ref_normalized.index,
-                        y=ref_normalized.values,
-                        mode='lines',
-                        name=name,
-                        line=dict(width=2.5, dash='dash')
-                    ))
-            except Exception as e:
-                st.warning(f"Erreur lors de la récupération des données pour {name}: {e}")
-    
-    fig.update_layout(
-        title="Performance Comparée (Base 100)",
-        xaxis_title="Date",
-        yaxis_title="Performance (%)",
-        height=500,
-        template="plotly_white",
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
-    )
-    
-    return fig
-
-# Fonction pour simuler l'évolution du portefeuille
-def plot_portfolio_simulation(hist_data, initial_investment=1000000, end_date_ui=None):
-    start_dates = []
-    end_dates = []
-    
-    for ticker, hist in hist_data.items():
-        if not hist.empty:
-            start_dates.append(hist.index[0])
-            end_dates.append(hist.index[-1])
-    
-    if not start_dates or not end_dates:
-        st.warning("Pas assez de données pour créer une simulation.")
-        return None, 0, 0, 0, []
-    
-    start_date = max(start_dates)
-    end_date = end_date_ui or max(end_dates)
-    
-    date_range = pd.date_range(start=start_date, end=end_date, freq='B')
-    
-    num_stocks = len(hist_data)
-    investment_per_stock = initial_investment / num_stocks
-    
-    fig = go.Figure()
-    all_values = pd.DataFrame(index=date_range)
-    
-    stock_info = []
-    for ticker, hist in hist_data.items():
-        if hist.empty:
-            continue
-            
-        reindexed = hist['Close'].reindex(date_range, method='ffill')
-        
-        if reindexed.empty or reindexed.isna().all() or reindexed.iloc[0] == 0:
-            continue
-        
-        initial_price = reindexed.iloc[0]
-        num_shares = investment_per_stock / initial_price
-        
-        stock_info.append({
-            "ticker": ticker,
-            "num_shares": int(num_shares),
-            "initial_investment": investment_per_stock
-        })
-        
-        stock_value = reindexed * num_shares
-        all_values[ticker] = stock_value
-        
-        fig.add_trace(go.Scatter(
-            x=stock_value.index,
-            y=stock_value.values,
-            mode='lines',
-            name=ticker,
-            line=dict(width=1, dash='dot'),
-            opacity=0.3
-        ))
-    
-    portfolio_value = all_values.sum(axis=1)
-    
-    fig.add_trace(go.Scatter(
-        x=portfolio_value.index,
-        y=portfolio_value.values,
-        mode='lines',
-        name='Portefeuille Total',
-        line=dict(width=3, color='#693112')
-    ))
-    
-    fig.add_shape(
-        type="line",
-        x0=start_date,
-        y0=initial_investment,
-        x1=end_date,
-        y1=initial_investment,
-        line=dict(color="black", width=2, dash="dash")
+with col3:
+    rebalance = st.selectbox(
+        "Rééquilibrage",
+        options=list(REBALANCING_LABELS),
+        format_func=REBALANCING_LABELS.get
     )
-    
-    investment_formatted = f"{initial_investment:_}".replace("_", " ")
-    title_text = f"Évolution d'un investissement de {investment_formatted} € réparti équitablement"
-    
-    fig.update_layout(
-        title=title_text,
-        xaxis_title="Date",
-        yaxis_title="Valeur (€)",
-        height=500,
-        template="plotly_white",
-        showlegend=False
+    weighting = st.selectbox(
+        "Pondération",
+        options=list(OPTIMIZATION_METHODS),
+        format_func=OPTIMIZATION_METHODS.get
     )
-    
-    if not portfolio_value.empty:
-        min_y = max(portfolio_value.min() * 0.9, 0)
-        max_y = portfolio_value.max() * 1.1
-        fig.update_layout(yaxis=dict(range=[min_y, max_y]))
-    
-    if portfolio_value.empty:
-        final_value = initial_investment
-        gain_loss = 0
-        percent_change = 0
-    else:
-        final_value = portfolio_value.iloc[-1]
-        gain_loss = final_value - initial_investment
-        percent_change = (gain_loss / initial_investment) * 100
-    
-    return fig, final_value, gain_loss, percent_change, stock_info
 
+# Portefeuille et indices de référence : une seule requête groupée sur tout
+# l'historique stocké ; la date de début ne fait que découper les indices cumulés
 with st.spinner("Chargement des données historiques..."):
-    hist_data = get_historical_data(tickers, start_date, end_date)
+    returns, benchmarks = get_market_returns(tickers, reference_indices)
+    returns_eur = get_cumulative_returns(tickers, BASE_CURRENCY).subset(tickers)
+
+# Pondérations cibles : équipondéré ou optimisées sur la période choisie
+weights = None if weighting == "equal" else get_optimal_weights(tickers, start_date, weighting)
 
 # Afficher le graphique de performance
 performance_fig = plot_performance(
-    hist_data, 
-    reference_indices=reference_indices,
-    end_date_ui=end_date
+    returns, 
+    weights=weights,
+    benchmarks=benchmarks,
+    end_date_ui=end_date,
+    force_start_date=start_date,
+    rebalance=rebalance
 )
 if performance_fig:
     st.plotly_chart(performance_fig, use_container_width=True, key="performance_chart")
 
+# Rendements par horizon (tableau calculé une fois par jour, simple lecture)
+returns_table = get_returns_table()
+horizon_rows = {row['Société']: row['Ticker'] for _, row in portfolio_df.iterrows()}
+horizon_rows.update(reference_indices)
+horizon_df = returns_table.reindex(list(horizon_rows.values())).drop(columns="Dernière séance")
+horizon_df.index = list(horizon_rows)
+with st.expander("Rendements par horizon", expanded=False):
+    st.dataframe(
+        horizon_df.style.format("{:+.2f} %", na_rep="–").map(
+            lambda v: "" if pd.isna(v) else f"color: {'#28a745' if v >= 0 else '#dc3545'}"
+        ),
+        use_container_width=True
+    )
+    st.caption("Rendements en devise de cotation, jusqu'à la dernière séance de chaque titre ; YTD depuis la clôture de fin d'année.")
+
 # Simulation d'investissement
 st.markdown('<div class="section-title">Simulation d\'investissement</div>', unsafe_allow_html=True)
 
 investment_amount = 1000000
+whole_shares = st.checkbox("Nombre entier d'actions (reliquat en liquidités)", value=False)
 
+# Valorisation en euros : chaque ligne est convertie au taux de change du jour
 simulation_fig, final_value, gain_loss, percent_change, stock_info = plot_portfolio_simulation(
-    hist_data, 
+    returns_eur, 
     investment_amount,
-    end_date_ui=end_date
+    end_date_ui=end_date,
+    force_start_date=start_date,
+    weights=weights,
+    rebalance=rebalance,
+    whole_shares=whole_shares
 )
 
 # Afficher les informations sur le nombre d'actions achetées
@@ -669,50 +467,182 @@ if simulation_fig:
             unsafe_allow_html=True
         )
 
+# Projection Monte Carlo
+st.markdown('<div class="section-title">Projection Monte Carlo</div>', unsafe_allow_html=True)
+
+col_method, col_horizon, col_paths = st.columns(3)
+with col_method:
+    mc_method = st.radio(
+        "Méthode",
+        options=list(MONTE_CARLO_METHODS),
+        format_func=MONTE_CARLO_METHODS.get,
+        horizontal=True
+    )
+with col_horizon:
+    mc_years = st.selectbox("Horizon", [1, 3, 5], format_func=lambda y: f"{y} an{'s' if y > 1 else ''}")
+with col_paths:
+    mc_paths = st.selectbox("Trajectoires", [10_000, 50_000, 100_000, 250_000], format_func=lambda n: f"{n:_}".replace("_", " "))
+
+with st.spinner("Simulation des trajectoires..."):
+    mc_bands, mc_summary = get_monte_carlo(
+        tickers, start_date, mc_method, mc_years * TRADING_DAYS, mc_paths, investment_amount, weights=weights
+    )
+
+mc_fig = plot_monte_carlo(mc_bands, investment_amount)
+if mc_fig:
+    st.plotly_chart(mc_fig, use_container_width=True, key="monte_carlo_chart")
+    mc_cols = st.columns(len(mc_summary))
+    for col, (label, value) in zip(mc_cols, mc_summary.items()):
+        with col:
+            formatted = f"{value:.1f} %" if "(%)" in label else f"{int(value):_} €".replace("_", " ")
+            st.markdown(
+                f"""
+                <div class="metric-container">
+                    <div class="metric-title">{label.replace(' (%)', '').replace(' (€)', '')}</div>
+                    <div class="metric-value">{formatted}</div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+    st.caption(
+        f"Portefeuille ({OPTIMIZATION_METHODS[weighting].lower()}) conservé sans rééquilibrage, valorisé en euros ; rendements "
+        "quotidiens estimés sur la période choisie. Simulation reproductible (graine fixe)."
+    )
+else:
+    st.warning("Pas assez de données pour la projection Monte Carlo.")
+
+# Séparateur entre sections
+st.markdown('<div class="separator"></div>', unsafe_allow_html=True)
+
+# Section Indicateurs de risque
+st.markdown('<div class="section-title">Indicateurs de risque</div>', unsafe_allow_html=True)
+
+risk_df = get_risk_metrics(tickers, reference_indices, start_date, end_date, rebalance, weights)
+if not risk_df.empty:
+    st.dataframe(risk_df.style.format("{:.2f}", na_rep="–"), use_container_width=True)
+    st.caption(
+        "Rendements quotidiens sur la période choisie, annualisés sur 252 séances. "
+        "Sharpe et Sortino calculés avec un taux sans risque nul ; bêta et tracking error "
+        "mesurés contre chaque indice de référence sélectionné."
+    )
+else:
+    st.warning("Pas assez de données pour calculer les indicateurs de risque.")
+
+# Section Valeur à risque
+st.markdown('<div class="section-title">Valeur à risque (VaR / CVaR)</div>', unsafe_allow_html=True)
+
+var_engine = get_value_at_risk(tickers, weights)
+if var_engine is not None:
+    col_var_method, col_var_level, col_var_horizon, col_var_measure = st.columns(4)
+    with col_var_method:
+        var_method = st.selectbox("Méthode de VaR", options=list(VAR_METHODS), format_func=VAR_METHODS.get)
+    with col_var_level:
+        var_level = st.select_slider(
+            "Niveau de confiance", options=[0.90, 0.95, 0.975, 0.99], value=0.95,
+            format_func=lambda c: f"{c * 100:g} %"
+        )
+    with col_var_horizon:
+        var_horizon = st.radio("Horizon", [1, 10], format_func=lambda h: f"{h} j", horizontal=True)
+    with col_var_measure:
+        var_measure = st.radio("Mesure", ["var", "cvar"], format_func=str.upper, horizontal=True)
+
+    # Le moteur est en cache par (pondérations, fenêtre) : ces choix ne relisent pas l'historique
+    var_table = var_engine.summary(var_method) * investment_amount
+    st.dataframe(var_table.style.format(lambda v: f"{v:,.0f} €".replace(",", " ")), use_container_width=True)
+
+    var_components = var_engine.components(var_level, var_horizon, var_method, var_measure) * investment_amount
+    var_fig = plot_var_contributions(
+        var_components,
+        f"Contributions à la {var_measure.upper()} {var_level * 100:g} % à {var_horizon} j : "
+        f"{var_components.sum():,.0f} €".replace(",", " ")
+    )
+    st.plotly_chart(var_fig, use_container_width=True, key="var_chart")
+    st.caption(
+        f"Pertes d'un portefeuille de {investment_amount:,} € ({OPTIMIZATION_METHODS[weighting].lower()}) ".replace(",", " ")
+        + f"estimées sur les {len(var_engine.dates)} dernières séances, en euros. Horizon de 10 jours déduit "
+        "de la perte à un jour (racine du temps) ; contributions selon l'allocation d'Euler."
+    )
+else:
+    st.warning("Pas assez de données pour estimer la VaR.")
+
+# Séparateur entre sections
+st.markdown('<div class="separator"></div>', unsafe_allow_html=True)
+
+# Section Analyses glissantes
+st.markdown('<div class="section-title">Analyses glissantes</div>', unsafe_allow_html=True)
+
+if reference_indices:
+    col_metric, col_window, col_index = st.columns(3)
+    with col_metric:
+        rolling_metric = st.selectbox("Indicateur", ["Volatilité (%)", "Corrélation", "Bêta"])
+    with col_window:
+        rolling_window = st.radio("Fenêtre (séances)", list(ROLLING_WINDOWS), horizontal=True)
+    with col_index:
+        rolling_index = st.selectbox("Indice", list(reference_indices))
+
+    rolling = get_rolling_stats(tickers, reference_indices[rolling_index])
+    rolling_fig = plot_rolling_metric(
+        rolling[rolling_window][rolling_metric],
+        f"{rolling_metric} glissant(e) sur {rolling_window} séances – {rolling_index}",
+        rolling_metric,
+        start_date=start_date
+    )
+    if rolling_fig:
+        st.plotly_chart(rolling_fig, use_container_width=True, key="rolling_chart")
+    else:
+        st.warning("Pas assez de séances sur la période pour cette fenêtre.")
+else:
+    st.info("Sélectionnez un indice de référence pour afficher les analyses glissantes.")
+
+# Séparateur entre sections
+st.markdown('<div class="separator"></div>', unsafe_allow_html=True)
+
+# Section Corrélations
+st.markdown('<div class="section-title">Corrélations</div>', unsafe_allow_html=True)
+
+estimator = st.radio("Estimateur", options=list(ESTIMATORS), format_func=ESTIMATORS.get, horizontal=True)
+_, covariance, shrinkage = get_return_moments(tickers, start_date, estimator)
+correlation_fig = plot_correlation_heatmap(to_correlation(covariance)) if covariance is not None else None
+if correlation_fig:
+    st.plotly_chart(correlation_fig, use_container_width=True, key="correlation_heatmap")
+    if estimator == "ledoit_wolf":
+        st.caption(f"Intensité de rétrécissement de Ledoit-Wolf : {shrinkage:.1%}")
+else:
+    st.warning("Pas assez de données pour estimer les corrélations.")
+
+# Section Frontière efficiente
+st.markdown('<div class="section-title">Frontière efficiente</div>', unsafe_allow_html=True)
+
+frontier, frontier_assets, frontier_portfolios = get_efficient_frontier(tickers, start_date)
+frontier_fig = plot_efficient_frontier(frontier, frontier_assets, frontier_portfolios)
+if frontier_fig:
+    st.plotly_chart(frontier_fig, use_container_width=True, key="frontier_chart")
+    if weights:
+        st.dataframe(
+            pd.DataFrame({"Pondération (%)": pd.Series(weights) * 100}).T.style.format("{:.1f}"),
+            use_container_width=True
+        )
+    st.caption(
+        "Optimisation sans vente à découvert sur les rendements moyens et la covariance de "
+        "Ledoit-Wolf de la période choisie : estimations historiques, non prédictives."
+    )
+else:
+    st.warning("Pas assez de données pour tracer la frontière efficiente.")
+
 # Séparateur entre sections
 st.markdown('<div class="separator"></div>', unsafe_allow_html=True)
 
 # Section Contributeurs à la performance 
 st.markdown('<div class="section-title">Contributeurs à la performance</div>', unsafe_allow_html=True)
 
-# Calculer les statistiques de performance
-def calculate_portfolio_stats(hist_data, portfolio_df, start_date, end_date):
-    df_perf = []
-    
-    for ticker, hist in hist_data.items():
-        if hist.empty:
-            continue
-            
-        company_name = ticker
-        company_row = portfolio_df[portfolio_df['Ticker'] == ticker]
-        if not company_row.empty and 'Société' in company_row.columns:
-            company_name = company_row.iloc[0]['Société']
-            
-        idx_start = hist.index.get_indexer([start_date], method='nearest')[0]
-        start_price = hist['Close'].iloc[idx_start]
-        end_price = hist['Close'].iloc[-1]
-        
-        if start_price > 0:
-            pct_change = (end_price - start_price) / start_price * 100
-            abs_change = end_price - start_price
-            
-            df_perf.append({
-                'Ticker': ticker,
-                'Société': company_name,
-                'Prix départ': start_price,
-                'Prix final': end_price,
-                'Var. abs.': abs_change,
-                'Var. (%)': pct_change
-            })
-    
-    return pd.DataFrame(df_perf)
-
-df_perf = calculate_portfolio_stats(hist_data, portfolio_df, start_date, end_date)
+# Attribution (en cache par pondérations et période) et statistiques de performance
+attribution = get_attribution(tickers, reference_indices, start_date, end_date, rebalance, weights)
+df_perf = calculate_portfolio_stats(returns, portfolio_df, start_date, end_date, attribution)
 
 if not df_perf.empty:
-    df_sorted = df_perf.sort_values(by='Var. (%)', ascending=False)
-    positive_contributors = df_sorted[df_sorted['Var. (%)'] >= 0]
-    negative_contributors = df_sorted[df_sorted['Var. (%)'] < 0].sort_values(by='Var. (%)', ascending=True)
+    df_sorted = df_perf.sort_values(by='Contribution (%)', ascending=False)
+    positive_contributors = df_sorted[df_sorted['Contribution (%)'] >= 0]
+    negative_contributors = df_sorted[df_sorted['Contribution (%)'] < 0].sort_values(by='Contribution (%)', ascending=True)
     
     col1, col2 = st.columns(2)
     
@@ -723,8 +653,8 @@ if not df_perf.empty:
             <div style="background-color:#9CAF88; border:1px solid #7A9B6F; padding:10px; margin:6px 0; border-radius:6px;">
                 <div style="font-weight:bold; font-size:15px; color:#1B3D1B;">{row['Société']}</div>
                 <div style="display:flex; justify-content:space-between; margin-top:6px;">
-                    <span style="color:#2E4A2E; font-weight:bold; font-size:13px;">{row['Prix départ']:.2f} → {row['Prix final']:.2f}</span>
-                    <span style="color:#1B3D1B; font-weight:bold; font-size:16px;">+{row['Var. (%)']:.2f}%</span>
+                    <span style="color:#2E4A2E; font-weight:bold; font-size:13px;">{row['Prix départ']:.2f} → {row['Prix final']:.2f} ({row['Var. (%)']:+.2f}%)</span>
+                    <span style="color:#1B3D1B; font-weight:bold; font-size:16px;">{row['Contribution (%)']:+.2f} pts</span>
                 </div>
             </div>
             """, unsafe_allow_html=True)
@@ -737,13 +667,48 @@ if not df_perf.empty:
                 <div style="background-color:#C8AD7F; border:1px solid #B8934F; padding:10px; margin:6px 0; border-radius:6px;">
                     <div style="font-weight:bold; font-size:15px; color:#5D3A1B;">{row['Société']}</div>
                     <div style="display:flex; justify-content:space-between; margin-top:6px;">
-                        <span style="color:#7A4F1B; font-weight:bold; font-size:13px;">{row['Prix départ']:.2f} → {row['Prix final']:.2f}</span>
-                        <span style="color:#5D3A1B; font-weight:bold; font-size:16px;">{row['Var. (%)']:.2f}%</span>
+                        <span style="color:#7A4F1B; font-weight:bold; font-size:13px;">{row['Prix départ']:.2f} → {row['Prix final']:.2f} ({row['Var. (%)']:+.2f}%)</span>
+                        <span style="color:#5D3A1B; font-weight:bold; font-size:16px;">{row['Contribution (%)']:+.2f} pts</span>
                     </div>
                 </div>
                 """, unsafe_allow_html=True)
         else:
             st.markdown("*Aucun contributeur négatif sur la période*", unsafe_allow_html=True)
+    st.caption(
+        "Contribution : gain de chaque titre rapporté à la valeur initiale du portefeuille, en points "
+        "de pourcentage ; leur somme est le rendement du portefeuille sur la période."
+    )
+
+# Section Attribution de performance
+if attribution is not None:
+    st.markdown('<div class="section-title">Attribution de performance</div>', unsafe_allow_html=True)
+
+    summary = attribution["Synthèse"]
+    summary_cols = st.columns(len(summary))
+    for col, (label, value) in zip(summary_cols, summary.items()):
+        with col:
+            st.markdown(
+                f"""
+                <div class="metric-container">
+                    <div class="metric-title">{label}</div>
+                    <div class="metric-value">{value:+.2f} %</div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+    grouping = st.radio("Regroupement", ["Secteur", "Pays"], horizontal=True)
+    brinson_fig = plot_brinson(
+        attribution[grouping], f"Attribution de Brinson par {grouping.lower()} contre l'équipondéré"
+    )
+    if brinson_fig:
+        st.plotly_chart(brinson_fig, use_container_width=True, key="brinson_chart")
+        st.dataframe(attribution[grouping].style.format("{:.2f}"), use_container_width=True)
+    st.caption(
+        "Écart de rendement avec le portefeuille équipondéré des mêmes titres (même rééquilibrage), "
+        "décomposé en allocation, sélection et interaction (Brinson-Fachler) ; la somme des effets "
+        "est le rendement actif."
+    )
 
 # Séparateur
 st.markdown('<div class="separator"></div>', unsafe_allow_html=True)
@@ -751,29 +716,8 @@ st.markdown('<div class="separator"></div>', unsafe_allow_html=True)
 # Section Répartition du Portefeuille (Camemberts)
 st.markdown('<div class="section-title">Répartition du Portefeuille</div>', unsafe_allow_html=True)
 
-@st.cache_data
-def load_sector_country(tickers):
-    """Récupère secteur et pays pour chaque ticker via yfinance."""
-    data = []
-    for tk in tickers:
-        try:
-            info = yf.Ticker(tk).info
-            data.append({
-                "Ticker": tk,
-                "Sector": info.get("sector", "Non disponible"),
-                "Country": info.get("country", "Non disponible")
-            })
-        except Exception as e:
-            st.warning(f"Erreur lors de la récupération des données pour {tk}: {e}")
-            data.append({
-                "Ticker": tk,
-                "Sector": "Non disponible",
-                "Country": "Non disponible"
-            })
-    return pd.DataFrame(data)
-
-df_sc = load_sector_country(tickers)
-df_sc["Weight"] = 1.0 / len(df_sc)
+df_sc = load_sector_country_data(tickers)
+df_sc["Weight"] = df_sc["Ticker"].map(weights).fillna(0.0) if weights else 1.0 / len(df_sc)
 
 sector_alloc = df_sc.groupby("Sector")["Weight"].sum().reset_index()
 country_alloc = df_sc.groupby("Country")["Weight"].sum().reset_index()
@@ -838,13 +782,11 @@ st.markdown('<div class="separator-reduced"></div>', unsafe_allow_html=True)
 # Section Watchlist - Sociétés à l'étude
 st.markdown('<div class="section-title">Watchlist - Sociétés à l\'étude susceptibles d\'intégrer le Portefeuille</div>', unsafe_allow_html=True)
 
-# Charger le CSV de la watchlist
-@st.cache_data
-def load_watchlist_data():
-    df = pd.read_csv("data/stock_data_7v.csv")
-    return df
-
+# Charger le CSV de la watchlist et ses rendements par horizon
 watchlist_df = load_watchlist_data()
+watchlist_returns = returns_table.reindex(watchlist_df['Ticker'].str.strip())
+for horizon in ["YTD", "1 an"]:
+    watchlist_df[f"{horizon} (%)"] = watchlist_returns[horizon].to_numpy()
 
 # Créer et afficher le tableau de la watchlist avec style Plotly
 def create_watchlist_table(watchlist_df):
@@ -899,11 +841,17 @@ watchlist_table = create_watchlist_table(watchlist_df)
 st.plotly_chart(watchlist_table, use_container_width=True, key="watchlist_table")
 
 # Ajouter le bandeau défilant de la watchlist
-st.markdown(create_watchlist_scrolling_ticker(watchlist_df), unsafe_allow_html=True)
+watchlist_quotes = get_quotes(watchlist_df['Ticker'].dropna().tolist())
+st.markdown(create_watchlist_scrolling_ticker(watchlist_df, watchlist_quotes), unsafe_allow_html=True)
 
 # Séparateur final
 st.markdown('<div class="separator"></div>', unsafe_allow_html=True)
 
+# Compteurs du cache des données (affichés avec ?debug=1 dans l'URL)
+if st.query_params.get("debug"):
+    with st.expander("Cache des données"):
+        st.dataframe(cache_stats(), hide_index=True)
+
 # Pied de page
 st.markdown("""
 <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; text-align: center; color: #666;">
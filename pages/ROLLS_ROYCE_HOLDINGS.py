@@ -1,11 +1,17 @@
 import streamlit as st
 from PIL import Image
 import os
-import yfinance as yf
+import sys
 from datetime import datetime
 import base64
 from io import BytesIO
 
+# Ajouter src/ au chemin d'importation
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+# Importer les modules personnalisés
+from data_loader import get_info
+
 # Configuration de la page
 st.set_page_config(
     page_title="Fiche d'Investissement - Rolls-Royce Holdings plc",
@@ -352,13 +358,13 @@ st.markdown("""
 # Métriques clés avec cours actualisé
 st.markdown("<h3 style='text-align: center; margin: 60px 0 30px 0;'>Indicateurs Clés</h3>", unsafe_allow_html=True)
 
-# Récupération du cours actuel avec yfinance
+# Récupération du cours actuel (fiche partagée entre processus, voir data_loader.get_info)
 try:
-    ticker = yf.Ticker("RR.L")
-    current_price = ticker.info.get('currentPrice', None)
+    info = get_info("RR.L")
+    current_price = info.get('currentPrice', None)
     if current_price is None:
         # Essayer avec regularMarketPrice
-        current_price = ticker.info.get('regularMarketPrice', None)
+        current_price = info.get('regularMarketPrice', None)
     if current_price:
         current_price_str = f"{current_price:.0f}p"
     else:
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+from nav_engine import simulate_nav
+
+BRINSON_EFFECTS = ("Allocation (%)", "Sélection (%)", "Interaction (%)")
+
+
+def contributions(prices, weights=None, rebalance="buy_and_hold"):
+    """
+    Contribution de chaque titre au rendement du portefeuille : gain en
+    valeur du titre rapporté à la valeur initiale, Σ_t titres[t-1]·(P[t] - P[t-1]).
+
+    Les contributions ont pour somme le rendement du portefeuille sur la
+    période, rééquilibrages compris (ceux-ci s'autofinancent).
+
+    Arguments:
+        prices (DataFrame): matrice de prix dates × tickers sans NaN
+        weights (array): pondérations cibles (équipondéré par défaut)
+        rebalance (str): mode de rééquilibrage (voir nav_engine)
+
+    Returns:
+        tuple: (pondérations initiales, contributions), arrays dans l'ordre des colonnes
+    """
+    result = simulate_nav(prices, weights, initial_value=1.0, rebalance=rebalance)
+    shares = result.shares.to_numpy()
+    gains = (shares[:-1] * np.diff(prices.to_numpy(dtype=float), axis=0)).sum(axis=0)
+    return result.weights.to_numpy()[0], gains
+
+
+def brinson(weights, contribution, reference_weights, reference_contribution, groups):
+    """
+    Attribution de Brinson-Fachler par groupe (secteur, pays...) : l'écart
+    de rendement avec la référence se décompose en allocation (sur- ou
+    sous-pondération du groupe), sélection (titres choisis dans le groupe)
+    et interaction. La somme des effets est l'écart de rendement total.
+
+    Les rendements de groupe sont les contributions du groupe divisées par
+    sa pondération initiale ; un groupe absent du portefeuille prend le
+    rendement de la référence.
+
+    Arguments:
+        weights, contribution (array): pondérations initiales et contributions du portefeuille
+        reference_weights, reference_contribution (array): idem pour la référence
+        groups (array): groupe de chaque titre, même ordre
+
+    Returns:
+        DataFrame: une ligne par groupe
+    """
+    codes, labels = pd.factorize(np.asarray(groups))
+    onehot = np.zeros((len(codes), len(labels)))
+    onehot[np.arange(len(codes)), codes] = 1.0
+
+    w_p, w_b = weights @ onehot, reference_weights @ onehot
+    c_p, c_b = contribution @ onehot, reference_contribution @ onehot
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r_b = np.where(w_b > 0, c_b / w_b, 0.0)
+        r_p = np.where(w_p > 0, c_p / w_p, r_b)
+    total_b = reference_contribution.sum()
+
+    allocation = (w_p - w_b) * (r_b - total_b)
+    selection = w_b * (r_p - r_b)
+    interaction = (w_p - w_b) * (r_p - r_b)
+    table = pd.DataFrame({
+        "Pondération (%)": w_p,
+        "Pondération réf. (%)": w_b,
+        "Rendement (%)": r_p,
+        "Rendement réf. (%)": r_b,
+        "Allocation (%)": allocation,
+        "Sélection (%)": selection,
+        "Interaction (%)": interaction,
+        "Effet total (%)": allocation + selection + interaction,
+    }, index=labels) * 100
+    return table.sort_values("Effet total (%)", ascending=False)
+
+
+def compute_attribution(prices, weights=None, groups=None, rebalance="buy_and_hold", benchmarks=None):
+    """
+    Attribution de performance du portefeuille sur la fenêtre de `prices`,
+    contre le portefeuille équipondéré des mêmes titres (même rééquilibrage).
+
+    Arguments:
+        prices (DataFrame): matrice de prix dates × tickers sans NaN
+        weights (array): pondérations cibles (équipondéré par défaut)
+        groups (dict): {nom du regroupement: {ticker: groupe}}, ex. secteur, pays
+        rebalance (str): mode de rééquilibrage (voir nav_engine)
+        benchmarks (Series): rendement de chaque indice de référence sur la période
+
+    Returns:
+        dict: 'Titres' (pondération, rendement, contribution et contribution
+              active par ticker), un tableau de Brinson par regroupement,
+              'Synthèse' (rendements du portefeuille, de la référence
+              équipondérée et écart avec chaque indice), valeurs en %
+    """
+    values = prices.to_numpy(dtype=float)
+    w0, contribution = contributions(prices, weights, rebalance)
+    b0, reference = contributions(prices, None, rebalance)
+    total, total_ref = contribution.sum(), reference.sum()
+
+    results = {
+        "Titres": pd.DataFrame({
+            "Pondération (%)": w0,
+            "Rendement (%)": values[-1] / values[0] - 1,
+            "Contribution (%)": contribution,
+            "Contribution active (%)": contribution - reference,
+        }, index=prices.columns) * 100,
+    }
+    for name, mapping in (groups or {}).items():
+        labels = [mapping.get(t, "Non disponible") for t in prices.columns]
+        results[name] = brinson(w0, contribution, b0, reference, labels)
+
+    summary = {"Portefeuille": total, "Équipondéré": total_ref, "Rendement actif (équipondéré)": total - total_ref}
+    for index_name, index_return in (benchmarks if benchmarks is not None else pd.Series(dtype=float)).items():
+        summary[f"Rendement actif ({index_name})"] = total - index_return
+    results["Synthèse"] = pd.Series(summary) * 100
+    return results
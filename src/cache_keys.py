@@ -0,0 +1,120 @@
+import inspect
+import threading
+import functools
+import pandas as pd
+import streamlit as st
+from datetime import date
+
+
+# ==========================
+# 🔹 1. Canonicalisation des arguments
+# ==========================
+def canonical_tickers(tickers):
+    """Liste de tickers -> tuple trié sans doublons."""
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    return tuple(sorted({t.strip() for t in tickers}))
+
+
+def canonical_date(value):
+    """str / date / datetime / Timestamp -> date (sans heure), ou None."""
+    if value is None:
+        return None
+    return pd.Timestamp(value).date()
+
+
+def trading_day(value):
+    """
+    Date ramenée au jour de bourse (lundi-vendredi) suivant ou égal.
+    Un début ou une fin (exclue) tombant un week-end donne les mêmes
+    barres que le lundi suivant : les deux partagent la même clé.
+    """
+    value = canonical_date(value)
+    if value is None:
+        return None
+    return pd.offsets.BDay().rollforward(pd.Timestamp(value)).date()
+
+
+def end_trading_day(value):
+    """
+    Date de fin : None (« jusqu'à aujourd'hui ») si elle n'est pas passée,
+    sinon le jour de bourse correspondant. datetime.now() donne ainsi la
+    même clé pendant toute la journée.
+    """
+    value = canonical_date(value)
+    if value is None or value >= date.today():
+        return None
+    return trading_day(value)
+
+
+# ==========================
+# 🔹 2. Cache avec compteurs
+# ==========================
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _count(name, field):
+    with _stats_lock:
+        stats = _stats.setdefault(name, {"calls": 0, "misses": 0})
+        stats[field] += 1
+
+
+def cached_data(keys=None, **cache_kwargs):
+    """
+    st.cache_data précédé d'une canonicalisation des arguments.
+
+    Arguments:
+        keys (dict): {nom du paramètre: fonction de canonicalisation}
+        **cache_kwargs: options transmises à st.cache_data (ttl, max_entries...)
+
+    La fonction décorée compte ses appels et ses exécutions réelles
+    (défauts de cache), consultables via cache_stats().
+    """
+    keys = keys or {}
+
+    def decorator(fn):
+        name = fn.__name__
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def compute(*args, **kwargs):
+            _count(name, "misses")
+            return fn(*args, **kwargs)
+
+        cached = st.cache_data(**cache_kwargs)(compute)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            for param, canonicalise in keys.items():
+                bound.arguments[param] = canonicalise(bound.arguments[param])
+            _count(name, "calls")
+            return cached(*bound.args, **bound.kwargs)
+
+        wrapper.clear = cached.clear
+        return wrapper
+
+    return decorator
+
+
+def cache_stats():
+    """
+    Compteurs des fonctions en cache.
+
+    Returns:
+        DataFrame: appels, succès, défauts et taux de succès par fonction
+    """
+    with _stats_lock:
+        rows = [
+            {
+                "Fonction": name,
+                "Appels": s["calls"],
+                "Succès": s["calls"] - s["misses"],
+                "Défauts": s["misses"],
+                "Taux de succès (%)": (s["calls"] - s["misses"]) / s["calls"] * 100 if s["calls"] else 0,
+            }
+            for name, s in sorted(_stats.items())
+        ]
+    return pd.DataFrame(rows, columns=["Fonction", "Appels", "Succès", "Défauts", "Taux de succès (%)"])
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import linkage, leaves_list
+from scipy.spatial.distance import squareform
+
+ESTIMATORS = {
+    "sample": "Échantillon",
+    "ledoit_wolf": "Ledoit-Wolf",
+}
+
+
+class CovarianceEngine:
+    """
+    Covariance et corrélation des rendements, estimateur empirique ou
+    rétréci de Ledoit-Wolf, à partir de statistiques suffisantes.
+
+    Les sommes Σx, Σxxᵀ, Σx²xᵀ et Σx²(x²)ᵀ suffisent à la covariance et à
+    l'intensité de rétrécissement de Ledoit-Wolf (mêmes formules que
+    sklearn.covariance.LedoitWolf) : de nouvelles séances s'ajoutent par
+    append() en O(k·p²) sans relire l'historique.
+
+    Arguments:
+        returns (DataFrame): rendements quotidiens dates × tickers ; seules
+            les séances où tous les tickers sont renseignés sont retenues
+    """
+
+    def __init__(self, returns):
+        self.columns = returns.columns
+        self.dates = returns.index[:0]
+        p = len(self.columns)
+        # Décalage constant : améliore la précision des sommes de puissances
+        # sans changer les moments centrés
+        self._offset = np.nan_to_num(np.nanmean(returns.to_numpy(dtype=float), axis=0)) if len(returns) else np.zeros(p)
+        self.n = 0
+        self._s1 = np.zeros(p)
+        self._s11 = np.zeros((p, p))
+        self._s21 = np.zeros((p, p))
+        self._s22 = np.zeros((p, p))
+        self.append(returns)
+
+    def append(self, returns):
+        """Ajoute des séances postérieures à la dernière date connue."""
+        if len(self.dates) and len(returns) and returns.index[0] <= self.dates[-1]:
+            raise ValueError("Les nouvelles séances doivent suivre la dernière date connue")
+        returns = returns.reindex(columns=self.columns).dropna()
+        x = returns.to_numpy(dtype=float) - self._offset
+        x2 = x * x
+        self.n += len(x)
+        self._s1 += x.sum(axis=0)
+        self._s11 += x.T @ x
+        self._s21 += x2.T @ x
+        self._s22 += x2.T @ x2
+        self.dates = self.dates.append(returns.index)
+        return self
+
+    # ----- Moments -----
+    def mean(self):
+        """Rendement quotidien moyen de chaque ticker."""
+        return pd.Series(self._s1 / self.n + self._offset, index=self.columns)
+
+    def _empirical(self):
+        m = self._s1 / self.n
+        return self._s11 / self.n - np.outer(m, m), m
+
+    def shrinkage(self):
+        """Intensité de rétrécissement de Ledoit-Wolf (entre 0 et 1)."""
+        n, p = self.n, len(self.columns)
+        emp_cov, m = self._empirical()
+        s2 = np.diag(self._s11)
+        m2 = m * m
+        # Σ (x_i - m_i)² (x_j - m_j)² développé sur les sommes brutes
+        centered_22 = (
+            self._s22
+            - 2 * self._s21 * m[None, :]
+            - 2 * self._s21.T * m[:, None]
+            + np.outer(s2, m2) + np.outer(m2, s2)
+            + 4 * self._s11 * np.outer(m, m)
+            - 3 * n * np.outer(m2, m2)
+        )
+        trace = np.diag(emp_cov)
+        mu = trace.sum() / p
+        delta_ = np.sum(emp_cov ** 2)
+        beta_ = np.sum(centered_22)
+        beta = (beta_ / n - delta_) / (p * n)
+        delta = (delta_ - 2 * mu * trace.sum() + p * mu ** 2) / p
+        beta = min(beta, delta)
+        return 0.0 if beta == 0 else float(beta / delta)
+
+    def covariance(self, estimator="ledoit_wolf"):
+        """
+        Matrice de covariance quotidienne.
+
+        "sample" : covariance empirique non biaisée (n - 1) ;
+        "ledoit_wolf" : (1 - δ)·S + δ·μ·I, S normalisée par n comme sklearn.
+        """
+        if estimator not in ESTIMATORS:
+            raise ValueError(f"Estimateur inconnu : {estimator}")
+        emp_cov, _ = self._empirical()
+        if estimator == "sample":
+            cov = emp_cov * self.n / (self.n - 1)
+        else:
+            shrinkage = self.shrinkage()
+            mu = np.trace(emp_cov) / len(self.columns)
+            cov = (1 - shrinkage) * emp_cov
+            cov.flat[::len(self.columns) + 1] += shrinkage * mu
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def correlation(self, estimator="ledoit_wolf"):
+        """Matrice de corrélation déduite de covariance(estimator)."""
+        return to_correlation(self.covariance(estimator))
+
+
+def to_correlation(cov):
+    """Matrice de corrélation d'une matrice de covariance (DataFrame)."""
+    values = cov.to_numpy(dtype=float)
+    std = np.sqrt(np.diag(values))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = values / np.outer(std, std)
+    np.fill_diagonal(corr, 1.0)
+    return pd.DataFrame(corr, index=cov.index, columns=cov.columns)
+
+
+def cluster_order(corr):
+    """
+    Ordre des tickers regroupant les plus corrélés (classification
+    hiérarchique, distance √((1 - ρ) / 2), lien moyen).
+    """
+    if len(corr) < 3:
+        return list(corr.columns)
+    dist = np.sqrt(np.clip((1 - corr.to_numpy()) / 2, 0, None))
+    np.fill_diagonal(dist, 0.0)
+    order = leaves_list(linkage(squareform(dist, checks=False), method="average"))
+    return [corr.columns[i] for i in order]
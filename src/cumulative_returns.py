@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+
+class CumulativeReturns:
+    """
+    Indice cumulé des rendements logarithmiques (sommes préfixes) d'une
+    matrice de prix dates × tickers, calculé une fois sur tout l'historique.
+
+    log(P[t] / P[s]) = L[t] - L[s] : la performance de n'importe quelle
+    fenêtre (début, fin) se lit par une simple différence, sans relire ni
+    renormaliser les prix. Seuls les prix de départ restent nécessaires
+    pour compter les titres achetés (simulation).
+
+    Avec `total_return`, les rendements sont lus sur l'indice de rendement
+    total (dividendes réinvestis) ; les prix affichés et ceux servant à
+    compter les titres restent les clôtures réelles de `prices`.
+
+    Arguments:
+        prices (DataFrame): matrice de prix (voir price_matrix.build_price_matrix),
+            NaN avant la première cotation de chaque ticker
+        total_return (DataFrame): indice de rendement total, mêmes dates et
+            colonnes (voir total_return.TotalReturnIndex) ; défaut : `prices`
+        dividends (DataFrame): dividendes détachés, mêmes dates et colonnes
+            (voir total_return.dividend_matrix) ; défaut : aucun
+    """
+
+    def __init__(self, prices, total_return=None, dividends=None):
+        levels = prices if total_return is None else total_return.reindex(index=prices.index, columns=prices.columns)
+        values = levels.to_numpy(dtype=float)
+        valid = np.isfinite(values) & (values > 0)
+        log_prices = np.log(np.where(valid, values, 1.0))
+        steps = np.diff(log_prices, axis=0, prepend=log_prices[:1])
+        steps[~valid] = 0.0
+        steps[1:][~valid[:-1]] = 0.0
+        self.dates = prices.index
+        self.columns = prices.columns
+        self._prices = prices.to_numpy(dtype=float)
+        self._dividends = (
+            np.zeros_like(self._prices) if dividends is None
+            else dividends.reindex(index=prices.index, columns=prices.columns).fillna(0.0).to_numpy(dtype=float)
+        )
+        self._log = np.where(valid, np.cumsum(steps, axis=0), np.nan)
+        # Position de la première cotation de chaque ticker (len(dates) si aucune)
+        self._first = np.where(valid.any(axis=0), valid.argmax(axis=0), len(prices.index))
+
+    @classmethod
+    def _view(cls, parent, columns, names):
+        obj = cls.__new__(cls)
+        positions = [parent.columns.get_loc(c) for c in columns]
+        obj.dates = parent.dates
+        obj.columns = pd.Index(names)
+        obj._prices = parent._prices[:, positions]
+        obj._dividends = parent._dividends[:, positions]
+        obj._log = parent._log[:, positions]
+        obj._first = parent._first[positions]
+        return obj
+
+    @property
+    def empty(self):
+        return len(self.dates) == 0 or len(self.columns) == 0
+
+    def subset(self, columns, names=None):
+        """Sous-ensemble de tickers (dans l'ordre demandé), éventuellement renommés."""
+        columns = [c for c in columns if c in self.columns]
+        if names is not None:
+            names = [names.get(c, c) for c in columns]
+        return CumulativeReturns._view(self, columns, names or columns)
+
+    # ----- Fenêtres -----
+    def _bounds(self, start=None, end=None):
+        i = 0 if start is None else int(self.dates.searchsorted(pd.Timestamp(start), side="left"))
+        j = len(self.dates) if end is None else int(self.dates.searchsorted(pd.Timestamp(end), side="right"))
+        return i, j
+
+    def window(self, start=None, end=None, common=True):
+        """
+        Positions (i, j) de la fenêtre et masque des tickers cotés dans la fenêtre.
+
+        common=True avance le début à la première date où tous ces tickers
+        cotent.
+        """
+        i, j = self._bounds(start, end)
+        present = self._first < j
+        if common and present.any():
+            i = max(i, int(self._first[present].max()))
+        return i, j, present
+
+    def growth(self, start=None, end=None, common=True):
+        """
+        Rapport P[t] / P[début] sur la fenêtre, une colonne par ticker coté.
+
+        Avec common=False, chaque ticker est rapporté à sa première cotation
+        dans la fenêtre (NaN avant).
+        """
+        i, j, present = self.window(start, end, common)
+        if i >= j:
+            return pd.DataFrame(columns=self.columns[present], dtype=float)
+        log = self._log[i:j, present]
+        base_rows = np.maximum(i, self._first[present])
+        base = self._log[base_rows, np.flatnonzero(present)]
+        return pd.DataFrame(np.exp(log - base), index=self.dates[i:j], columns=self.columns[present])
+
+    def rebase(self, start=None, end=None, base=100.0, common=True):
+        """Courbes base `base` sur la fenêtre (voir growth)."""
+        return self.growth(start, end, common) * base
+
+    def period_returns(self, start=None, end=None):
+        """
+        Rendement de chaque ticker entre sa première cotation dans la fenêtre
+        et la dernière date de la fenêtre : deux lectures par ticker.
+
+        Returns:
+            DataFrame: colonnes 'Prix départ', 'Prix final', 'Rendement'
+        """
+        i, j, present = self.window(start, end, common=False)
+        if i >= j or not present.any():
+            return pd.DataFrame(columns=["Prix départ", "Prix final", "Rendement"], dtype=float)
+        cols = np.flatnonzero(present)
+        first = np.maximum(i, self._first[present])
+        return pd.DataFrame({
+            "Prix départ": self._prices[first, cols],
+            "Prix final": self._prices[j - 1, cols],
+            "Rendement": np.exp(self._log[j - 1, cols] - self._log[first, cols]) - 1,
+        }, index=self.columns[present])
+
+    def window_prices(self, start=None, end=None):
+        """
+        Clôtures réelles de la fenêtre commune (voir window), sans NaN :
+        prix affichés et décompte des titres achetés.
+        """
+        i, j, present = self.window(start, end)
+        return pd.DataFrame(self._prices[i:j, present], index=self.dates[i:j], columns=self.columns[present])
+
+    def window_index(self, start=None, end=None):
+        """
+        Indice de la fenêtre commune, 1 à son début, sans NaN : rendement
+        total lorsque l'objet en a reçu un. Sert aux calculs de rendement
+        et de risque (ses niveaux ne sont pas des prix).
+        """
+        return self.growth(start, end)
+
+    def window_dividends(self, start=None, end=None):
+        """Dividendes détachés sur la fenêtre commune (voir window_prices)."""
+        i, j, present = self.window(start, end)
+        return pd.DataFrame(self._dividends[i:j, present], index=self.dates[i:j], columns=self.columns[present])
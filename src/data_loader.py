@@ -1,13 +1,60 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-from datetime import datetime
-from stock_utils import get_dividend_yields
+import numpy as np
+import os
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, date
+from price_store import PriceStore
+from price_matrix import build_price_matrix
+from total_return import TotalReturnIndex, dividend_matrix, trailing_dividend_yield
+from cumulative_returns import CumulativeReturns
+from nav_engine import simulate_nav
+from risk_metrics import simple_returns, compute_risk_metrics
+from attribution import compute_attribution
+from rolling_stats import RollingStats, ROLLING_WINDOWS
+from monte_carlo import simulate_portfolio
+from covariance import CovarianceEngine
+from optimizer import PortfolioOptimizer, OPTIMIZATION_METHODS, DEFAULT_BOUNDS
+from value_at_risk import ValueAtRisk, DEFAULT_WINDOW as VAR_WINDOW
+from returns_table import build_returns_table
+from quote_cache import QuoteCache
+from metadata_cache import MetadataCache
+from cache_keys import cached_data, canonical_tickers, canonical_date, trading_day, end_trading_day
+from shared_cache import get_shared_cache
+from market_data import get_provider, quote_from_info
+import fx
+
+# Début de l'historique conservé localement (minimum du sélecteur de dates)
+HISTORY_START = datetime(2015, 1, 1)
+
+# Récupération concurrente des cotations
+QUOTE_MAX_WORKERS = 8
+QUOTE_TIMEOUT = 5.0
+
+# Durées de vie dans le cache partagé entre processus (secondes)
+INFO_TTL = 60              # la fiche .info contient le cours actuel
+HISTORY_SYNC_TTL = 3600    # délai avant de redemander les dernières barres
+
+# Projection Monte Carlo : pool de processus au-delà de ce nombre de trajectoires
+MONTE_CARLO_POOL_THRESHOLD = 200_000
+
+# Indices de référence proposés dans l'application
+REFERENCE_INDICES = {
+    "CAC 40": "^FCHI",
+    "S&P 500": "^GSPC",
+    "NASDAQ": "^IXIC",
+    "EURO STOXX 50": "^STOXX50E",
+}
+
+# Tableau des rendements par horizon : recalculé une fois par jour
+RETURNS_TABLE_TTL = 24 * 3600
 
 # ==========================
 # 🔹 1. Chargement du portefeuille principal (10 valeurs)
 # ==========================
-@st.cache_data
+@cached_data()
 def load_portfolio_data():
     """
     Charge les données du portefeuille principal depuis le CSV.
@@ -23,11 +70,49 @@ def load_portfolio_data():
 # ==========================
 # 🔹 2. Données boursières actuelles
 # ==========================
-@st.cache_data(ttl=60) 
+def get_info(ticker):
+    """
+    Fiche société (.info) d'un ticker, partagée entre tous les processus
+    de l'hôte : un seul appel au fournisseur par ticker et par INFO_TTL.
+    """
+    return get_shared_cache().get_or_compute(
+        f"info:{ticker}", lambda: get_provider().info(ticker), INFO_TTL
+    )
+
+
+def _detailed_fields(ticker, info, hist):
+    """
+    Champs détaillés calculés localement à partir d'une seule fiche .info
+    et d'un seul historique sur 1 an (graphique). Les performances par
+    horizon (YTD...) sont lues dans get_returns_table().
+    """
+    # Rendement du dividende : dividendes de l'historique sur 1 an, à défaut fournisseur
+    dividend_yield = info.get("dividendYield", 0) or 0
+    if not hist.empty and "Dividends" in hist.columns:
+        trailing = trailing_dividend_yield(hist[["Close"]], hist[["Dividends"]].fillna(0.0)).iloc[0]
+        if np.isfinite(trailing):
+            dividend_yield = round(float(trailing), 2)
+
+    return {
+        'sector': info.get('sector', "Non disponible"),
+        'industry': info.get('industry', "Non disponible"),
+        'country': info.get('country', "Non disponible"),
+        'pe_ratio': info.get('trailingPE', 0),
+        'dividend_yield': dividend_yield,
+        'eps': info.get('trailingEps', 0),
+        'market_cap': info.get('marketCap', 0) / 1_000_000_000,  # en milliards
+        'history': hist
+    }
+
+
+@cached_data(keys={"ticker": str.strip, "detailed": bool}, ttl=60)
 def get_stock_data(ticker, detailed=False):
     """
     Récupère les données récentes d'une action.
 
+    En mode détaillé, un seul appel .info et un seul historique sur 1 an
+    sont faits ; tous les champs dérivés sont calculés localement.
+
     Arguments:
         ticker (str): Symbole de l'action
         detailed (bool): Si True, récupère des données plus détaillées
@@ -36,65 +121,19 @@ def get_stock_data(ticker, detailed=False):
         dict: Dictionnaire contenant les données de l'action
     """
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = get_info(ticker)
 
         # Données actuelles
-        current_price = info.get('currentPrice', info.get('regularMarketPrice', 0))
-        previous_close = info.get('previousClose', info.get('regularMarketPreviousClose', 0))
-        change = current_price - previous_close
-        percent_change = (change / previous_close) * 100 if previous_close else 0
-
-        result = {
-            'current_price': current_price,
-            'previous_close': previous_close,
-            'change': change,
-            'percent_change': percent_change
-        }
+        result = quote_from_info(info)
 
         if detailed:
-            # Données financières et fondamentaux
-            sector = info.get('sector', "Non disponible")
-            industry = info.get('industry', "Non disponible")
-            country = info.get('country', "Non disponible")
-
-            pe_ratio = info.get('trailingPE', 0)
-            eps = info.get('trailingEps', 0)
-            market_cap = info.get('marketCap', 0) / 1_000_000_000  # en milliards
-
-            # Rendement du dividende (manuel + YFinance)
-            dividend_yields_dict = get_dividend_yields()
-            dividend_yield = dividend_yields_dict.get(ticker, info.get("dividendYield", 0)) or 0
-
-            # Performance YTD
-            history = stock.history(period="ytd")
-            if not history.empty:
-                ytd_start = history.iloc[0]['Close']
-                ytd_current = history.iloc[-1]['Close']
-                ytd_change = ((ytd_current - ytd_start) / ytd_start) * 100
-            else:
-                ytd_change = 0
-
-            # Historique sur 1 an
-            hist = stock.history(period="1y")
-
-            result.update({
-                'sector': sector,
-                'industry': industry,
-                'country': country,
-                'pe_ratio': pe_ratio,
-                'dividend_yield': dividend_yield,
-                'ytd_change': ytd_change,
-                'eps': eps,
-                'market_cap': market_cap,
-                'history': hist
-            })
+            hist = get_provider().history(ticker, period="1y")
+            result.update(_detailed_fields(ticker, info, hist))
 
         return result
 
     except Exception as e:
         st.warning(f"Erreur lors de la récupération des données pour {ticker}: {e}")
-        dividend_yields_dict = get_dividend_yields()
         result = {
             'current_price': 0,
             'previous_close': 0,
@@ -107,8 +146,7 @@ def get_stock_data(ticker, detailed=False):
                 'industry': "Non disponible",
                 'country': "Non disponible",
                 'pe_ratio': 0,
-                'dividend_yield': dividend_yields_dict.get(ticker, 0),
-                'ytd_change': 0,
+                'dividend_yield': 0,
                 'eps': 0,
                 'market_cap': 0,
                 'history': pd.DataFrame()
@@ -116,61 +154,649 @@ def get_stock_data(ticker, detailed=False):
         return result
 
 
+# ==========================
+# 🔹 2b. Cotations de plusieurs tickers en parallèle
+# ==========================
+def _fetch_quote(ticker):
+    return quote_from_info(get_info(ticker))
+
+
+def fetch_quotes(tickers, max_workers=QUOTE_MAX_WORKERS, timeout=QUOTE_TIMEOUT):
+    """
+    Récupère les cotations de plusieurs tickers en parallèle.
+
+    Les requêtes sont réparties sur un pool borné de threads. Chaque vague
+    de requêtes dispose de `timeout` secondes : un ticker lent ou en erreur
+    est simplement absent du résultat, sans retarder les autres.
+
+    Arguments:
+        tickers (list): Symboles des actions
+        max_workers (int): Nombre maximal de requêtes simultanées
+        timeout (float): Délai maximal par ticker, en secondes
+
+    Returns:
+        dict: {ticker: cotation} pour les tickers ayant répondu à temps
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+
+    workers = min(max_workers, len(tickers))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="quotes")
+    futures = {executor.submit(_fetch_quote, t): t for t in tickers}
+    done, _ = wait(futures, timeout=timeout * math.ceil(len(tickers) / workers))
+    # Ne pas attendre les requêtes encore en cours : elles sont abandonnées
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    return {
+        futures[f]: f.result()
+        for f in done
+        if f.exception() is None
+    }
+
+
+@st.cache_resource
+def get_quote_cache():
+    """Cache de cotations du processus, rafraîchi par un unique thread de fond."""
+    return QuoteCache(fetch_quotes).start()
+
+
+def get_quotes(tickers):
+    """
+    Cotations actuelles d'une liste de tickers (bandeau défilant, tableau
+    de composition), servies sans attente depuis le cache de cotations.
+    Chaque cotation porte son âge en secondes ('age') ; les tickers
+    indisponibles sont absents du résultat.
+    """
+    quotes = get_quote_cache().get(tickers)
+    missing = [t for t in tickers if t not in quotes]
+    if missing:
+        st.warning(f"Cotations indisponibles pour : {', '.join(missing)}")
+    return quotes
+
+
 # ==========================
 # 🔹 3. Données historiques
 # ==========================
-@st.cache_data(ttl=3600)
-def get_historical_data(tickers, start_date=None, end_date=None):
+def fetch_history_batch(tickers, start_date=None, end_date=None):
     """
-    Récupère les données historiques pour une liste de tickers.
+    Télécharge l'historique de plusieurs tickers en une seule requête groupée.
+
+    Arguments:
+        tickers (list): Symboles des actions et/ou des indices
+        start_date: Date de début
+        end_date: Date de fin (par défaut maintenant)
+
+    Returns:
+        dict: {ticker: DataFrame} au format de l'historique du fournisseur
     """
     if end_date is None:
         end_date = datetime.now()
+    return get_provider().history_batch(list(dict.fromkeys(tickers)), start=start_date, end=end_date)
+
+
+def sync_price_store(tickers, start_date=None, store=None):
+    """
+    Met à jour le stockage local des historiques.
+
+    Seules les barres postérieures à la dernière date stockée sont demandées
+    au fournisseur (la dernière barre est redemandée, elle pouvait être
+    partielle). L'historique complet, depuis HISTORY_START au plus tard,
+    n'est téléchargé que pour un nouveau ticker ou si la date de début
+    demandée précède celle déjà couverte.
+    Les tickers partageant la même date de reprise sont regroupés en une
+    seule requête. Un ticker mis à jour depuis moins de HISTORY_SYNC_TTL
+    par n'importe quel processus de l'hôte n'est pas redemandé.
+    """
+    store = store or PriceStore()
+    shared = get_shared_cache()
+    start = min(pd.Timestamp(start_date or HISTORY_START), pd.Timestamp(HISTORY_START)).normalize()
+
+    # Un seul processus de l'hôte met à jour le stockage à la fois
+    with shared.lock("price-store"):
+        groups = {}
+        for ticker in dict.fromkeys(tickers):
+            coverage = store.coverage_start(ticker)
+            last = store.last_date(ticker)
+            if last is None or coverage is None or start < coverage:
+                fetch_from = start
+            elif shared.get(f"history-synced:{ticker}"):
+                continue
+            else:
+                fetch_from = last.normalize()
+            groups.setdefault(fetch_from, []).append(ticker)
+
+        for fetch_from, group in groups.items():
+            fetched = fetch_history_batch(group, fetch_from, None)
+            for ticker, hist in fetched.items():
+                if hist.empty:
+                    continue
+                store.append(ticker, hist)
+                coverage = store.coverage_start(ticker)
+                if coverage is None or fetch_from < coverage:
+                    store.set_coverage_start(ticker, fetch_from)
+                shared.set(f"history-synced:{ticker}", True, HISTORY_SYNC_TTL)
+
+
+@cached_data(
+    keys={"tickers": canonical_tickers, "start_date": trading_day, "end_date": end_trading_day},
+    ttl=3600,
+    max_entries=16,
+)
+def get_historical_data(tickers, start_date=None, end_date=None):
+    """
+    Récupère les données historiques pour une liste de tickers
+    (actions du portefeuille et indices de référence).
+
+    Les historiques sont servis depuis le stockage local (data/prices/),
+    complété au préalable par une requête groupée ne portant que sur
+    les barres manquantes. Les arguments sont canonicalisés avant la
+    recherche en cache (tickers triés, dates arrondies au jour de bourse,
+    fin non passée -> None) : datetime.now() ne crée plus une clé par rerun.
+    """
+    store = PriceStore()
+    try:
+        sync_price_store(tickers, start_date, store)
+    except Exception as e:
+        st.warning(f"Erreur lors de la mise à jour des données historiques, données locales utilisées: {e}")
 
     data = {}
     for ticker in tickers:
-        try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start_date, end=end_date)
-            if not hist.empty:
-                hist.index = hist.index.tz_localize(None)
-                data[ticker] = hist
-            else:
-                data[ticker] = pd.DataFrame()
-        except Exception as e:
-            st.warning(f"Erreur lors de la récupération des données historiques pour {ticker}: {e}")
-            data[ticker] = pd.DataFrame()
+        hist = store.read(ticker, start_date, end_date)
+        if hist.empty:
+            st.warning(f"Aucune donnée historique disponible pour {ticker}")
+        data[ticker] = hist
     return data
 
 
+@cached_data(
+    keys={"tickers": canonical_tickers, "start_date": trading_day, "end_date": end_trading_day},
+    ttl=3600,
+    max_entries=16,
+)
+def get_price_matrix(tickers, start_date=None, end_date=None):
+    """
+    Matrice des clôtures dates (jours ouvrés) × tickers, alignée sur un
+    index commun et construite une seule fois par (tickers, période).
+    Les indices cumulés (get_cumulative_returns) et les taux de change en partent.
+    """
+    return build_price_matrix(get_historical_data(tickers, start_date, end_date), start_date)
+
+
+@st.cache_resource
+def _total_return_registry():
+    # {tickers: TotalReturnIndex} partagé par les sessions du processus
+    return {}, threading.Lock()
+
+
+def get_total_return_matrix(tickers):
+    """
+    Indice de rendement total (dividendes réinvestis) dates × tickers sur
+    tout l'historique stocké (depuis HISTORY_START), parti de la première
+    clôture de chaque ticker (voir total_return.TotalReturnIndex).
+
+    L'indice est conservé d'une exécution à l'autre : seules les séances
+    clôturées depuis le dernier appel y sont ajoutées. La séance du jour,
+    encore susceptible d'évoluer, prolonge l'indice renvoyé sans y être
+    enregistrée.
+
+    Arguments:
+        tickers (list): Symboles des actions et/ou des indices
+
+    Returns:
+        DataFrame: colonnes dans l'ordre de `tickers`
+    """
+    tickers = list(dict.fromkeys(tickers))
+    hist_data = get_historical_data(tickers, HISTORY_START)
+    prices = build_price_matrix(hist_data, HISTORY_START)
+    if prices.empty:
+        return prices
+    dividends = dividend_matrix(hist_data, prices.index)
+    closed = prices.index < pd.Timestamp(date.today())
+    if not closed.any():
+        return TotalReturnIndex(prices, dividends).index()
+
+    registry, lock = _total_return_registry()
+    key = canonical_tickers(tickers)
+    with lock:
+        index = registry.get(key)
+        known = 0 if index is None else len(index.dates)
+        if index is None or not prices.index[:known].equals(index.dates):
+            index = registry[key] = TotalReturnIndex(prices[closed], dividends[closed])
+        else:
+            index.update(prices[closed], dividends[closed])
+        levels = index.index(prices, dividends)
+    return levels[[t for t in tickers if t in levels.columns]]
+
+
+@cached_data(keys={"tickers": canonical_tickers}, ttl=3600, max_entries=16)
+def get_cumulative_returns(tickers, base_currency=None):
+    """
+    Indice cumulé des rendements, dividendes réinvestis, sur tout
+    l'historique stocké (depuis HISTORY_START, voir get_total_return_matrix).
+    Ne dépend pas de la période affichée : changer la date de début ne fait
+    que découper cet indice, sans accès réseau.
+
+    Les rendements sont lus sur l'indice de rendement total ; les clôtures
+    réelles et les dividendes sont conservés pour les prix affichés et le
+    décompte des titres (voir CumulativeReturns).
+
+    Arguments:
+        tickers (list): Symboles des actions
+        base_currency (str): devise de conversion des prix (None : devise locale)
+
+    Returns:
+        CumulativeReturns: colonnes dans l'ordre trié des tickers
+    """
+    hist_data = get_historical_data(tickers, HISTORY_START)
+    prices = get_price_matrix(tickers, HISTORY_START)
+    dividends = dividend_matrix(hist_data, prices.index)
+    levels = get_total_return_matrix(tickers)
+    if base_currency is not None:
+        prices, levels, dividends = (to_base_currency(m, base_currency) for m in (prices, levels, dividends))
+    return CumulativeReturns(prices, levels, dividends)
+
+
+def get_market_returns(tickers, reference_indices):
+    """
+    Indices cumulés du portefeuille et des indices de référence, issus
+    d'une seule requête groupée et du même indice en cache (voir get_cumulative_returns).
+
+    Returns:
+        tuple: (CumulativeReturns du portefeuille dans l'ordre de `tickers`,
+                CumulativeReturns des indices, une colonne par nom d'indice)
+    """
+    returns = get_cumulative_returns(list(tickers) + list(reference_indices.values()))
+    names = {ticker: name for name, ticker in reference_indices.items()}
+    return returns.subset(tickers), returns.subset(list(names), names)
+
+
+def returns_table_tickers():
+    """Tickers du tableau des rendements : portefeuille, watchlist et indices de référence."""
+    tickers = load_portfolio_data()["Ticker"].tolist()
+    tickers += load_watchlist_data()["Ticker"].dropna().str.strip().tolist()
+    tickers += list(REFERENCE_INDICES.values())
+    return list(dict.fromkeys(tickers))
+
+
+@cached_data(keys={"day": canonical_date}, ttl=RETURNS_TABLE_TTL, max_entries=2)
+def _returns_table(day):
+    def build():
+        return build_returns_table(get_historical_data(returns_table_tickers(), HISTORY_START))
+    return get_shared_cache().get_or_compute(f"returns-table:{day}", build, RETURNS_TABLE_TTL)
+
+
+def get_returns_table():
+    """
+    Rendements 1 j, 1 sem., 1 mois, 3 mois, YTD, 1 an, 3 ans et 5 ans de
+    tous les tickers du portefeuille, de la watchlist et des indices de
+    référence (voir returns_table.build_returns_table).
+
+    Le tableau est construit une fois par jour, en une passe sur les
+    historiques stockés, et partagé entre processus : les pages n'y font
+    qu'une lecture.
+
+    Returns:
+        DataFrame: tickers × horizons (rendements en %)
+    """
+    return _returns_table(date.today())
+
+
+@cached_data(
+    keys={"tickers": canonical_tickers, "start_date": trading_day, "end_date": end_trading_day},
+    ttl=3600,
+    max_entries=64,
+)
+def get_risk_metrics(tickers, reference_indices, start_date=None, end_date=None, rebalance="buy_and_hold",
+                     weights=None):
+    """
+    Indicateurs de risque du portefeuille, de chaque titre et des indices
+    de référence sur la période, en cache par (tickers, période).
+
+    Arguments:
+        tickers (list): Symboles du portefeuille
+        reference_indices (dict): {nom de l'indice: ticker}
+        rebalance (str): mode de rééquilibrage du portefeuille (voir nav_engine)
+        weights (dict): {ticker: pondération} (None : équipondéré)
+
+    Returns:
+        DataFrame: une ligne par série (voir risk_metrics.compute_risk_metrics)
+    """
+    returns, benchmarks = get_market_returns(tickers, reference_indices)
+    prices = returns.window_index(start_date, end_date)
+    if len(prices) < 3:
+        return pd.DataFrame()
+
+    w = None if weights is None else [weights.get(t, 0.0) for t in prices.columns]
+    nav = simulate_nav(prices, w, initial_value=1.0, rebalance=rebalance).nav.rename("Portefeuille")
+    bench = benchmarks.rebase(prices.index[0], prices.index[-1], common=False)
+    bench = bench.reindex(prices.index, method="ffill").bfill().dropna(axis=1, how="all")
+    daily = simple_returns(pd.concat([nav, prices, bench], axis=1))
+    return compute_risk_metrics(daily, daily[bench.columns])
+
+
+@cached_data(
+    keys={"tickers": canonical_tickers, "start_date": trading_day, "end_date": end_trading_day},
+    ttl=3600,
+    max_entries=64,
+)
+def get_attribution(tickers, reference_indices, start_date=None, end_date=None, rebalance="buy_and_hold",
+                    weights=None):
+    """
+    Attribution de performance sur la période, en cache par (tickers,
+    pondérations, période) : contribution de chaque titre, rendement actif
+    contre l'équipondéré et les indices, Brinson par secteur et par pays.
+
+    Arguments:
+        tickers (list): Symboles du portefeuille
+        reference_indices (dict): {nom de l'indice: ticker}
+        rebalance (str): mode de rééquilibrage du portefeuille (voir nav_engine)
+        weights (dict): {ticker: pondération} (None : équipondéré)
+
+    Returns:
+        dict: voir attribution.compute_attribution, None si moins de 2 séances
+    """
+    returns, benchmarks = get_market_returns(tickers, reference_indices)
+    prices = returns.window_index(start_date, end_date)
+    if len(prices) < 2:
+        return None
+
+    metadata = load_sector_country_data(list(prices.columns))
+    groups = {
+        "Secteur": dict(zip(metadata["Ticker"], metadata["Sector"])),
+        "Pays": dict(zip(metadata["Ticker"], metadata["Country"])),
+    }
+    index_returns = benchmarks.period_returns(prices.index[0], prices.index[-1])["Rendement"]
+    w = None if weights is None else [weights.get(t, 0.0) for t in prices.columns]
+    return compute_attribution(prices, w, groups, rebalance, index_returns)
+
+
+@st.cache_resource
+def _rolling_stats_registry():
+    # {(tickers, indice): RollingStats} partagé par les sessions du processus
+    return {}, threading.Lock()
+
+
+def get_rolling_stats(tickers, benchmark, windows=ROLLING_WINDOWS):
+    """
+    Volatilité, corrélation et bêta glissants de chaque titre contre
+    `benchmark`, pour toutes les fenêtres demandées, calculés sur les
+    rendements dividendes réinvestis.
+
+    Les cumuls sont conservés d'une exécution à l'autre : seules les
+    séances clôturées depuis le dernier appel y sont ajoutées (la séance
+    du jour, encore susceptible d'évoluer, n'est pas intégrée).
+
+    Arguments:
+        tickers (list): Symboles des actions
+        benchmark (str): Ticker de l'indice de référence
+        windows (tuple): longueurs de fenêtre, en séances
+
+    Returns:
+        dict: {fenêtre: {'Volatilité (%)', 'Corrélation', 'Bêta': DataFrame}}
+    """
+    tickers = list(dict.fromkeys(tickers))
+    prices = get_total_return_matrix(tickers + [benchmark])
+    returns = simple_returns(prices)
+    returns = returns.loc[returns.index < pd.Timestamp(date.today())]
+
+    registry, lock = _rolling_stats_registry()
+    key = (canonical_tickers(tickers), benchmark)
+    with lock:
+        stats = registry.get(key)
+        known = 0 if stats is None else len(stats.dates)
+        if stats is not None and returns.index[:known].equals(stats.dates):
+            new = returns.iloc[known:]
+            if len(new):
+                stats.append(new[list(stats.columns)], new[benchmark])
+        else:
+            stats = registry[key] = RollingStats(returns[tickers], returns[benchmark])
+        return stats.compute(windows)
+
+
+@cached_data(keys={"tickers": canonical_tickers, "start_date": trading_day}, ttl=3600, max_entries=32)
+def get_monte_carlo(tickers, start_date=None, method="bootstrap", horizon=252, n_paths=10_000,
+                    initial_value=1_000_000, seed=0, weights=None):
+    """
+    Projection Monte Carlo du portefeuille (équipondéré si `weights`,
+    {ticker: pondération}, est absent), valorisé en euros, à partir des
+    rendements observés depuis `start_date`.
+
+    Au-delà de MONTE_CARLO_POOL_THRESHOLD trajectoires, les paquets sont
+    répartis sur un pool de processus (résultat identique à graine égale).
+
+    Returns:
+        tuple: (bandes de percentiles, résumé de la distribution finale),
+               (None, None) si l'historique est insuffisant
+    """
+    prices = get_cumulative_returns(tickers, fx.BASE_CURRENCY).window_index(start_date)
+    if len(prices) < 3:
+        return None, None
+    workers = os.cpu_count() if n_paths >= MONTE_CARLO_POOL_THRESHOLD else None
+    w = None if weights is None else [weights.get(t, 0.0) for t in prices.columns]
+    return simulate_portfolio(
+        simple_returns(prices), w, horizon=horizon, n_paths=n_paths, method=method,
+        initial_value=initial_value, seed=seed, workers=workers,
+    )
+
+
+@st.cache_resource
+def _covariance_registry():
+    # {(tickers, date de début): CovarianceEngine} partagé par les sessions du processus
+    return {}, threading.Lock()
+
+
+@cached_data(keys={"tickers": canonical_tickers, "start_date": trading_day}, ttl=3600, max_entries=32)
+def get_return_moments(tickers, start_date=None, estimator="ledoit_wolf"):
+    """
+    Rendement moyen et covariance quotidiens des tickers depuis `start_date`
+    (séances où tous cotent), point d'entrée commun des analyses
+    transversales (corrélations, optimisation, VaR).
+
+    Le moteur de covariance est conservé d'une exécution à l'autre : seules
+    les séances clôturées depuis le dernier appel y sont ajoutées.
+
+    Arguments:
+        tickers (list): Symboles des actions
+        start_date: Date de début de l'estimation
+        estimator (str): "sample" ou "ledoit_wolf" (voir covariance.ESTIMATORS)
+
+    Returns:
+        tuple: (Series des rendements moyens, DataFrame de covariance,
+                intensité de rétrécissement), (None, None, None) si moins de 3 séances
+    """
+    tickers = list(tickers)
+    prices = get_cumulative_returns(tickers).window_index(start_date)
+    returns = simple_returns(prices)
+    returns = returns.loc[returns.index < pd.Timestamp(date.today())]
+    if len(returns) < 3:
+        return None, None, None
+
+    registry, lock = _covariance_registry()
+    key = (tuple(tickers), trading_day(start_date))
+    with lock:
+        engine = registry.get(key)
+        known = 0 if engine is None else len(engine.dates)
+        if engine is not None and returns.index[:known].equals(engine.dates):
+            if len(returns) > known:
+                engine.append(returns.iloc[known:])
+        else:
+            engine = registry[key] = CovarianceEngine(returns)
+        shrinkage = engine.shrinkage() if estimator == "ledoit_wolf" else 0.0
+        return engine.mean(), engine.covariance(estimator), shrinkage
+
+
+@st.cache_resource
+def _optimizer_registry():
+    # {tickers: PortfolioOptimizer} : dernières solutions réutilisées au démarrage à chaud
+    return {}, threading.Lock()
+
+
+def _optimize(tickers, start_date, bounds, solve):
+    """
+    Applique `solve(optimiseur)` à l'optimiseur partagé, alimenté par
+    get_return_moments et repartant des solutions précédentes. La mise à
+    jour des moments et la résolution se font sous le même verrou : une
+    autre session ne peut pas changer de fenêtre entre les deux.
+
+    Returns:
+        résultat de `solve`, None si l'historique est insuffisant
+    """
+    mean, cov, _ = get_return_moments(tickers, start_date, "ledoit_wolf")
+    if mean is None:
+        return None
+    registry, lock = _optimizer_registry()
+    key = (tuple(mean.index), tuple(bounds))
+    with lock:
+        optimizer = registry.get(key)
+        if optimizer is None:
+            optimizer = registry[key] = PortfolioOptimizer(mean, cov, bounds)
+        else:
+            optimizer.update(mean, cov)
+        return solve(optimizer)
+
+
+@cached_data(keys={"tickers": canonical_tickers, "start_date": trading_day}, ttl=3600, max_entries=64)
+def get_optimal_weights(tickers, start_date=None, method="equal", bounds=DEFAULT_BOUNDS):
+    """
+    Pondérations du portefeuille selon `method` (voir optimizer.OPTIMIZATION_METHODS),
+    estimées sur les rendements depuis `start_date` (covariance de Ledoit-Wolf).
+
+    Returns:
+        dict: {ticker: pondération}, None si l'historique est insuffisant
+    """
+    if method == "equal":
+        return {t: 1.0 / len(tickers) for t in tickers}
+    return _optimize(
+        tickers, start_date, bounds, lambda optimizer: dict(zip(optimizer.tickers, optimizer.optimize(method)))
+    )
+
+
+@cached_data(keys={"tickers": canonical_tickers, "start_date": trading_day}, ttl=3600, max_entries=16)
+def get_efficient_frontier(tickers, start_date=None, n_points=25, bounds=DEFAULT_BOUNDS):
+    """
+    Frontière efficiente, titres individuels et portefeuilles optimisés,
+    en rendement et volatilité annualisés (%).
+
+    Returns:
+        tuple: (frontière, titres, portefeuilles), DataFrames ; (None, None, None)
+               si l'historique est insuffisant
+    """
+    columns = ["Rendement (%)", "Volatilité (%)"]
+
+    def solve(optimizer):
+        frontier = pd.DataFrame(
+            [(ret * 100, vol * 100) for ret, vol, _ in optimizer.efficient_frontier(n_points)], columns=columns
+        )
+        assets = pd.DataFrame(
+            {"Rendement (%)": optimizer.mu * 100, "Volatilité (%)": np.sqrt(np.diag(optimizer.cov)) * 100},
+            index=optimizer.tickers,
+        )
+        portfolios = pd.DataFrame(
+            [np.array(optimizer.performance(optimizer.optimize(m))[:2]) * 100 for m in OPTIMIZATION_METHODS],
+            index=list(OPTIMIZATION_METHODS.values()), columns=columns,
+        )
+        return frontier, assets, portfolios
+
+    return _optimize(tickers, start_date, bounds, solve) or (None, None, None)
+
+
+@cached_data(keys={"tickers": canonical_tickers}, ttl=3600, max_entries=32)
+def get_value_at_risk(tickers, weights=None, window=VAR_WINDOW):
+    """
+    Moteur de VaR / CVaR du portefeuille valorisé en euros, estimé sur les
+    `window` dernières séances, en cache par (tickers, pondérations, fenêtre) :
+    changer le niveau de confiance, l'horizon ou la méthode ne relance
+    aucun calcul sur l'historique.
+
+    Arguments:
+        tickers (list): Symboles des actions
+        weights (dict): {ticker: pondération} (None : équipondéré)
+        window (int): nombre de séances
+
+    Returns:
+        ValueAtRisk: colonnes dans l'ordre trié des tickers, None si l'historique est insuffisant
+    """
+    prices = get_cumulative_returns(tickers, fx.BASE_CURRENCY).window_index()
+    if len(prices) < 3:
+        return None
+    w = None if weights is None else [weights.get(t, 0.0) for t in prices.columns]
+    return ValueAtRisk(simple_returns(prices), w, window)
+
+
+# ==========================
+# 🔹 3b. Devises
+# ==========================
+def get_fx_rates(currencies, start_date=None, end_date=None, base=fx.BASE_CURRENCY):
+    """
+    Cours quotidiens des paires de change nécessaires pour ramener
+    `currencies` en `base`. Ils suivent le même chemin que les actions
+    (magasin Parquet local, matrice en cache) : un taux déjà stocké
+    n'est jamais redemandé.
+
+    Returns:
+        DataFrame: une colonne par paire (ex. 'USDEUR=X'), vide si aucune
+    """
+    pairs = fx.fx_pairs(currencies, base)
+    if not pairs:
+        return pd.DataFrame()
+    return get_price_matrix(pairs, start_date, end_date)
+
+
+def to_base_currency(prices, base=fx.BASE_CURRENCY):
+    """
+    Matrice de prix dates × tickers convertie dans la devise `base`.
+    """
+    if prices is None or prices.empty:
+        return prices
+    currencies = {t: fx.currency_of(t) for t in prices.columns}
+    # Fin ouverte : la borne de fin du stockage est exclue, le taux de la
+    # dernière date de prix serait sinon remplacé par celui de la veille
+    fx_rates = get_fx_rates(currencies.values(), prices.index[0], None, base)
+    return fx.convert(prices, fx_rates, currencies, base)
+
+
 # =====================
 # 🔹 4. Secteur & Pays
 # =====================
-@st.cache_data
-def load_sector_country_data(tickers):
+@st.cache_resource
+def get_metadata_cache():
+    """Cache des métadonnées société (secteur, pays, industrie), persisté sur disque."""
+    return MetadataCache(get_info)
+
+
+def get_company_metadata(tickers):
+    """
+    Secteur, pays et industrie de chaque ticker, depuis le cache longue durée.
+
+    Returns:
+        DataFrame: colonnes Ticker, Sector, Country, Industry
+    """
+    metadata = get_metadata_cache().get(tickers)
+    missing = [tk for tk in tickers if tk not in metadata]
+    if missing:
+        st.warning(f"Erreur lors de la récupération des données sectorielles pour : {', '.join(missing)}")
+
     data = []
     for tk in tickers:
-        try:
-            info = yf.Ticker(tk).info
-            data.append({
-                "Ticker": tk,
-                "Sector": info.get("sector", "Non disponible"),
-                "Country": info.get("country", "Non disponible")
-            })
-        except Exception as e:
-            st.warning(f"Erreur lors de la récupération des données sectorielles pour {tk}: {e}")
-            data.append({
-                "Ticker": tk,
-                "Sector": "Non disponible",
-                "Country": "Non disponible"
-            })
+        entry = metadata.get(tk, {})
+        data.append({
+            "Ticker": tk,
+            "Sector": entry.get("sector", "Non disponible"),
+            "Country": entry.get("country", "Non disponible"),
+            "Industry": entry.get("industry", "Non disponible")
+        })
     return pd.DataFrame(data)
 
 
+def load_sector_country_data(tickers):
+    return get_company_metadata(tickers)[["Ticker", "Sector", "Country"]]
+
+
 # ================
 # 🔹 5. Watchlist 
 # ================
-@st.cache_data
+@cached_data()
 def load_watchlist_data():
     try:
         return pd.read_csv("data/stock_data_7v.csv")
@@ -0,0 +1,107 @@
+import numpy as np
+
+# Points conservés par courbe : de l'ordre de la largeur en pixels d'un
+# graphique pleine largeur (mise en page "wide"), au-delà l'œil ne distingue rien
+DEFAULT_MAX_POINTS = 1200
+
+DOWNSAMPLING_METHODS = ("lttb", "minmax")
+
+
+def _buckets(n, n_buckets):
+    """Bornes [début, fin[ de `n_buckets` seaux couvrant les points 1 à n - 2."""
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(int)
+    return edges[:-1], edges[1:]
+
+
+def lttb_indices(y, n_out):
+    """
+    Positions retenues par Largest-Triangle-Three-Buckets : le premier et le
+    dernier point, puis dans chaque seau le point formant le plus grand
+    triangle avec le point retenu dans le seau précédent et la moyenne du
+    seau suivant. Les pics et les creux visibles sont conservés.
+
+    Les abscisses sont les positions (séances régulièrement espacées).
+
+    Returns:
+        array: positions croissantes, n_out au plus
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    starts, ends = _buckets(n, n_out - 2)
+    # Moyenne de chaque seau ; après le dernier seau, le dernier point
+    sums = np.add.reduceat(y[:n - 1], starts)
+    mean_x = np.append((starts + ends - 1) / 2, n - 1).tolist()
+    mean_y = np.append(sums / (ends - starts), y[-1]).tolist()
+
+    # Chaque choix dépend du point retenu au seau précédent : boucle
+    # séquentielle sur des flottants Python, plus rapide que des appels
+    # numpy sur des seaux de quelques points
+    values = y.tolist()
+    kept = [0]
+    a = 0
+    for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        dx, dy = a - mean_x[i + 1], mean_y[i + 1] - values[a]
+        best, selected = -1.0, start
+        for b in range(start, end):
+            area = abs(dx * (values[b] - values[a]) - (a - b) * dy)
+            if area > best:
+                best, selected = area, b
+        kept.append(selected)
+        a = selected
+    kept.append(n - 1)
+    return np.array(kept)
+
+
+def minmax_indices(y, n_out):
+    """
+    Positions retenues par décimation min / max : le minimum et le maximum
+    de chaque seau, plus le premier et le dernier point. Entièrement
+    vectorisé ; les extrêmes sont exacts.
+
+    Returns:
+        array: positions croissantes, n_out au plus
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    n_buckets = (n_out - 2) // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    starts, ends = _buckets(n, n_buckets)
+    width = int((ends - starts).max())
+    positions = np.minimum(starts[:, None] + np.arange(width), ends[:, None] - 1)
+    values = y[positions]
+    rows = np.arange(n_buckets)
+    lows = positions[rows, values.argmin(axis=1)]
+    highs = positions[rows, values.argmax(axis=1)]
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
+
+
+def downsample(index, values, max_points=DEFAULT_MAX_POINTS, method="lttb"):
+    """
+    Réduit une série au nombre de points affichables avant de l'envoyer au
+    navigateur. Les valeurs manquantes sont écartées ; une série déjà assez
+    courte est renvoyée telle quelle.
+
+    Arguments:
+        index (Index): abscisses (dates)
+        values (array): ordonnées
+        max_points (int): nombre maximal de points conservés
+        method (str): "lttb" (courbes) ou "minmax" (extrêmes exacts)
+
+    Returns:
+        tuple: (abscisses, ordonnées) retenues
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Méthode de sous-échantillonnage inconnue : {method}")
+    values = np.asarray(values, dtype=float)
+    finite = np.isfinite(values)
+    if not finite.all():
+        index, values = index[finite], values[finite]
+    if max_points is None or len(values) <= max_points:
+        return index, values
+    kept = lttb_indices(values, max_points) if method == "lttb" else minmax_indices(values, max_points)
+    return index[kept], values[kept]
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+# Devise de valorisation du portefeuille
+BASE_CURRENCY = "EUR"
+
+# Devise de cotation selon le suffixe de place Yahoo Finance
+# (Londres cote en pence : GBp = 1/100 GBP)
+EXCHANGE_CURRENCIES = {
+    ".PA": "EUR",
+    ".AS": "EUR",
+    ".DE": "EUR",
+    ".MI": "EUR",
+    ".MC": "EUR",
+    ".BR": "EUR",
+    ".SW": "CHF",
+    ".L": "GBp",
+}
+
+# Devise des indices de référence (tickers « ^ », sans suffixe de place)
+INDEX_CURRENCIES = {
+    "^FCHI": "EUR",
+    "^STOXX50E": "EUR",
+    "^GDAXI": "EUR",
+    "^GSPC": "USD",
+    "^IXIC": "USD",
+    "^DJI": "USD",
+    "^FTSE": "GBP",
+    "^SSMI": "CHF",
+}
+
+# Sous-unités : (devise principale, facteur de conversion)
+SUBUNITS = {
+    "GBp": ("GBP", 0.01),
+}
+
+CURRENCY_SYMBOLS = {
+    "EUR": "€",
+    "USD": "$",
+    "CHF": "CHF",
+    "GBP": "£",
+    "GBp": "£",
+}
+
+
+def currency_of(ticker):
+    """Devise ISO de cotation d'un ticker (USD par défaut, places américaines)."""
+    if ticker.upper() in INDEX_CURRENCIES:
+        return INDEX_CURRENCIES[ticker.upper()]
+    for suffix, currency in EXCHANGE_CURRENCIES.items():
+        if ticker.upper().endswith(suffix.upper()):
+            return currency
+    return "USD"
+
+
+def currency_symbol(currency):
+    """Symbole d'affichage d'une devise ISO."""
+    return CURRENCY_SYMBOLS.get(currency, currency)
+
+
+def fx_pair(currency, base=BASE_CURRENCY):
+    """
+    Ticker Yahoo Finance du taux « 1 unité de `currency` en `base` »,
+    ou None si aucune conversion n'est nécessaire.
+    """
+    currency = SUBUNITS.get(currency, (currency, 1.0))[0]
+    if currency == base:
+        return None
+    return f"{currency}{base}=X"
+
+
+def fx_pairs(currencies, base=BASE_CURRENCY):
+    """Paires de change nécessaires pour ramener ces devises en `base`, sans doublons."""
+    pairs = (fx_pair(c, base) for c in currencies)
+    return list(dict.fromkeys(p for p in pairs if p is not None))
+
+
+def conversion_factors(currencies, fx_rates, index, base=BASE_CURRENCY):
+    """
+    Matrice dates × tickers des facteurs de conversion vers `base`.
+
+    Arguments:
+        currencies (dict): {ticker: devise ISO de cotation}
+        fx_rates (DataFrame): cours des paires de change, une colonne par paire
+        index (DatetimeIndex): dates de la matrice de prix à convertir
+        base (str): devise de valorisation
+
+    Les taux sont alignés sur `index` en reportant la dernière valeur
+    connue ; une devise sans taux disponible donne une colonne NaN.
+    """
+    rates = fx_rates.reindex(fx_rates.index.union(index)).ffill().bfill().reindex(index)
+    factors = np.full((len(index), len(currencies)), np.nan)
+    for j, currency in enumerate(currencies.values()):
+        pair = fx_pair(currency, base)
+        scale = SUBUNITS.get(currency, (currency, 1.0))[1]
+        if pair is None:
+            factors[:, j] = scale
+        elif pair in rates.columns:
+            factors[:, j] = rates[pair].to_numpy(dtype=float) * scale
+    return pd.DataFrame(factors, index=index, columns=list(currencies))
+
+
+def convert(prices, fx_rates, currencies=None, base=BASE_CURRENCY):
+    """
+    Convertit une matrice de prix dates × tickers dans la devise `base`
+    (une seule multiplication terme à terme).
+
+    Arguments:
+        prices (DataFrame): matrice de prix en devises locales
+        fx_rates (DataFrame): cours des paires de change (voir fx_pairs)
+        currencies (dict): {ticker: devise}, déduit des suffixes si absent
+    """
+    if prices.empty:
+        return prices
+    if currencies is None:
+        currencies = {t: currency_of(t) for t in prices.columns}
+    else:
+        currencies = {t: currencies.get(t, currency_of(t)) for t in prices.columns}
+    factors = conversion_factors(currencies, fx_rates, prices.index, base)
+    values = prices.to_numpy(dtype=float) * factors.to_numpy()
+    return pd.DataFrame(values, index=prices.index, columns=prices.columns)
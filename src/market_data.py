@@ -0,0 +1,350 @@
+import os
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from collections import Counter
+from datetime import datetime
+from urllib.parse import quote
+
+# Choix du fournisseur de données (variables d'environnement)
+#   KOMOREBI_PROVIDER        : "yfinance" (défaut) ou "replay"
+#   KOMOREBI_REPLAY_DIR      : dossier des données rejouées
+#   KOMOREBI_REPLAY_LATENCY  : latence simulée par requête, en secondes
+DEFAULT_REPLAY_DIR = "data/replay"
+
+# Périodes acceptées par history(period=...)
+_PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+
+def quote_from_info(info):
+    """Extrait prix, clôture précédente et variation du dictionnaire .info."""
+    current_price = info.get('currentPrice', info.get('regularMarketPrice', 0))
+    previous_close = info.get('previousClose', info.get('regularMarketPreviousClose', 0))
+    change = current_price - previous_close
+    percent_change = (change / previous_close) * 100 if previous_close else 0
+
+    return {
+        'current_price': current_price,
+        'previous_close': previous_close,
+        'change': change,
+        'percent_change': percent_change
+    }
+
+
+def _naive_index(hist):
+    if not hist.empty and hist.index.tz is not None:
+        hist.index = hist.index.tz_localize(None)
+    return hist
+
+
+# ==========================
+# 🔹 1. Interface commune
+# ==========================
+class MarketDataProvider:
+    """
+    Interface des sources de données de marché utilisées par l'application :
+    cotations, fiches société (.info), historiques d'actions et d'indices.
+    """
+
+    def info(self, ticker):
+        """Fiche société au format de yf.Ticker(ticker).info."""
+        raise NotImplementedError
+
+    def quote(self, ticker):
+        """Cotation actuelle : prix, clôture précédente et variation."""
+        return quote_from_info(self.info(ticker))
+
+    def history(self, ticker, start=None, end=None, period=None):
+        """Historique OHLCV d'un ticker (index sans fuseau horaire)."""
+        raise NotImplementedError
+
+    def history_batch(self, tickers, start=None, end=None):
+        """Historiques de plusieurs tickers : {ticker: DataFrame}."""
+        return {t: self.history(t, start=start, end=end) for t in tickers}
+
+    def index_history(self, tickers, start=None, end=None):
+        """Historiques des indices de référence : {ticker: DataFrame}."""
+        return self.history_batch(tickers, start=start, end=end)
+
+
+# ==========================
+# 🔹 2. Yahoo Finance
+# ==========================
+def _split_batch(raw, tickers):
+    """
+    Découpe le DataFrame renvoyé par yf.download (colonnes multi-niveaux
+    ticker / champ) en un dictionnaire {ticker: DataFrame}.
+    """
+    data = {}
+    for ticker in tickers:
+        if raw is None or raw.empty:
+            data[ticker] = pd.DataFrame()
+            continue
+        if isinstance(raw.columns, pd.MultiIndex):
+            if ticker not in raw.columns.get_level_values(0):
+                data[ticker] = pd.DataFrame()
+                continue
+            hist = raw[ticker].copy()
+        else:
+            hist = raw.copy()
+
+        # Les jours de cotation des autres places apparaissent en NaN
+        hist = hist[hist["Close"].notna()] if "Close" in hist.columns else pd.DataFrame()
+        hist = hist.drop(columns="Adj Close", errors="ignore")
+        hist.columns.name = None
+        data[ticker] = _naive_index(hist)
+    return data
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Données en direct depuis Yahoo Finance.
+
+    Les cours sont demandés non ajustés des dividendes (auto_adjust=False) :
+    un cours ajusté est recalculé par Yahoo à chaque détachement, ce qui
+    rendrait incohérentes les barres stockées au fil de l'eau. Les colonnes
+    Dividends et Stock Splits servent au calcul local du rendement total
+    (voir total_return). Les cours restent ajustés des divisions d'actions.
+    """
+
+    def __init__(self):
+        import yfinance as yf
+        self._yf = yf
+
+    def info(self, ticker):
+        return self._yf.Ticker(ticker).info
+
+    def history(self, ticker, start=None, end=None, period=None):
+        if period is not None:
+            hist = self._yf.Ticker(ticker).history(period=period, auto_adjust=False)
+        else:
+            hist = self._yf.Ticker(ticker).history(start=start, end=end, auto_adjust=False)
+        return _naive_index(hist.drop(columns="Adj Close", errors="ignore"))
+
+    def history_batch(self, tickers, start=None, end=None):
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        raw = self._yf.download(
+            tickers,
+            start=start,
+            end=end,
+            group_by="ticker",
+            auto_adjust=False,
+            actions=True,
+            threads=True,
+            progress=False,
+        )
+        return _split_batch(raw, tickers)
+
+
+# ==========================
+# 🔹 3. Rejeu hors ligne
+# ==========================
+class ReplayProvider(MarketDataProvider):
+    """
+    Fournisseur hors ligne servant des données enregistrées ou synthétiques.
+
+    Organisation du dossier :
+        <root>/info/<ticker>.json        fiche société
+        <root>/history/<ticker>.parquet  historique OHLCV
+
+    Chaque requête attend `latency` secondes pour reproduire le coût d'un
+    aller-retour réseau ; une requête groupée ne compte qu'une fois.
+    Le compteur `calls` recense les requêtes par méthode.
+    """
+
+    def __init__(self, root=DEFAULT_REPLAY_DIR, latency=0.0):
+        self.root = root
+        self.latency = latency
+        self.calls = Counter()
+        self._history_cache = {}
+
+    def _path(self, kind, ticker, ext):
+        return os.path.join(self.root, kind, f"{quote(ticker, safe='')}.{ext}")
+
+    def _wait(self, method):
+        self.calls[method] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _load_history(self, ticker):
+        if ticker not in self._history_cache:
+            path = self._path("history", ticker, "parquet")
+            self._history_cache[ticker] = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame()
+        return self._history_cache[ticker]
+
+    def _slice(self, hist, start=None, end=None, period=None):
+        if hist.empty:
+            return hist.copy()
+        if period is not None:
+            last = hist.index[-1]
+            if period == "ytd":
+                start = pd.Timestamp(last.year, 1, 1)
+            elif period == "max":
+                start = None
+            else:
+                start = last - _PERIOD_OFFSETS[period]
+            end = None
+        if start is not None:
+            hist = hist[hist.index >= pd.Timestamp(start)]
+        if end is not None:
+            hist = hist[hist.index < pd.Timestamp(end)]
+        return hist.copy()
+
+    def info(self, ticker):
+        self._wait("info")
+        path = self._path("info", ticker, "json")
+        if not os.path.exists(path):
+            raise LookupError(f"Aucune fiche enregistrée pour {ticker}")
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def history(self, ticker, start=None, end=None, period=None):
+        self._wait("history")
+        return self._slice(self._load_history(ticker), start, end, period)
+
+    def history_batch(self, tickers, start=None, end=None):
+        self._wait("history_batch")
+        return {t: self._slice(self._load_history(t), start, end) for t in dict.fromkeys(tickers)}
+
+    # ----- Alimentation du dossier -----
+    def save(self, ticker, info=None, history=None):
+        """Enregistre la fiche et/ou l'historique d'un ticker."""
+        if info is not None:
+            os.makedirs(os.path.join(self.root, "info"), exist_ok=True)
+            with open(self._path("info", ticker, "json"), "w", encoding="utf-8") as f:
+                json.dump(info, f, indent=2, default=str)
+        if history is not None:
+            os.makedirs(os.path.join(self.root, "history"), exist_ok=True)
+            history.to_parquet(self._path("history", ticker, "parquet"))
+            self._history_cache.pop(ticker, None)
+
+
+def record(tickers, root=DEFAULT_REPLAY_DIR, start=None, end=None, source=None):
+    """Enregistre fiches et historiques depuis un fournisseur réel pour les rejouer hors ligne."""
+    source = source or YFinanceProvider()
+    replay = ReplayProvider(root)
+    histories = source.history_batch(tickers, start=start, end=end)
+    for ticker in tickers:
+        try:
+            info = source.info(ticker)
+        except Exception:
+            info = None
+        replay.save(ticker, info=info, history=histories.get(ticker))
+    return replay
+
+
+def generate_synthetic(tickers, root=DEFAULT_REPLAY_DIR, start="2015-01-01", end=None, seed=0):
+    """
+    Génère des historiques synthétiques (mouvement brownien géométrique
+    sur jours ouvrés) et des fiches société plausibles.
+
+    Les actions (hors indices « ^ » et paires de change « =X ») détachent un
+    dividende trimestriel : le cours baisse du montant versé le jour du
+    détachement, comme un cours réel non ajusté.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, end or datetime.now().date())
+    replay = ReplayProvider(root)
+    sectors = ["Technology", "Healthcare", "Industrials", "Energy", "Financial Services", "Utilities"]
+    countries = ["United States", "France", "Switzerland", "United Kingdom"]
+
+    for i, ticker in enumerate(tickers):
+        drift, vol = rng.uniform(0.0, 0.12), rng.uniform(0.15, 0.40)
+        level = rng.uniform(20, 500)
+        if ticker.endswith("=X"):
+            # Paire de change : niveau proche de 1, faible volatilité
+            drift, vol, level = 0.0, rng.uniform(0.05, 0.10), rng.uniform(0.8, 1.3)
+        log_ret = rng.normal((drift - vol ** 2 / 2) / 252, vol / np.sqrt(252), len(dates))
+        close = level * np.exp(np.cumsum(log_ret))
+        dividends = np.zeros(len(dates))
+        if not ticker.startswith("^") and not ticker.endswith("=X"):
+            # Rendement annuel de 0 à 5 %, détaché le premier jour ouvré du trimestre
+            quarterly = rng.uniform(0, 0.05) / 4
+            ex_dates = np.flatnonzero(dates.to_series().dt.quarter.diff().fillna(0).to_numpy() != 0)
+            drop = np.ones(len(dates))
+            drop[ex_dates] = 1 - quarterly
+            close = close * np.cumprod(drop)
+            dividends[ex_dates] = close[ex_dates] * quarterly / (1 - quarterly)
+        open_ = close * np.exp(rng.normal(0, vol / np.sqrt(252) / 2, len(dates)))
+        hist = pd.DataFrame({
+            "Open": open_,
+            "High": np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, len(dates))),
+            "Low": np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, len(dates))),
+            "Close": close,
+            "Volume": rng.integers(100_000, 5_000_000, len(dates)).astype(float),
+            "Dividends": dividends,
+            "Stock Splits": 0.0,
+        }, index=dates)
+        hist.index.name = "Date"
+
+        info = {
+            "symbol": ticker,
+            "longName": ticker,
+            "currentPrice": float(close[-1]),
+            "previousClose": float(close[-2]),
+            "sector": sectors[i % len(sectors)],
+            "industry": sectors[i % len(sectors)],
+            "country": countries[i % len(countries)],
+            "trailingPE": float(rng.uniform(8, 40)),
+            "trailingEps": float(close[-1] / rng.uniform(8, 40)),
+            "marketCap": float(rng.uniform(5e9, 2e12)),
+            "dividendYield": float(rng.uniform(0, 5)),
+        }
+        replay.save(ticker, info=info, history=hist)
+    return replay
+
+
+# ==========================
+# 🔹 4. Fournisseur actif
+# ==========================
+_provider = None
+
+
+def get_provider():
+    """Fournisseur de données utilisé par toute l'application."""
+    global _provider
+    if _provider is None:
+        if os.environ.get("KOMOREBI_PROVIDER", "yfinance") == "replay":
+            _provider = ReplayProvider(
+                os.environ.get("KOMOREBI_REPLAY_DIR", DEFAULT_REPLAY_DIR),
+                latency=float(os.environ.get("KOMOREBI_REPLAY_LATENCY", 0)),
+            )
+        else:
+            _provider = YFinanceProvider()
+    return _provider
+
+
+def set_provider(provider):
+    """Remplace le fournisseur actif (benchmarks, tests de charge)."""
+    global _provider
+    _provider = provider
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Préparation des données rejouées hors ligne")
+    parser.add_argument("command", choices=["record", "synthetic"])
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--root", default=DEFAULT_REPLAY_DIR)
+    parser.add_argument("--start", default="2015-01-01")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.tickers, args.root, start=args.start)
+    else:
+        generate_synthetic(args.tickers, args.root, start=args.start, seed=args.seed)
+    print(f"{len(args.tickers)} tickers enregistrés dans {args.root}")
@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import threading
+
+# Fichier de persistance des métadonnées société
+METADATA_CACHE_PATH = "data/cache/company_metadata.json"
+
+# Secteur, pays et industrie ne changent quasiment jamais
+METADATA_TTL_DAYS = 7
+METADATA_FIELDS = ("sector", "country", "industry")
+
+
+class MetadataCache:
+    """
+    Cache longue durée des métadonnées société (secteur, pays, industrie),
+    persisté sur disque et partagé par toutes les pages.
+
+    Les entrées plus anciennes que le TTL restent servies immédiatement et
+    sont rafraîchies par un thread de fond ; seul un ticker jamais vu
+    attend le fournisseur.
+
+    Arguments:
+        fetch (callable): fonction ticker -> fiche .info
+        path (str): fichier JSON de persistance
+        ttl_days (float): durée de validité d'une entrée, en jours
+    """
+
+    def __init__(self, fetch, path=METADATA_CACHE_PATH, ttl_days=METADATA_TTL_DAYS):
+        self._fetch = fetch
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self._entries = self._load()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+
+    # ----- Persistance -----
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Fusion avec les entrées écrites entre-temps par d'autres processus
+        entries = self._load()
+        for ticker, entry in self._entries.items():
+            if entry["fetched_at"] >= entries.get(ticker, {}).get("fetched_at", 0):
+                entries[ticker] = entry
+        self._entries = entries
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    # ----- Récupération -----
+    def _fetch_entries(self, tickers):
+        fetched = {}
+        for ticker in tickers:
+            try:
+                info = self._fetch(ticker)
+            except Exception:
+                continue
+            entry = {field: info.get(field) or "Non disponible" for field in METADATA_FIELDS}
+            entry["fetched_at"] = time.time()
+            fetched[ticker] = entry
+        return fetched
+
+    def _store(self, fetched):
+        if not fetched:
+            return
+        with self._lock:
+            self._entries.update(fetched)
+            self._save()
+
+    def _refresh_in_background(self, tickers):
+        with self._lock:
+            tickers = [t for t in tickers if t not in self._refreshing]
+            self._refreshing.update(tickers)
+        if not tickers:
+            return
+
+        def run():
+            try:
+                self._store(self._fetch_entries(tickers))
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(tickers)
+
+        threading.Thread(target=run, name="metadata-refresher", daemon=True).start()
+
+    def get(self, tickers):
+        """
+        Métadonnées des tickers demandés.
+
+        Returns:
+            dict: {ticker: {'sector', 'country', 'industry', 'fetched_at'}}
+                  (tickers indisponibles absents)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        with self._lock:
+            missing = [t for t in tickers if t not in self._entries]
+        if missing:
+            self._store(self._fetch_entries(missing))
+
+        now = time.time()
+        with self._lock:
+            result = {t: dict(self._entries[t]) for t in tickers if t in self._entries}
+        stale = [t for t, entry in result.items() if now - entry["fetched_at"] > self.ttl]
+        if stale:
+            self._refresh_in_background(stale)
+        return result
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from risk_metrics import TRADING_DAYS
+
+MONTE_CARLO_METHODS = {
+    "bootstrap": "Bootstrap historique",
+    "normal": "Loi normale multivariée",
+}
+
+# Trajectoires simulées ensemble : borne la mémoire quel que soit le total
+DEFAULT_CHUNK_SIZE = 10_000
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Histogrammes quotidiens de log(V / V0) utilisés pour les percentiles :
+# un pas de 0,001 donne des quantiles à 0,1 % près sans garder les trajectoires
+LOG_RANGE = (-4.0, 4.0)
+LOG_BINS = 8000
+
+
+def _chunk_sizes(n_paths, chunk_size):
+    full, rest = divmod(n_paths, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+def _simulate_chunk(returns, weights, horizon, method, n_paths, seed_seq):
+    """
+    Simule `n_paths` trajectoires d'un portefeuille conservé (valeur initiale 1).
+
+    Returns:
+        tuple: (histogrammes horizon × LOG_BINS, valeurs finales)
+    """
+    rng = np.random.default_rng(seed_seq)
+    n_assets = returns.shape[1]
+    positions = np.broadcast_to(weights, (n_paths, n_assets)).copy()
+
+    if method == "normal":
+        log_returns = np.log1p(returns)
+        mean = log_returns.mean(axis=0)
+        cov = np.cov(log_returns, rowvar=False).reshape(n_assets, n_assets)
+        # Décomposition robuste aux matrices semi-définies
+        eigval, eigvec = np.linalg.eigh(cov)
+        factor = eigvec * np.sqrt(np.clip(eigval, 0, None))
+
+    counts = np.zeros((horizon, LOG_BINS), dtype=np.int64)
+    lo, hi = LOG_RANGE
+    scale = LOG_BINS / (hi - lo)
+    for day in range(horizon):
+        if method == "bootstrap":
+            step = returns[rng.integers(0, len(returns), n_paths)]
+        else:
+            step = np.expm1(mean + rng.standard_normal((n_paths, n_assets)) @ factor.T)
+        positions *= 1 + step
+        log_value = np.log(positions.sum(axis=1))
+        bins = np.clip(((log_value - lo) * scale).astype(np.int64), 0, LOG_BINS - 1)
+        counts[day] = np.bincount(bins, minlength=LOG_BINS)
+    return counts, positions.sum(axis=1)
+
+
+def _run_chunk(args):
+    return _simulate_chunk(*args)
+
+
+def _percentiles_from_counts(counts, percentiles):
+    """Percentiles de chaque ligne d'histogramme, interpolés dans la classe."""
+    lo, hi = LOG_RANGE
+    width = (hi - lo) / LOG_BINS
+    cumulated = np.cumsum(counts, axis=1)
+    total = cumulated[:, -1:]
+    out = np.empty((counts.shape[0], len(percentiles)))
+    for k, q in enumerate(percentiles):
+        target = total[:, 0] * q / 100
+        idx = np.argmax(cumulated >= target[:, None], axis=1)
+        below = np.where(idx > 0, cumulated[np.arange(len(idx)), idx - 1], 0)
+        inside = counts[np.arange(len(idx)), idx]
+        frac = np.where(inside > 0, (target - below) / np.maximum(inside, 1), 0.5)
+        out[:, k] = lo + (idx + frac) * width
+    return np.exp(out)
+
+
+def simulate_portfolio(returns, weights=None, horizon=TRADING_DAYS, n_paths=100_000, method="bootstrap",
+                       initial_value=1_000_000, seed=0, chunk_size=DEFAULT_CHUNK_SIZE,
+                       percentiles=PERCENTILES, workers=None, start_date=None):
+    """
+    Projection Monte Carlo d'un portefeuille conservé sans rééquilibrage.
+
+    Les rendements quotidiens sont tirés soit dans l'historique (bootstrap
+    de séances entières, qui conserve les corrélations), soit dans une loi
+    normale multivariée des log-rendements estimée sur le même historique.
+    Les trajectoires sont simulées par paquets de `chunk_size` et résumées
+    au fil de l'eau par des histogrammes quotidiens : la mémoire ne dépend
+    pas du nombre total de trajectoires.
+
+    Chaque paquet reçoit sa propre graine dérivée de `seed`
+    (SeedSequence.spawn) : le résultat est identique avec ou sans pool de
+    processus.
+
+    Arguments:
+        returns (DataFrame): rendements quotidiens simples dates × tickers, sans NaN
+        weights (array): pondérations initiales (équipondéré par défaut)
+        horizon (int): nombre de séances projetées
+        n_paths (int): nombre de trajectoires
+        method (str): "bootstrap" ou "normal"
+        initial_value (float): valeur initiale du portefeuille
+        seed (int): graine de reproductibilité
+        chunk_size (int): trajectoires par paquet
+        percentiles (tuple): percentiles des bandes
+        workers (int): nombre de processus (None : calcul dans le processus courant)
+        start_date: date de départ de la projection (défaut : dernière date de `returns`)
+
+    Returns:
+        tuple: (DataFrame séances futures × percentiles en valeur,
+                dict résumé de la distribution finale)
+    """
+    if method not in MONTE_CARLO_METHODS:
+        raise ValueError(f"Méthode inconnue : {method}")
+    values = returns.to_numpy(dtype=float)
+    if len(values) < 2 or not np.isfinite(values).all():
+        raise ValueError("Historique de rendements insuffisant ou incomplet")
+    n_assets = values.shape[1]
+    w = np.full(n_assets, 1 / n_assets) if weights is None else np.asarray(weights, dtype=float) / np.sum(weights)
+
+    seeds = np.random.SeedSequence(seed).spawn(len(_chunk_sizes(n_paths, chunk_size)))
+    tasks = [(values, w, horizon, method, size, s) for size, s in zip(_chunk_sizes(n_paths, chunk_size), seeds)]
+    if workers and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_chunk, tasks))
+    else:
+        results = [_run_chunk(task) for task in tasks]
+
+    counts = sum(r[0] for r in results)
+    finals = np.concatenate([r[1] for r in results]) * initial_value
+
+    start = pd.Timestamp(start_date) if start_date is not None else returns.index[-1]
+    dates = pd.bdate_range(start + pd.offsets.BDay(1), periods=horizon)
+    bands = pd.DataFrame(
+        _percentiles_from_counts(counts, percentiles) * initial_value,
+        index=dates,
+        columns=[f"P{q}" for q in percentiles],
+    )
+    summary = {
+        "Valeur moyenne": float(finals.mean()),
+        "Valeur médiane": float(np.median(finals)),
+        "Probabilité de perte (%)": float((finals < initial_value).mean() * 100),
+        "VaR 95 % (€)": float(initial_value - np.percentile(finals, 5)),
+    }
+    return bands, summary
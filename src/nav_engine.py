@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+# Rééquilibrages calendaires : fréquence de période pandas
+REBALANCING_FREQUENCIES = {
+    "monthly": "M",
+    "quarterly": "Q",
+}
+REBALANCING_MODES = ("buy_and_hold", "monthly", "quarterly", "threshold")
+REBALANCING_LABELS = {
+    "buy_and_hold": "Achat-conservation",
+    "monthly": "Rééquilibrage mensuel",
+    "quarterly": "Rééquilibrage trimestriel",
+    "threshold": "Rééquilibrage au-delà de 5 points d'écart",
+}
+
+# Écart de pondération déclenchant un rééquilibrage (mode "threshold")
+DEFAULT_THRESHOLD = 0.05
+
+# Fenêtre initiale de recherche du prochain dépassement de seuil (jours)
+_THRESHOLD_SEARCH = 64
+
+
+class NavResult:
+    """
+    Résultat d'une simulation de valeur liquidative.
+
+    Attributs:
+        nav (Series): valeur liquidative quotidienne (titres + liquidités)
+        weights (DataFrame): pondérations effectives quotidiennes (hors liquidités)
+        cash (Series): liquidités quotidiennes
+        shares (DataFrame): nombre de titres détenus chaque jour
+        turnover (Series): rotation de chaque date de rééquilibrage,
+            somme des |achats| + |ventes| divisée par 2 × VL (0 ailleurs,
+            achat initial exclu)
+        rebalance_dates (DatetimeIndex): dates de rééquilibrage
+    """
+
+    def __init__(self, nav, weights, cash, shares, turnover):
+        self.nav = nav
+        self.weights = weights
+        self.cash = cash
+        self.shares = shares
+        self.turnover = turnover
+        self.rebalance_dates = turnover.index[turnover.to_numpy() > 0]
+
+    @property
+    def total_turnover(self):
+        return float(self.turnover.sum())
+
+
+def target_weights(weights, n):
+    """Vecteur de pondérations cibles (équipondéré par défaut), somme <= 1."""
+    if weights is None:
+        return np.full(n, 1.0 / n)
+    w = np.asarray(weights, dtype=float)
+    if w.shape != (n,) or (w < 0).any():
+        raise ValueError(f"Pondérations invalides : {n} valeurs positives attendues")
+    total = w.sum()
+    # Pondérations exprimées en pourcentage ou ne sommant pas à 1 : normalisation
+    return w / total if total > 1 + 1e-9 else w
+
+
+def calendar_rebalance_rows(dates, frequency):
+    """
+    Positions des dernières séances de chaque mois / trimestre (hors dernière
+    ligne) : le rééquilibrage se fait à la clôture de ces séances.
+    """
+    periods = dates.to_period(REBALANCING_FREQUENCIES[frequency]).asi8
+    return np.flatnonzero(periods[1:] != periods[:-1])
+
+
+def _buy(target_value, prices_row, whole_shares):
+    shares = target_value / prices_row
+    return np.floor(shares) if whole_shares else shares
+
+
+def simulate_nav(prices, weights=None, initial_value=1_000_000, rebalance="buy_and_hold",
+                 threshold=DEFAULT_THRESHOLD, whole_shares=False, dividends=None):
+    """
+    Valeur liquidative d'un portefeuille à pondérations cibles.
+
+    Les positions restent constantes entre deux rééquilibrages : chaque
+    segment est valorisé d'un seul produit matriciel (titres × prix), la
+    boucle ne porte que sur les dates de rééquilibrage.
+
+    Les dividendes détachés sont encaissés en liquidités le jour du
+    détachement (titres détenus la veille au soir) et réinvestis au
+    rééquilibrage suivant.
+
+    Arguments:
+        prices (DataFrame): matrice de prix dates × tickers sans NaN
+            (voir cumulative_returns.CumulativeReturns.window_prices)
+        weights (array): pondérations cibles, dans l'ordre des colonnes ;
+            un total inférieur à 1 laisse le reste en liquidités
+        initial_value (float): montant investi à la première date
+        rebalance (str): "buy_and_hold", "monthly", "quarterly" ou "threshold"
+        threshold (float): écart absolu de pondération déclenchant un
+            rééquilibrage en mode "threshold" (0.05 = 5 points)
+        whole_shares (bool): nombre entier de titres, le reliquat restant en liquidités
+        dividends (DataFrame): dividendes par titre, mêmes dates et colonnes
+            (défaut : aucun ; un dividende à la première date n'est pas perçu)
+
+    Returns:
+        NavResult
+    """
+    if rebalance not in REBALANCING_MODES:
+        raise ValueError(f"Mode de rééquilibrage inconnu : {rebalance}")
+    values = prices.to_numpy(dtype=float)
+    n_days, n_assets = values.shape
+    if n_days == 0 or n_assets == 0:
+        raise ValueError("Matrice de prix vide")
+    if not np.isfinite(values).all() or (values <= 0).any():
+        raise ValueError("La matrice de prix doit être complète et strictement positive")
+
+    # Dividendes cumulés par titre : encaissements d'un segment par différence
+    if dividends is None:
+        paid = np.zeros_like(values)
+    else:
+        paid = dividends.reindex(index=prices.index, columns=prices.columns).fillna(0.0).to_numpy(dtype=float, copy=True)
+        paid[0] = 0.0
+    income = np.cumsum(paid, axis=0)
+
+    w = target_weights(weights, n_assets)
+    shares = np.empty_like(values)
+    cash = np.empty(n_days)
+    turnover = np.zeros(n_days)
+
+    if rebalance in REBALANCING_FREQUENCIES:
+        scheduled = calendar_rebalance_rows(prices.index, rebalance)
+    else:
+        scheduled = np.array([], dtype=int)
+
+    held = _buy(initial_value * w, values[0], whole_shares)
+    held_cash = initial_value - held @ values[0]
+    start = 0
+    while True:
+        # Fin du segment courant : prochain rééquilibrage (exclu) ou fin de série
+        if rebalance == "threshold":
+            end = _next_breach(values, income, held, held_cash, w, start, threshold)
+        else:
+            k = np.searchsorted(scheduled, start, side="right")
+            end = int(scheduled[k]) if k < len(scheduled) else n_days - 1
+
+        shares[start:end + 1] = held
+        cash[start:end + 1] = held_cash + (income[start:end + 1] - income[start]) @ held
+        if end == n_days - 1:
+            break
+
+        # Rééquilibrage à la clôture de `end`
+        nav_end = held @ values[end] + cash[end]
+        new_held = _buy(nav_end * w, values[end], whole_shares)
+        turnover[end] = np.abs(new_held - held) @ values[end] / (2 * nav_end)
+        held, held_cash = new_held, nav_end - new_held @ values[end]
+        start = end
+
+    positions = shares * values
+    nav = positions.sum(axis=1) + cash
+    index = prices.index
+    return NavResult(
+        nav=pd.Series(nav, index=index, name="NAV"),
+        weights=pd.DataFrame(positions / nav[:, None], index=index, columns=prices.columns),
+        cash=pd.Series(cash, index=index, name="Liquidités"),
+        shares=pd.DataFrame(shares, index=index, columns=prices.columns),
+        turnover=pd.Series(turnover, index=index, name="Rotation"),
+    )
+
+
+def _next_breach(values, income, held, held_cash, w, start, threshold):
+    """
+    Première position après `start` où une pondération s'écarte de sa cible
+    de plus de `threshold`, ou la dernière ligne. La recherche se fait par
+    fenêtres de taille croissante pour ne pas revaloriser toute la série
+    à chaque rééquilibrage.
+    """
+    n_days = len(values)
+    lo, size = start + 1, _THRESHOLD_SEARCH
+    while lo < n_days:
+        hi = min(lo + size, n_days)
+        positions = values[lo:hi] * held
+        segment_cash = held_cash + (income[lo:hi] - income[start]) @ held
+        drift = np.abs(positions / (positions.sum(axis=1) + segment_cash)[:, None] - w).max(axis=1)
+        breach = np.flatnonzero(drift > threshold)
+        if breach.size:
+            return lo + int(breach[0])
+        lo, size = hi, size * 2
+    return n_days - 1
@@ -0,0 +1,344 @@
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve, solve
+from scipy.optimize import minimize
+
+from risk_metrics import TRADING_DAYS
+
+OPTIMIZATION_METHODS = {
+    "equal": "Équipondéré",
+    "min_variance": "Variance minimale",
+    "max_sharpe": "Sharpe maximal",
+    "risk_parity": "Parité de risque",
+}
+
+# Bornes de pondération par défaut (vente à découvert exclue)
+DEFAULT_BOUNDS = (0.0, 1.0)
+
+_SOLVER_OPTIONS = {"maxiter": 500, "ftol": 1e-12}
+
+# Programmes quadratiques sous bornes (ADMM) : tolérance et itérations maximales
+_QP_TOLERANCE = 1e-10
+_QP_MAX_ITER = 20_000
+_QP_RELAXATION = 1.6
+_QP_CHECK_EVERY = 25
+_QP_POLISH_TOLERANCE = 1e-6
+
+
+def _kkt(cov, rows, rho):
+    n, m = len(cov), len(rows)
+    matrix = np.block([[cov + rho * np.eye(n), rows.T], [rows, np.zeros((m, m))]])
+    return lu_factor(matrix, check_finite=False)
+
+
+def _polish(cov, rows, b, lo, hi, z, y):
+    """
+    Solution exacte à partir de l'ensemble actif deviné (z, y) : les titres
+    aux bornes y sont fixés, le système KKT des autres est résolu
+    directement. Renvoie None si la solution viole une borne ou si un
+    multiplicateur a le mauvais signe.
+    """
+    at_lo = z - lo < -y
+    at_hi = (hi - z < y) & ~at_lo
+    fixed = at_lo | at_hi
+    free = np.flatnonzero(~fixed)
+    if not len(free):
+        return None
+    m = len(rows)
+    w = np.where(at_lo, lo, np.where(at_hi, hi, 0.0))
+    matrix = np.block([[cov[np.ix_(free, free)], rows[:, free].T], [rows[:, free], np.zeros((m, m))]])
+    rhs = np.concatenate([-cov[free][:, fixed] @ w[fixed], b - rows[:, fixed] @ w[fixed]])
+    try:
+        solution = solve(matrix, rhs, assume_a="sym")
+    except np.linalg.LinAlgError:
+        return None
+    w[free] = solution[:len(free)]
+    gradient = cov @ w + rows.T @ solution[len(free):]
+    slack = _QP_POLISH_TOLERANCE * max(np.abs(cov @ w).max(), 1e-12)
+    if (w[free] < lo - _QP_TOLERANCE).any() or (w[free] > hi + _QP_TOLERANCE).any():
+        return None
+    if (gradient[at_lo] < -slack).any() or (gradient[at_hi] > slack).any():
+        return None
+    return w
+
+
+def _box_qp(cov, rows, b, lo, hi, state, tol=_QP_TOLERANCE, max_iter=_QP_MAX_ITER):
+    """
+    min ½ wᵀΣw sous rows·w = b et lo ≤ w ≤ hi, par ADMM (séparation entre
+    les égalités et les bornes, comme OSQP).
+
+    La factorisation LU de [[Σ + ρI, rowsᵀ], [rows, 0]] ne dépend ni de b
+    ni du point de départ : chaque itération se réduit à une substitution
+    en O(n²) et les points d'une frontière réutilisent la même
+    factorisation. Toutes les _QP_CHECK_EVERY itérations, l'ensemble actif
+    deviné est résolu exactement (_polish) et ρ est réajusté si les résidus
+    primal et dual sont trop déséquilibrés.
+
+    Arguments:
+        state (dict): 'z', 'u', 'rho', 'kkt' ; démarrage à chaud, mis à jour
+
+    Returns:
+        array: pondérations, ou None sans convergence
+    """
+    n = len(cov)
+    z, u, rho, kkt = state["z"], state["u"], state["rho"], state["kkt"]
+    if kkt is None:
+        kkt = _kkt(cov, rows, rho)
+    weights = None
+    for it in range(1, max_iter + 1):
+        x = lu_solve(kkt, np.concatenate([rho * (z - u), b]))[:n]
+        relaxed = _QP_RELAXATION * x + (1 - _QP_RELAXATION) * z
+        z_prev = z
+        z = np.clip(relaxed + u, lo, hi)
+        u = u + relaxed - z
+        primal, dual = np.abs(x - z).max(), np.abs(z - z_prev).max()
+        if primal < tol and dual < tol:
+            weights = z
+            break
+        if it % _QP_CHECK_EVERY:
+            continue
+        weights = _polish(cov, rows, b, lo, hi, z, rho * u)
+        if weights is not None:
+            break
+        # Résidus relatifs (u est la variable duale divisée par ρ)
+        primal /= max(np.abs(x).max(), np.abs(z).max(), 1e-12)
+        dual *= rho / max(np.abs(cov @ x).max(), rho * np.abs(u).max(), 1e-12)
+        ratio = np.sqrt(primal / max(dual, 1e-30))
+        if ratio > 5 or ratio < 0.2:
+            rho *= ratio
+            u = u / ratio
+            kkt = _kkt(cov, rows, rho)
+    state.update(z=z if weights is None else weights, u=u, rho=rho, kkt=kkt)
+    return weights
+
+
+class PortfolioOptimizer:
+    """
+    Optimisation des pondérations d'un portefeuille à partir des rendements
+    moyens et de la covariance : ADMM pour les problèmes de variance minimale
+    (frontière comprise), SLSQP ou L-BFGS-B à gradients analytiques sinon.
+
+    Chaque problème repart de la dernière solution trouvée (démarrage à
+    chaud) : les points successifs d'une frontière efficiente ou une
+    nouvelle résolution après une légère mise à jour des estimations ne
+    demandent que quelques itérations.
+
+    Arguments:
+        mean (Series | array): rendements quotidiens moyens (l'index d'une
+            Series donne les tickers)
+        cov (array): covariance quotidienne (p × p)
+        bounds (tuple): bornes (min, max) communes à toutes les pondérations
+        risk_free (float): taux sans risque annuel (Sharpe)
+        periods (int): nombre de périodes par an (annualisation)
+    """
+
+    def __init__(self, mean, cov, bounds=DEFAULT_BOUNDS, risk_free=0.0, periods=TRADING_DAYS):
+        self.mu = np.asarray(mean, dtype=float) * periods
+        self.cov = np.asarray(cov, dtype=float) * periods
+        self.n = len(self.mu)
+        self.tickers = list(mean.index) if hasattr(mean, "index") else list(range(self.n))
+        lo, hi = bounds
+        if lo * self.n > 1 or hi * self.n < 1:
+            raise ValueError("Bornes incompatibles avec des pondérations de somme 1")
+        self.bounds = [(lo, hi)] * self.n
+        self.risk_free = risk_free
+        self._last = {}
+        self._qp = {}
+        self._budget = {"type": "eq", "fun": lambda w: w.sum() - 1, "jac": lambda w: np.ones_like(w)}
+
+    def update(self, mean, cov, periods=TRADING_DAYS):
+        """Remplace les estimations en conservant les solutions pour le démarrage à chaud."""
+        self.mu = np.asarray(mean, dtype=float) * periods
+        self.cov = np.asarray(cov, dtype=float) * periods
+        # Les factorisations dépendent de Σ et de μ ; les itérés ADMM restent
+        # de bons points de départ
+        for state in self._qp.values():
+            state["kkt"] = None
+        return self
+
+    def _start(self, problem, x0=None):
+        if x0 is not None:
+            return np.asarray(x0, dtype=float)
+        return self._last.get(problem, np.full(self.n, 1.0 / self.n))
+
+    def _solve(self, problem, fun, x0=None, constraints=()):
+        result = minimize(
+            fun, self._start(problem, x0), jac=True, method="SLSQP",
+            bounds=self.bounds, constraints=[self._budget, *constraints], options=_SOLVER_OPTIONS,
+        )
+        return self._keep(problem, np.clip(result.x, *self.bounds[0]))
+
+    def _solve_qp(self, problem, rows, b, start=None, bounds=None):
+        """
+        min yᵀΣy sous rows·y = b et bornes (ADMM). Sans `start`, l'itéré
+        reprend l'état laissé par la résolution précédente du même problème.
+        """
+        lo, hi = bounds or self.bounds[0]
+        state = self._qp.setdefault(problem, {"rho": float(np.trace(self.cov)) / self.n, "kkt": None})
+        if start is not None or "z" not in state:
+            start = self._start(problem) if start is None else start
+            state.update(z=np.clip(start, lo, hi), u=np.zeros(self.n))
+        return _box_qp(self.cov, rows, np.asarray(b, dtype=float), lo, hi, state)
+
+    def _keep(self, problem, weights):
+        weights = weights / weights.sum()
+        self._last[problem] = weights
+        return weights
+
+    # ----- Indicateurs -----
+    def performance(self, weights):
+        """(rendement annualisé, volatilité annualisée, Sharpe) des pondérations."""
+        ret = float(weights @ self.mu)
+        vol = float(np.sqrt(weights @ self.cov @ weights))
+        return ret, vol, (ret - self.risk_free) / vol if vol > 0 else np.nan
+
+    def risk_contributions(self, weights):
+        """Part de chaque titre dans la variance du portefeuille (somme 1)."""
+        marginal = self.cov @ weights
+        return weights * marginal / (weights @ marginal)
+
+    # ----- Problèmes -----
+    def equal_weights(self):
+        return np.full(self.n, 1.0 / self.n)
+
+    def min_variance(self, x0=None):
+        weights = self._solve_qp("min_variance", np.ones((1, self.n)), [1.0], x0)
+        if weights is not None:
+            return self._keep("min_variance", weights)
+
+        def fun(w):
+            cw = self.cov @ w
+            return w @ cw, 2 * cw
+        return self._solve("min_variance", fun, x0)
+
+    def max_sharpe(self, x0=None):
+        """
+        Sharpe maximal, résolu sous sa forme convexe : avec y = κ·w (κ > 0),
+        min yᵀΣy sous (μ - r)ᵀy = 1 et κ·min ≤ y ≤ κ·max, puis w = y / Σy.
+        """
+        excess = self.mu - self.risk_free
+        if (excess <= 0).all():
+            # Aucun titre ne rémunère le risque : le portefeuille le moins risqué
+            return self.min_variance(x0)
+        lo, hi = self.bounds[0]
+        start = self._start("max_sharpe", x0)
+        scale = start @ excess
+        y0 = start / scale if scale > 0 else np.where(excess > 0, 1.0, 0.0) / excess.clip(min=0).sum()
+        if lo == 0 and hi >= 1:
+            # Contraintes sur y réduites à y ≥ 0 : programme quadratique sous bornes
+            y = self._solve_qp("max_sharpe", excess[None, :], [1.0], y0, bounds=(0.0, np.inf))
+            if y is not None:
+                return self._keep("max_sharpe", y)
+
+        ones = np.ones(self.n)
+        constraints = [{"type": "eq", "fun": lambda y: y @ excess - 1, "jac": lambda y: excess}]
+        if hi < 1:
+            constraints.append({
+                "type": "ineq",
+                "fun": lambda y: hi * y.sum() - y,
+                "jac": lambda y: hi * np.outer(ones, ones) - np.eye(self.n),
+            })
+        if lo > 0:
+            constraints.append({
+                "type": "ineq",
+                "fun": lambda y: y - lo * y.sum(),
+                "jac": lambda y: np.eye(self.n) - lo * np.outer(ones, ones),
+            })
+
+        def fun(y):
+            cy = self.cov @ y
+            return y @ cy, 2 * cy
+
+        result = minimize(
+            fun, y0, jac=True, method="SLSQP", bounds=[(0, None)] * self.n,
+            constraints=constraints, options=_SOLVER_OPTIONS,
+        )
+        # Bornes portées par les contraintes sur y : seule la normalisation reste (_keep)
+        return self._keep("max_sharpe", np.clip(result.x, 0, None))
+
+    def risk_parity(self, x0=None):
+        """
+        Contributions au risque égales. Forme convexe (Spinu) :
+        min ½ yᵀΣy - (1/n)·Σ log y, puis w = y / Σy ; si les bornes ne sont
+        pas respectées, moindres carrés sur les contributions sous bornes.
+        """
+        target = 1.0 / self.n
+        lo, hi = self.bounds[0]
+        start = self._start("risk_parity", x0)
+        y0 = np.clip(start, 1e-6, None) / np.sqrt(start @ self.cov @ start)
+
+        def barrier(y):
+            cy = self.cov @ y
+            return 0.5 * y @ cy - target * np.log(y).sum(), cy - target / y
+
+        result = minimize(barrier, y0, jac=True, method="L-BFGS-B", bounds=[(1e-12, None)] * self.n,
+                          options={"maxiter": 1000, "ftol": 1e-15, "gtol": 1e-10})
+        weights = result.x / result.x.sum()
+        if weights.min() >= lo - 1e-9 and weights.max() <= hi + 1e-9:
+            self._last["risk_parity"] = weights
+            return weights
+
+        def fun(w):
+            cw = self.cov @ w
+            var = w @ cw
+            rc = w * cw / var
+            diff = rc - target
+            # d rc_i / d w = (δ_ij cw_i + w_i Σ_ij) / var - 2 rc_i cw_j / var
+            grad_rc = (np.diag(cw) + w[:, None] * self.cov) / var - 2 * np.outer(rc, cw) / var
+            return diff @ diff * self.n, 2 * self.n * grad_rc.T @ diff
+        return self._solve("risk_parity", fun, np.clip(weights, lo, hi))
+
+    def min_variance_for_return(self, target, x0=None):
+        """
+        Variance minimale sous contrainte de rendement annualisé `target`.
+        Sans `x0`, l'ADMM repart de l'état laissé par le point précédent.
+        """
+        if np.ptp(self.mu) > 0:
+            rows = np.vstack([np.ones(self.n), self.mu])
+            weights = self._solve_qp("frontier", rows, [1.0, target], x0)
+            if weights is not None:
+                return self._keep("frontier", weights)
+        constraint = {"type": "eq", "fun": lambda w: w @ self.mu - target, "jac": lambda w: self.mu}
+
+        def fun(w):
+            cw = self.cov @ w
+            return w @ cw, 2 * cw
+        return self._solve("frontier", fun, x0, [constraint])
+
+    def efficient_frontier(self, n_points=25):
+        """
+        Frontière efficiente entre la variance minimale et le rendement
+        maximal atteignable, chaque point démarrant de la solution précédente.
+
+        Returns:
+            list: [(rendement, volatilité, pondérations)] par rendement croissant
+        """
+        w_min = self.min_variance()
+        lo, hi = self.bounds[0]
+        # Rendement maximal sous bornes : remplir les meilleurs titres jusqu'à la borne haute
+        order = np.argsort(self.mu)[::-1]
+        w_max = np.full(self.n, float(lo))
+        remaining = 1 - w_max.sum()
+        for i in order:
+            add = min(hi - lo, remaining)
+            w_max[i] += add
+            remaining -= add
+        targets = np.linspace(w_min @ self.mu, w_max @ self.mu, n_points)
+
+        frontier = []
+        for k, target in enumerate(targets):
+            if k == n_points - 1:
+                # Rendement maximal : seul w_max l'atteint (sommet de l'ensemble admissible)
+                weights = w_max
+            else:
+                weights = self.min_variance_for_return(target, x0=w_min if k == 0 else None)
+            ret, vol, _ = self.performance(weights)
+            frontier.append((ret, vol, weights))
+        return frontier
+
+    def optimize(self, method):
+        """Pondérations selon OPTIMIZATION_METHODS."""
+        if method == "equal":
+            return self.equal_weights()
+        if method not in OPTIMIZATION_METHODS:
+            raise ValueError(f"Méthode d'optimisation inconnue : {method}")
+        return getattr(self, method)()
@@ -0,0 +1,47 @@
+import pandas as pd
+
+
+def build_price_matrix(hist_data, start_date=None, end_date=None, field="Close"):
+    """
+    Aligne les historiques {ticker: DataFrame} en une seule matrice
+    dates (jours ouvrés) × tickers de flottants.
+
+    Chaque ticker est prolongé par sa dernière valeur connue (jours fériés
+    locaux, décalages de places). Avant la première cotation d'un ticker,
+    la colonne vaut NaN.
+
+    Arguments:
+        hist_data (dict): {ticker: DataFrame} contenant la colonne `field`
+        start_date: Première date de la matrice (défaut : première cotation)
+        end_date: Dernière date incluse (défaut : dernière cotation)
+        field (str): Colonne extraite de chaque historique
+
+    Returns:
+        DataFrame: matrice de prix, colonnes dans l'ordre de hist_data
+    """
+    series = {
+        ticker: hist[field]
+        for ticker, hist in hist_data.items()
+        if not hist.empty and field in hist.columns
+    }
+    if not series:
+        return pd.DataFrame()
+
+    raw = pd.concat(series, axis=1).sort_index().astype(float)
+    raw = raw[~raw.index.duplicated(keep="last")]
+    start = pd.Timestamp(start_date) if start_date is not None else raw.index[0]
+    end = pd.Timestamp(end_date) if end_date is not None else raw.index[-1]
+    dates = pd.date_range(start=start.normalize(), end=end, freq="B")
+    if dates.empty:
+        return pd.DataFrame(columns=raw.columns, dtype=float)
+
+    # Les valeurs antérieures à `start` servent à initialiser le report
+    matrix = raw.reindex(raw.index.union(dates)).ffill().reindex(dates)
+    matrix.index.name = "Date"
+    return matrix
+
+
+def rebase(prices, base=100.0):
+    """Normalise chaque colonne sur sa première valeur (base 100 par défaut)."""
+    values = prices.to_numpy(dtype=float)
+    return pd.DataFrame(values / values[0] * base, index=prices.index, columns=prices.columns)
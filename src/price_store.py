@@ -0,0 +1,129 @@
+import os
+import json
+import pandas as pd
+from urllib.parse import quote
+
+# Dossier du stockage local des historiques (un fichier Parquet par ticker)
+PRICE_STORE_DIR = "data/prices"
+
+# Version du format stocké : un changement (v2 : cours non ajustés des
+# dividendes) ouvre un nouveau sous-dossier, rempli au fil des requêtes
+PRICE_STORE_VERSION = 2
+
+# Colonnes de prix remises à l'échelle lors d'une division d'actions
+_PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Dividends"]
+
+
+class PriceStore:
+    """
+    Stockage local des historiques OHLCV au format Parquet.
+
+    Chaque ticker est une partition (un fichier). Le fichier coverage.json
+    mémorise, pour chaque ticker, la date de début déjà demandée au fournisseur
+    afin de ne pas retélécharger l'historique d'une valeur introduite en bourse
+    après cette date.
+    """
+
+    def __init__(self, root=None):
+        # Dossier lu à l'appel : un script peut rediriger PRICE_STORE_DIR
+        self.root = os.path.join(root or PRICE_STORE_DIR, f"v{PRICE_STORE_VERSION}")
+        self._coverage_path = os.path.join(self.root, "coverage.json")
+
+    # ----- Chemins et métadonnées -----
+    def _path(self, ticker):
+        return os.path.join(self.root, f"{quote(ticker, safe='')}.parquet")
+
+    def _load_coverage(self):
+        try:
+            with open(self._coverage_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def coverage_start(self, ticker):
+        """Date de début à partir de laquelle l'historique du ticker est complet."""
+        start = self._load_coverage().get(ticker)
+        return pd.Timestamp(start) if start else None
+
+    def set_coverage_start(self, ticker, start_date):
+        coverage = self._load_coverage()
+        coverage[ticker] = pd.Timestamp(start_date).strftime("%Y-%m-%d")
+        self._write_atomic(self._coverage_path, lambda tmp: _dump_json(coverage, tmp))
+
+    # ----- Lecture -----
+    def read(self, ticker, start_date=None, end_date=None):
+        """
+        Lit l'historique stocké d'un ticker sur [start_date, end_date[.
+
+        Returns:
+            DataFrame: historique (vide si le ticker n'est pas stocké)
+        """
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        hist = pd.read_parquet(path)
+        if start_date is not None:
+            hist = hist[hist.index >= pd.Timestamp(start_date)]
+        if end_date is not None:
+            hist = hist[hist.index < pd.Timestamp(end_date)]
+        return hist
+
+    def last_date(self, ticker):
+        """Date de la dernière barre stockée, ou None."""
+        hist = self.read(ticker)
+        return None if hist.empty else hist.index[-1]
+
+    # ----- Écriture -----
+    def append(self, ticker, hist):
+        """
+        Ajoute de nouvelles barres à la partition du ticker.
+        Les barres déjà présentes à la même date sont remplacées
+        (la dernière barre de la veille peut avoir été partielle).
+
+        Une division d'actions (colonne Stock Splits) postérieure à la
+        dernière barre stockée remet à l'échelle tout l'historique stocké,
+        comme le fait le fournisseur pour les cours qu'il renvoie.
+        """
+        if hist is None or hist.empty:
+            return
+        hist = hist.copy()
+        if hist.index.tz is not None:
+            hist.index = hist.index.tz_localize(None)
+
+        stored = self.read(ticker)
+        if not stored.empty:
+            stored = _apply_splits(stored, hist)
+            hist = pd.concat([stored, hist])
+            hist = hist[~hist.index.duplicated(keep="last")]
+        hist = hist.sort_index()
+
+        os.makedirs(self.root, exist_ok=True)
+        self._write_atomic(self._path(ticker), hist.to_parquet)
+
+    def _write_atomic(self, path, write):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        write(tmp)
+        os.replace(tmp, path)
+
+
+def _apply_splits(stored, hist):
+    """Ajuste les barres stockées des divisions d'actions survenues depuis."""
+    if "Stock Splits" not in hist.columns:
+        return stored
+    splits = hist["Stock Splits"]
+    splits = splits[(splits.index > stored.index[-1]) & (splits > 0)]
+    if splits.empty:
+        return stored
+    ratio = float(splits.prod())
+    stored = stored.copy()
+    columns = [c for c in _PRICE_COLUMNS if c in stored.columns]
+    stored[columns] = stored[columns] / ratio
+    if "Volume" in stored.columns:
+        stored["Volume"] = stored["Volume"] * ratio
+    return stored
+
+
+def _dump_json(obj, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, sort_keys=True)
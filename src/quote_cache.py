@@ -0,0 +1,103 @@
+import time
+import threading
+
+# Intervalle de rafraîchissement des cotations, en secondes
+QUOTE_REFRESH_INTERVAL = 60
+
+
+class QuoteCache:
+    """
+    Cache de cotations « stale-while-revalidate ».
+
+    Les lectures renvoient immédiatement la dernière valeur connue ; un seul
+    thread de fond par processus rafraîchit périodiquement tous les tickers
+    suivis. Seul le tout premier accès à un ticker (démarrage à froid)
+    attend le fournisseur. Chaque cotation renvoyée porte son âge en
+    secondes dans la clé 'age'.
+
+    Arguments:
+        fetch (callable): fonction tickers -> {ticker: cotation}, résultats partiels admis
+        interval (float): intervalle de rafraîchissement, en secondes
+    """
+
+    def __init__(self, fetch, interval=QUOTE_REFRESH_INTERVAL):
+        self._fetch = fetch
+        self.interval = interval
+        self._entries = {}          # ticker -> (cotation, horodatage)
+        self._tracked = set()       # tickers rafraîchis par le thread de fond
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Démarre le thread de rafraîchissement (une seule fois)."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="quote-refresher", daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.refresh()
+            except Exception:
+                # Les anciennes valeurs restent servies jusqu'au prochain cycle
+                pass
+
+    def refresh(self, tickers=None):
+        """Interroge le fournisseur et met à jour les entrées reçues."""
+        with self._refresh_lock:
+            with self._lock:
+                tickers = list(tickers if tickers is not None else self._tracked)
+            if tickers:
+                self._fetch_and_store(tickers)
+
+    def _cold_start(self, tickers):
+        # Le verrou évite que deux sessions récupèrent le même ticker en même temps
+        with self._refresh_lock:
+            with self._lock:
+                unseen = [t for t in tickers if t not in self._tracked]
+            if unseen:
+                self._fetch_and_store(unseen)
+                with self._lock:
+                    self._tracked.update(unseen)
+
+    def _fetch_and_store(self, tickers):
+        quotes = self._fetch(tickers)
+        now = time.time()
+        with self._lock:
+            for ticker, quote in quotes.items():
+                self._entries[ticker] = (quote, now)
+
+    def get(self, tickers):
+        """
+        Dernières cotations connues des tickers demandés.
+
+        Les tickers jamais vus sont ajoutés au rafraîchissement de fond et
+        récupérés une première fois de façon synchrone.
+
+        Returns:
+            dict: {ticker: cotation + 'age'} (tickers indisponibles absents)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        with self._lock:
+            unseen = [t for t in tickers if t not in self._tracked]
+        if unseen:
+            self._cold_start(unseen)
+
+        now = time.time()
+        result = {}
+        with self._lock:
+            for ticker in tickers:
+                if ticker in self._entries:
+                    quote, fetched_at = self._entries[ticker]
+                    result[ticker] = {**quote, 'age': now - fetched_at}
+        return result
+
+    def age(self, ticker):
+        """Âge en secondes de la cotation d'un ticker, ou None."""
+        with self._lock:
+            entry = self._entries.get(ticker)
+        return None if entry is None else time.time() - entry[1]
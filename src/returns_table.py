@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+# Horizons du tableau : décalage calendaire depuis la dernière séance de
+# chaque ticker ("1 j" : séance précédente, "YTD" : clôture de fin d'année)
+RETURN_HORIZONS = {
+    "1 j": None,
+    "1 sem.": pd.DateOffset(weeks=1),
+    "1 mois": pd.DateOffset(months=1),
+    "3 mois": pd.DateOffset(months=3),
+    "YTD": "ytd",
+    "1 an": pd.DateOffset(years=1),
+    "3 ans": pd.DateOffset(years=3),
+    "5 ans": pd.DateOffset(years=5),
+}
+
+
+def _reference_dates(last):
+    """Date de référence de chaque horizon calendaire pour une dernière séance `last`."""
+    dates = {}
+    for label, offset in RETURN_HORIZONS.items():
+        if offset is None:
+            continue
+        if isinstance(offset, str):
+            # Dernière clôture de l'année précédente
+            dates[label] = pd.Timestamp(year=last.year, month=1, day=1) - pd.Timedelta(days=1)
+        else:
+            dates[label] = last - offset
+    return dates
+
+
+def build_returns_table(hist_data, field="Close"):
+    """
+    Rendements de chaque ticker sur tous les horizons de RETURN_HORIZONS,
+    à partir de son propre calendrier de cotation.
+
+    Pour chaque horizon, le cours de référence est la dernière clôture à
+    la date de référence ou avant : une seule recherche dichotomique par
+    ticker donne tous les horizons. Un horizon plus long que l'historique
+    disponible vaut NaN.
+
+    Arguments:
+        hist_data (dict): {ticker: DataFrame} contenant la colonne `field`
+
+    Returns:
+        DataFrame: tickers × horizons, rendements en %, plus la colonne
+                   'Dernière séance'
+    """
+    rows = {}
+    for ticker, hist in hist_data.items():
+        if hist.empty or field not in hist.columns:
+            continue
+        closes = hist[field].dropna()
+        closes = closes[~closes.index.duplicated(keep="last")].sort_index()
+        if len(closes) < 2:
+            continue
+        dates = closes.index
+        values = closes.to_numpy(dtype=float)
+        last = dates[-1]
+
+        references = _reference_dates(last)
+        positions = dates.searchsorted(pd.DatetimeIndex(list(references.values())), side="right") - 1
+        base = np.where(positions >= 0, values[np.maximum(positions, 0)], np.nan)
+        row = dict(zip(references, (values[-1] / base - 1) * 100))
+        row["1 j"] = (values[-1] / values[-2] - 1) * 100
+        row["Dernière séance"] = last
+        rows[ticker] = row
+
+    columns = list(RETURN_HORIZONS) + ["Dernière séance"]
+    return pd.DataFrame.from_dict(rows, orient="index").reindex(columns=columns)
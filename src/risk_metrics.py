@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+# Nombre de séances par an (annualisation)
+TRADING_DAYS = 252
+
+# Taux sans risque annuel utilisé pour Sharpe et Sortino
+RISK_FREE_RATE = 0.0
+
+
+def simple_returns(prices):
+    """Rendements quotidiens simples d'une matrice de prix (première ligne exclue)."""
+    values = prices.to_numpy(dtype=float)
+    return pd.DataFrame(values[1:] / values[:-1] - 1, index=prices.index[1:], columns=prices.columns)
+
+
+def max_drawdowns(returns):
+    """Perte maximale depuis un plus haut, par colonne (valeurs négatives)."""
+    growth = np.cumprod(1 + returns, axis=0)
+    growth = np.vstack([np.ones((1, growth.shape[1])), growth])
+    return (growth / np.maximum.accumulate(growth, axis=0) - 1).min(axis=0)
+
+
+def compute_risk_metrics(returns, benchmark_returns=None, risk_free=RISK_FREE_RATE, periods=TRADING_DAYS):
+    """
+    Indicateurs de risque de chaque colonne de `returns`, calculés en une
+    passe matricielle.
+
+    Arguments:
+        returns (DataFrame): rendements quotidiens dates × séries (portefeuille, titres...)
+        benchmark_returns (DataFrame): rendements des indices de référence, mêmes dates
+        risk_free (float): taux sans risque annuel
+        periods (int): nombre de périodes par an
+
+    Returns:
+        DataFrame: une ligne par série ; rendement et volatilité annualisés,
+                   Sharpe, Sortino, drawdown maximal, puis bêta et tracking
+                   error contre chaque indice
+    """
+    r = returns.to_numpy(dtype=float)
+    n = r.shape[0]
+    if n < 2:
+        return pd.DataFrame(index=returns.columns)
+
+    rf = (1 + risk_free) ** (1 / periods) - 1
+    mean = r.mean(axis=0)
+    std = r.std(axis=0, ddof=1)
+    downside = np.sqrt(np.mean(np.minimum(r - rf, 0) ** 2, axis=0))
+    growth = np.prod(1 + r, axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        metrics = {
+            "Rendement annualisé (%)": (growth ** (periods / n) - 1) * 100,
+            "Volatilité (%)": std * np.sqrt(periods) * 100,
+            "Sharpe": (mean - rf) / std * np.sqrt(periods),
+            "Sortino": (mean - rf) / downside * np.sqrt(periods),
+            "Drawdown max (%)": max_drawdowns(r) * 100,
+        }
+
+        if benchmark_returns is not None and not benchmark_returns.empty:
+            b = benchmark_returns.to_numpy(dtype=float)
+            r_centered = r - mean
+            b_centered = b - b.mean(axis=0)
+            # Covariances séries × indices d'un seul produit matriciel
+            cov = r_centered.T @ b_centered / (n - 1)
+            var_b = b.var(axis=0, ddof=1)
+            beta = cov / var_b
+            tracking = np.sqrt(np.maximum(std[:, None] ** 2 + var_b - 2 * cov, 0)) * np.sqrt(periods)
+            for k, name in enumerate(benchmark_returns.columns):
+                metrics[f"Bêta {name}"] = beta[:, k]
+                metrics[f"Tracking error {name} (%)"] = tracking[:, k] * 100
+
+    return pd.DataFrame(metrics, index=returns.columns)
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from risk_metrics import TRADING_DAYS
+
+# Fenêtres glissantes proposées (séances)
+ROLLING_WINDOWS = (30, 90, 252)
+
+
+class RollingStats:
+    """
+    Statistiques glissantes (volatilité, corrélation et bêta contre un
+    indice) de chaque titre, à partir de sommes cumulées des rendements.
+
+    La somme sur une fenêtre est la différence de deux sommes préfixes :
+    chaque fenêtre coûte O(n) quelle que soit sa longueur, et toutes les
+    longueurs réutilisent les mêmes cumuls. De nouvelles séances
+    s'ajoutent avec append() sans recalculer l'historique.
+
+    Les rendements manquants (avant la première cotation) sont exclus ;
+    une fenêtre n'est renseignée que si toutes ses séances sont valides.
+
+    Arguments:
+        returns (DataFrame): rendements quotidiens dates × tickers
+        benchmark (Series): rendements quotidiens de l'indice, mêmes dates
+    """
+
+    _FIELDS = ("n", "x", "xx", "b", "bb", "xb")
+
+    def __init__(self, returns, benchmark):
+        self.columns = returns.columns
+        self.dates = returns.index[:0]
+        # Décalage constant des rendements : limite les pertes de précision
+        # des sommes de carrés sans modifier variances et covariances
+        self._x_offset = np.nan_to_num(np.nanmean(returns.to_numpy(dtype=float), axis=0))
+        self._b_offset = float(np.nan_to_num(np.nanmean(benchmark.to_numpy(dtype=float))))
+        self._sums = {field: np.zeros((1, len(self.columns))) for field in self._FIELDS}
+        self.append(returns, benchmark)
+
+    def append(self, returns, benchmark):
+        """Ajoute des séances postérieures à la dernière date connue."""
+        if len(self.dates) and len(returns) and returns.index[0] <= self.dates[-1]:
+            raise ValueError("Les nouvelles séances doivent suivre la dernière date connue")
+        x = returns.reindex(columns=self.columns).to_numpy(dtype=float) - self._x_offset
+        b = benchmark.reindex(returns.index).to_numpy(dtype=float)[:, None] - self._b_offset
+        valid = np.isfinite(x) & np.isfinite(b)
+        x = np.where(valid, x, 0.0)
+        b = np.where(valid, b, 0.0)
+        increments = {"n": valid.astype(float), "x": x, "xx": x * x, "b": b, "bb": b * b, "xb": x * b}
+        for field, values in increments.items():
+            cumulated = self._sums[field][-1] + np.cumsum(values, axis=0)
+            self._sums[field] = np.vstack([self._sums[field], cumulated])
+        self.dates = self.dates.append(returns.index)
+        return self
+
+    def _window_sums(self, window):
+        return {field: s[window:] - s[:-window] for field, s in self._sums.items()}
+
+    def _moments(self, window):
+        s = self._window_sums(window)
+        complete = s["n"] == window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var_x = (s["xx"] - s["x"] ** 2 / window) / (window - 1)
+            var_b = (s["bb"] - s["b"] ** 2 / window) / (window - 1)
+            cov = (s["xb"] - s["x"] * s["b"] / window) / (window - 1)
+        return (
+            np.where(complete, np.maximum(var_x, 0), np.nan),
+            np.where(complete, np.maximum(var_b, 0), np.nan),
+            np.where(complete, cov, np.nan),
+        )
+
+    def _frame(self, values, window):
+        return pd.DataFrame(values, index=self.dates[window - 1:], columns=self.columns)
+
+    def volatility(self, window, periods=TRADING_DAYS):
+        """Volatilité annualisée (%) sur `window` séances."""
+        var_x, _, _ = self._moments(window)
+        return self._frame(np.sqrt(var_x * periods) * 100, window)
+
+    def correlation(self, window):
+        """Corrélation avec l'indice sur `window` séances."""
+        var_x, var_b, cov = self._moments(window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self._frame(cov / np.sqrt(var_x * var_b), window)
+
+    def beta(self, window):
+        """Bêta contre l'indice sur `window` séances."""
+        _, var_b, cov = self._moments(window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self._frame(cov / var_b, window)
+
+    def compute(self, windows=ROLLING_WINDOWS, periods=TRADING_DAYS):
+        """
+        Toutes les statistiques pour toutes les fenêtres.
+
+        Returns:
+            dict: {fenêtre: {'Volatilité (%)', 'Corrélation', 'Bêta': DataFrame}}
+        """
+        results = {}
+        for window in windows:
+            var_x, var_b, cov = self._moments(window)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                results[window] = {
+                    "Volatilité (%)": self._frame(np.sqrt(var_x * periods) * 100, window),
+                    "Corrélation": self._frame(cov / np.sqrt(var_x * var_b), window),
+                    "Bêta": self._frame(cov / var_b, window),
+                }
+        return results
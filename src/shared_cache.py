@@ -0,0 +1,154 @@
+import os
+import time
+import pickle
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Base SQLite partagée par tous les processus Streamlit d'un même hôte
+SHARED_CACHE_PATH = "data/cache/shared_cache.sqlite"
+
+# Durée maximale d'un calcul avant que d'autres processus ne reprennent la main
+LEASE_TIMEOUT = 60
+
+_MISSING = object()
+
+
+class SharedCache:
+    """
+    Cache clé/valeur partagé entre processus via SQLite.
+
+    Les valeurs sont sérialisées avec pickle et expirent après leur TTL.
+    Un système de baux (« leases ») garantit qu'un seul processus interroge
+    le fournisseur pour une clé donnée : les autres attendent le résultat
+    écrit dans la base au lieu de refaire la requête.
+    """
+
+    def __init__(self, path=SHARED_CACHE_PATH, lease_timeout=LEASE_TIMEOUT):
+        self.path = path
+        self.lease_timeout = lease_timeout
+        self._local = threading.local()
+        self._owner = f"{os.getpid()}"
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("DELETE FROM entries WHERE expires_at < ?", (time.time(),))
+
+    def _connect(self):
+        # Une connexion par thread (sqlite3 interdit le partage entre threads)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    # ----- Lecture / écriture -----
+    def get(self, key, default=None):
+        row = self._connect().execute(
+            "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return default if row is None else pickle.loads(row[0])
+
+    def set(self, key, value, ttl):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), time.time() + ttl),
+            )
+
+    def delete(self, key):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    # ----- Baux inter-processus -----
+    def _acquire(self, key):
+        now = time.time()
+        owner = f"{self._owner}:{threading.get_ident()}"
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.expires_at < ?",
+                (key, owner, now + self.lease_timeout, now),
+            )
+            return cursor.rowcount == 1
+
+    def _release(self, key):
+        owner = f"{self._owner}:{threading.get_ident()}"
+        with self._connect() as conn:
+            conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+
+    @contextmanager
+    def lock(self, key, timeout=None, poll=0.1):
+        """Verrou inter-processus sur une clé (attend au plus `timeout` secondes)."""
+        deadline = time.time() + (self.lease_timeout if timeout is None else timeout)
+        while not self._acquire(key):
+            if time.time() > deadline:
+                raise TimeoutError(f"Verrou '{key}' toujours détenu par un autre processus")
+            time.sleep(poll)
+        try:
+            yield
+        finally:
+            self._release(key)
+
+    def get_or_compute(self, key, compute, ttl, poll=0.1):
+        """
+        Renvoie la valeur en cache, ou la calcule une seule fois pour l'hôte.
+
+        Si un autre processus calcule déjà la clé, attend son résultat
+        plutôt que d'interroger le fournisseur une seconde fois.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        deadline = time.time() + self.lease_timeout
+        while time.time() < deadline:
+            if self._acquire(key):
+                try:
+                    value = self.get(key, _MISSING)
+                    if value is _MISSING:
+                        value = compute()
+                        self.set(key, value, ttl)
+                    return value
+                finally:
+                    self._release(key)
+            time.sleep(poll)
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+        # Bail abandonné par un processus bloqué : calcul local
+        value = compute()
+        self.set(key, value, ttl)
+        return value
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """Instance du cache partagé pour le processus courant."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SharedCache()
+    return _shared_cache
+
+
+def set_shared_cache(cache):
+    """Remplace le cache partagé du processus (benchmarks, dossier temporaire)."""
+    global _shared_cache
+    with _shared_cache_lock:
+        _shared_cache = cache
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# Fenêtre du rendement du dividende glissant (jours calendaires)
+TRAILING_YIELD_DAYS = 365
+
+
+def dividend_matrix(hist_data, dates, field="Dividends"):
+    """
+    Dividendes de chaque ticker alignés sur les dates d'une matrice de prix
+    (0 les jours sans détachement, jamais reportés).
+
+    Arguments:
+        hist_data (dict): {ticker: DataFrame} contenant la colonne `field`
+        dates (DatetimeIndex): dates de la matrice de prix
+
+    Returns:
+        DataFrame: dates × tickers, colonnes dans l'ordre de hist_data
+    """
+    columns = {}
+    for ticker, hist in hist_data.items():
+        if hist.empty or field not in hist.columns:
+            columns[ticker] = pd.Series(0.0, index=dates)
+            continue
+        paid = hist[field].fillna(0.0)
+        paid = paid[paid != 0]
+        columns[ticker] = paid.groupby(level=0).sum().reindex(dates, fill_value=0.0)
+    return pd.DataFrame(columns, index=dates, dtype=float)
+
+
+def _grow(close, dividends, base_close, base_level):
+    """
+    Niveaux de l'indice dividendes réinvestis :
+    I[t] = I[t-1] · (P[t] + D[t]) / P[t-1], à partir de (base_close, base_level).
+    Avant la première cotation d'un ticker, le niveau vaut NaN ; à la
+    première cotation, il repart de `base_level`.
+    """
+    previous = np.vstack([base_close, close[:-1]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (close + dividends) / previous
+    growth[~np.isfinite(growth)] = 1.0
+    levels = base_level * np.cumprod(growth, axis=0)
+    return np.where(np.isfinite(close), levels, np.nan)
+
+
+class TotalReturnIndex:
+    """
+    Indice de rendement total (dividendes réinvestis à la clôture du jour
+    de détachement) de chaque colonne d'une matrice de clôtures.
+
+    Le calcul est un produit cumulé sur toute la matrice. Les clôtures
+    stockées sont ajustées des divisions d'actions mais pas des dividendes :
+    la clôture du jour de détachement baisse du montant versé, que l'indice
+    réintègre. L'indice part de la première clôture de chaque ticker.
+
+    De nouvelles séances s'ajoutent par update() : seul le dernier niveau
+    et la clôture de la veille sont nécessaires. La clôture de la veille
+    est relue dans la matrice transmise, qui suit donc une éventuelle
+    division d'actions appliquée depuis à tout l'historique stocké.
+
+    Arguments:
+        close (DataFrame): clôtures dates × tickers (voir price_matrix.build_price_matrix)
+        dividends (DataFrame): dividendes, mêmes dates et colonnes (voir dividend_matrix)
+    """
+
+    def __init__(self, close, dividends):
+        self.columns = close.columns
+        values = close.to_numpy(dtype=float)
+        valid = np.isfinite(values)
+        first = np.where(valid.any(axis=0), values[valid.argmax(axis=0), np.arange(values.shape[1])], np.nan)
+        self._levels = _grow(values, dividends.to_numpy(dtype=float), np.full(len(self.columns), np.nan), first)
+        self.dates = close.index
+
+    def _tail(self, close, dividends):
+        """Position de la dernière date connue dans `close` et niveaux des séances suivantes."""
+        close = close.reindex(columns=self.columns)
+        known = close.index.searchsorted(self.dates[-1])
+        if known >= len(close.index) or close.index[known] != self.dates[-1]:
+            raise ValueError("La matrice doit contenir la dernière date connue")
+        values = close.to_numpy(dtype=float)
+        levels = _grow(
+            values[known + 1:],
+            dividends.reindex(index=close.index, columns=self.columns).to_numpy(dtype=float)[known + 1:],
+            values[known],
+            self._levels[-1],
+        )
+        return close.index[known + 1:], levels
+
+    def update(self, close, dividends):
+        """Ajoute les séances de `close` postérieures à la dernière date connue."""
+        dates, levels = self._tail(close, dividends)
+        if len(dates):
+            self._levels = np.vstack([self._levels, levels])
+            self.dates = self.dates.append(dates)
+        return self
+
+    def index(self, close=None, dividends=None):
+        """
+        Indice de rendement total (DataFrame dates × tickers). Avec `close`,
+        prolongé des séances postérieures sans les enregistrer (séance du
+        jour encore susceptible d'évoluer).
+        """
+        frame = pd.DataFrame(self._levels, index=self.dates, columns=self.columns)
+        if close is None:
+            return frame
+        dates, levels = self._tail(close, dividends)
+        if not len(dates):
+            return frame
+        return pd.concat([frame, pd.DataFrame(levels, index=dates, columns=self.columns)])
+
+
+def trailing_dividend_yield(close, dividends, days=TRAILING_YIELD_DAYS):
+    """
+    Rendement du dividende glissant (%) : dividendes détachés sur les
+    `days` derniers jours rapportés à la dernière clôture, par ticker.
+    """
+    if close.empty:
+        return pd.Series(dtype=float)
+    recent = dividends.index > close.index[-1] - pd.Timedelta(days=days)
+    paid = dividends.to_numpy(dtype=float)[recent].sum(axis=0)
+    last = close.ffill().to_numpy(dtype=float)[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pd.Series(paid / last * 100, index=close.columns)
@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+from scipy.stats import norm
+
+VAR_METHODS = {
+    "historical": "Historique",
+    "parametric": "Paramétrique (loi normale)",
+    "filtered": "Historique filtrée (EWMA)",
+}
+
+CONFIDENCE_LEVELS = (0.95, 0.99)
+HORIZONS = (1, 10)
+
+# Séances retenues pour l'estimation (environ deux ans)
+DEFAULT_WINDOW = 500
+
+# Facteur de décroissance EWMA des volatilités (RiskMetrics, données quotidiennes)
+EWMA_DECAY = 0.94
+
+
+def ewma_volatility(returns, decay=EWMA_DECAY):
+    """
+    Volatilités EWMA de chaque colonne : σ²[t] = λ·σ²[t-1] + (1 - λ)·r²[t-1],
+    initialisées à la variance de l'échantillon.
+
+    Returns:
+        array: (n + 1) × p ; la ligne t est la prévision disponible avant la
+               séance t, la dernière celle de la prochaine séance
+    """
+    r2 = returns ** 2
+    initial = r2.mean(axis=0)
+    filtered = lfilter([1 - decay], [1, -decay], r2, axis=0, zi=(decay * initial)[None, :])[0]
+    return np.sqrt(np.vstack([initial, filtered]))
+
+
+class ValueAtRisk:
+    """
+    VaR et CVaR (Expected Shortfall) d'un portefeuille et contributions de
+    chaque titre, par trois méthodes : historique, paramétrique (loi
+    normale) et historique filtrée (scénarios historiques dont chaque
+    rendement est remis à l'échelle de la volatilité EWMA actuelle du titre).
+
+    Tout ce qui ne dépend pas du niveau de confiance est calculé à la
+    construction : pertes des scénarios triées une fois, moments du
+    portefeuille. Un niveau de confiance ou un horizon se lit ensuite
+    en O(k·p) sur les k pires scénarios.
+
+    Les pertes sont exprimées en fraction de la valeur du portefeuille
+    (positives). L'horizon h se déduit de la perte à un jour par la règle
+    de la racine du temps (√h ; moyenne × h pour la méthode paramétrique).
+
+    Les contributions suivent l'allocation d'Euler et ont pour somme la
+    mesure du portefeuille : w·Σw/σ pour la méthode paramétrique, moyenne
+    des pertes de chaque titre dans la queue pour la CVaR historique,
+    moyenne autour du quantile (remise à l'échelle) pour la VaR historique.
+
+    Arguments:
+        returns (DataFrame): rendements quotidiens simples dates × tickers, sans NaN
+        weights (array): pondérations (équipondéré par défaut)
+        window (int): nombre de séances retenues (les plus récentes)
+        decay (float): facteur de décroissance EWMA (méthode filtrée)
+    """
+
+    def __init__(self, returns, weights=None, window=DEFAULT_WINDOW, decay=EWMA_DECAY):
+        returns = returns.iloc[-window:]
+        values = returns.to_numpy(dtype=float)
+        if len(values) < 2 or not np.isfinite(values).all():
+            raise ValueError("Historique de rendements insuffisant ou incomplet")
+        self.columns = returns.columns
+        self.dates = returns.index
+        self.n = len(values)
+        p = values.shape[1]
+        self.weights = np.full(p, 1 / p) if weights is None else np.asarray(weights, dtype=float) / np.sum(weights)
+
+        # Méthode paramétrique : moments du portefeuille et risque marginal
+        mean = values.mean(axis=0)
+        cov = np.cov(values, rowvar=False).reshape(p, p)
+        self._mean = self.weights * mean
+        self._sigma = float(np.sqrt(self.weights @ cov @ self.weights))
+        self._marginal = self.weights * (cov @ self.weights) / self._sigma if self._sigma > 0 else np.zeros(p)
+
+        # Méthodes par scénarios : pertes de chaque titre, du pire scénario au meilleur
+        vol = ewma_volatility(values, decay)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(vol[:-1] > 0, vol[-1] / vol[:-1], 1.0)
+        self._scenarios = {}
+        for method, scenarios in (("historical", values), ("filtered", values * scale)):
+            losses = -scenarios * self.weights
+            order = np.argsort(-losses.sum(axis=1), kind="stable")
+            self._scenarios[method] = losses[order]
+
+    def _tail_size(self, confidence):
+        return max(1, int(np.ceil(self.n * (1 - confidence) - 1e-9)))
+
+    def _parametric(self, confidence, horizon, measure):
+        z = norm.ppf(confidence)
+        factor = z if measure == "var" else norm.pdf(z) / (1 - confidence)
+        return np.sqrt(horizon) * factor * self._marginal - horizon * self._mean
+
+    def _historical(self, confidence, horizon, method, measure):
+        losses = self._scenarios[method]
+        k = self._tail_size(confidence)
+        if measure == "cvar":
+            contributions = losses[:k].mean(axis=0)
+        else:
+            # Moyenne des scénarios voisins du quantile, ramenée à la VaR
+            band = max(1, self.n // 100)
+            contributions = losses[max(0, k - 1 - band):k + band].mean(axis=0)
+            total = contributions.sum()
+            var = losses[k - 1].sum()
+            if total != 0:
+                contributions = contributions * var / total
+        return np.sqrt(horizon) * contributions
+
+    def components(self, confidence=0.95, horizon=1, method="historical", measure="var"):
+        """
+        Contribution de chaque titre à la VaR (measure="var") ou à la CVaR
+        (measure="cvar") ; leur somme est la mesure du portefeuille.
+
+        Returns:
+            Series: contributions en fraction de la valeur, par ticker
+        """
+        if method not in VAR_METHODS:
+            raise ValueError(f"Méthode de VaR inconnue : {method}")
+        if measure not in ("var", "cvar"):
+            raise ValueError(f"Mesure inconnue : {measure}")
+        if method == "parametric":
+            values = self._parametric(confidence, horizon, measure)
+        else:
+            values = self._historical(confidence, horizon, method, measure)
+        return pd.Series(values, index=self.columns)
+
+    def var(self, confidence=0.95, horizon=1, method="historical"):
+        """VaR du portefeuille (perte positive, fraction de la valeur)."""
+        return float(self.components(confidence, horizon, method, "var").sum())
+
+    def cvar(self, confidence=0.95, horizon=1, method="historical"):
+        """CVaR (perte moyenne au-delà de la VaR), fraction de la valeur."""
+        return float(self.components(confidence, horizon, method, "cvar").sum())
+
+    def summary(self, method="historical", confidences=CONFIDENCE_LEVELS, horizons=HORIZONS):
+        """
+        VaR et CVaR du portefeuille pour chaque horizon et niveau de confiance.
+
+        Returns:
+            DataFrame: une ligne par horizon ('1 j', '10 j'), colonnes
+                       'VaR 95 %', 'CVaR 95 %'... en fraction de la valeur
+        """
+        rows = {}
+        for horizon in horizons:
+            row = {}
+            for confidence in confidences:
+                label = f"{confidence * 100:g} %"
+                row[f"VaR {label}"] = self.var(confidence, horizon, method)
+                row[f"CVaR {label}"] = self.cvar(confidence, horizon, method)
+            rows[f"{horizon} j"] = row
+        return pd.DataFrame.from_dict(rows, orient="index")
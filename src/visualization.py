@@ -4,6 +4,11 @@ import pandas as pd
 import streamlit as st
 import numpy as np
 from datetime import datetime
+from cumulative_returns import CumulativeReturns
+from nav_engine import simulate_nav, REBALANCING_LABELS
+from covariance import cluster_order
+from attribution import compute_attribution, BRINSON_EFFECTS
+from downsampling import downsample, DEFAULT_MAX_POINTS
 
 # Créer le tableau du portefeuille avec hauteur fixe 
 def create_portfolio_table(comp_df):
@@ -96,15 +101,32 @@ def create_portfolio_table(comp_df):
     
     return fig, table_height
 
+# Périodes du graphique de cours : (nombre, unité Plotly) des boutons de sélection
+STOCK_CHART_PERIODS = {
+    "1 mois": (1, "month"),
+    "6 mois": (6, "month"),
+    "1 an": (1, "year"),
+}
+
+
 # Créer le graphique d'une action
-def create_stock_chart(hist, ticker, currency, period_selection):
-    # Filtrer l'historique selon la période sélectionnée
-    if period_selection == "1 mois":
-        filtered_hist = hist.iloc[-30:]
-    elif period_selection == "6 mois":
-        filtered_hist = hist.iloc[-180:]
-    else:  
-        filtered_hist = hist
+def create_stock_chart(hist, ticker, currency, period_selection="1 an"):
+    """
+    Graphique de cours et de volume sur tout l'historique fourni.
+
+    La période se choisit par les boutons du graphique (1 mois, 6 mois,
+    1 an) : le changement se fait dans le navigateur, sans nouvelle
+    exécution du script. `period_selection` fixe la période affichée à
+    l'ouverture et celle des statistiques renvoyées, au calendrier près
+    (et non en nombre de lignes).
+
+    Returns:
+        tuple: (figure, cours moyen, plus haut, plus bas sur la période)
+    """
+    count, step = STOCK_CHART_PERIODS.get(period_selection, STOCK_CHART_PERIODS["1 an"])
+    end = hist.index[-1]
+    start = end - pd.DateOffset(**{f"{step}s": count})
+    filtered_hist = hist[hist.index >= start]
 
     # Calculer les statistiques
     avg_price = filtered_hist['Close'].mean()
@@ -117,8 +139,8 @@ def create_stock_chart(hist, ticker, currency, period_selection):
     # Ajouter la courbe de prix
     fig.add_trace(
         go.Scatter(
-            x=filtered_hist.index,
-            y=filtered_hist['Close'],
+            x=hist.index,
+            y=hist['Close'],
             mode='lines',
             name='Prix',
             line=dict(color='#693112', width=2)
@@ -126,11 +148,11 @@ def create_stock_chart(hist, ticker, currency, period_selection):
     )
     
     # Ajouter le volume en barres
-    if 'Volume' in filtered_hist.columns:
-        volume_scale = filtered_hist['Volume'] / filtered_hist['Volume'].max() * filtered_hist['Close'].min() * 0.2
+    if 'Volume' in hist.columns:
+        volume_scale = hist['Volume'] / hist['Volume'].max() * hist['Close'].min() * 0.2
         fig.add_trace(
             go.Bar(
-                x=filtered_hist.index,
+                x=hist.index,
                 y=volume_scale,
                 marker_color='rgba(105, 49, 18, 0.2)',
                 name='Volume',
@@ -154,92 +176,103 @@ def create_stock_chart(hist, ticker, currency, period_selection):
             showgrid=False,
             showticklabels=False,
             overlaying='y',
-            range=[0, filtered_hist['Close'].min() * 0.3]
+            range=[0, hist['Close'].min() * 0.3]
         ),
         xaxis=dict(
             showgrid=True,
-            gridcolor='rgba(105, 49, 18, 0.1)'
+            gridcolor='rgba(105, 49, 18, 0.1)',
+            range=[start, end],
+            rangeselector=dict(
+                buttons=[
+                    dict(count=n, label=label, step=unit, stepmode='backward')
+                    for label, (n, unit) in STOCK_CHART_PERIODS.items()
+                ],
+                bgcolor='#f9f5f2',
+                activecolor='#C8AD7F',
+                x=0,
+                y=1.02
+            )
         ),
         plot_bgcolor='white'
     )
     
     return fig, avg_price, max_price, min_price
 
-# Tracer les performances comparées
-def plot_performance(hist_data, weights=None, reference_indices=None, end_date_ui=None, force_start_date=None):
-    if not hist_data:
-        return None
 
+def _aligned_weights(weights, columns):
+    """Pondérations {ticker: poids} ou liste alignées sur les colonnes (None : équipondéré)."""
     if weights is None:
-        weights = [1/len(hist_data)] * len(hist_data)
-
-    start_dates = []
-    end_dates = []
-
-    for ticker, hist in hist_data.items():
-        if not hist.empty:
-            start_dates.append(hist.index[0])
-            end_dates.append(hist.index[-1])
-
-    if not start_dates or not end_dates:
         return None
+    if isinstance(weights, dict):
+        return np.array([weights.get(c, 0.0) for c in columns], dtype=float)
+    return np.asarray(weights, dtype=float) if len(weights) == len(columns) else None
 
-    start_dt = force_start_date or max(start_dates)
-    end_dt = end_date_ui or max(end_dates)
 
-    fig = go.Figure()
-    date_range = pd.date_range(start=start_dt, end=end_dt, freq='B')
-    all_normalized = pd.DataFrame(index=date_range)
-    portfolio_trace = None
-    indices_traces = []
+def _as_returns(prices):
+    """Accepte une matrice de prix ou un indice cumulé déjà calculé."""
+    if prices is None or isinstance(prices, CumulativeReturns):
+        return prices
+    return CumulativeReturns(prices)
 
-    for i, (ticker, hist) in enumerate(hist_data.items()):
-        if hist.empty:
-            continue
-        filtered_hist = hist[(hist.index >= start_dt) & (hist.index <= end_dt)]
-        if filtered_hist.empty:
-            continue
-        reindexed = filtered_hist['Close'].reindex(date_range, method='ffill')
-        normalized = reindexed / reindexed.iloc[0] * 100
-        all_normalized[ticker] = normalized
+# Tracer les performances comparées
+def plot_performance(prices, weights=None, benchmarks=None, end_date_ui=None, force_start_date=None,
+                     rebalance="buy_and_hold", max_points=DEFAULT_MAX_POINTS):
+    """
+    Performance base 100 du portefeuille et des indices de référence.
+
+    Arguments:
+        prices (DataFrame | CumulativeReturns): matrice de prix dates × tickers
+            ou son indice cumulé (re-basage instantané sur la fenêtre)
+        weights (dict | list): pondérations {ticker: poids} ou alignées sur les
+            colonnes (par défaut équipondéré)
+        benchmarks (DataFrame | CumulativeReturns): cours des indices de référence,
+            une colonne par nom d'indice (déjà récupérés et mis en cache : aucun
+            appel réseau ici)
+        rebalance (str): mode de rééquilibrage du portefeuille (voir nav_engine)
+        max_points (int): points envoyés par courbe (LTTB sur la fenêtre affichée,
+            None : toutes les séances)
+    """
+    returns = _as_returns(prices)
+    if returns is None or returns.empty:
+        return None
 
-    if all_normalized.empty:
+    normalized = returns.rebase(force_start_date, end_date_ui)
+    if normalized.empty:
         return None
 
-    portfolio_perf = pd.Series(0, index=date_range)
-    if len(weights) < len(all_normalized.columns):
-        weights = [1/len(all_normalized.columns)] * len(all_normalized.columns)
+    n = normalized.shape[1]
+    w = _aligned_weights(weights, normalized.columns)
+    if rebalance == "buy_and_hold":
+        w = np.full(n, 1 / n) if w is None else np.asarray(w, dtype=float)
+        portfolio_perf = pd.Series(normalized.to_numpy() @ w, index=normalized.index)
+    else:
+        portfolio_perf = simulate_nav(normalized, w, 100, rebalance).nav
 
-    for i, col in enumerate(all_normalized.columns):
-        portfolio_perf += all_normalized[col] * weights[i]
+    fig = go.Figure()
+    indices_traces = []
 
+    x, y = downsample(portfolio_perf.index, portfolio_perf.to_numpy(), max_points)
     portfolio_trace = go.Scatter(
-        x=portfolio_perf.index,
-        y=portfolio_perf.values,
+        x=x,
+        y=y,
         mode='lines',
         name='Portefeuille',
         line=dict(width=3, color='#693112')
     )
 
-    if reference_indices:
-        import yfinance as yf
-        for name, ticker in reference_indices.items():
-            try:
-                ref = yf.Ticker(ticker)
-                ref_hist = ref.history(start=start_dt, end=end_dt)
-                if not ref_hist.empty:
-                    ref_hist.index = ref_hist.index.tz_localize(None)
-                    ref_close = ref_hist['Close'].reindex(date_range, method='ffill')
-                    ref_norm = ref_close / ref_close.iloc[0] * 100
-                    indices_traces.append(go.Scatter(
-                        x=ref_norm.index,
-                        y=ref_norm.values,
-                        mode='lines',
-                        name=name,
-                        line=dict(width=2.5, dash='dash')
-                    ))
-            except Exception as e:
-                st.warning(f"Erreur lors de la récupération des données pour {name}: {str(e)}")
+    benchmarks = _as_returns(benchmarks)
+    if benchmarks is not None and not benchmarks.empty:
+        ref_normalized = benchmarks.rebase(normalized.index[0], normalized.index[-1], common=False)
+        ref_normalized = ref_normalized.reindex(normalized.index, method='ffill').bfill().dropna(axis=1, how="all")
+        for name in ref_normalized.columns:
+            x, y = downsample(ref_normalized.index, ref_normalized[name].to_numpy(), max_points)
+            indices_traces.append(go.Scatter(
+                x=x,
+                y=y,
+                mode='lines',
+                name=name,
+                line=dict(width=2.5, dash='dash')
+            ))
 
     fig.add_trace(portfolio_trace)
     for trace in indices_traces:
@@ -255,71 +288,69 @@ def plot_performance(hist_data, weights=None, reference_indices=None, end_date_u
     )
 
     # Ajuster l'échelle Y
-    y_vals = list(portfolio_trace.y) + sum([list(trace.y) for trace in indices_traces], [])
-    if y_vals:
-        min_y = max(min(y_vals) * 0.9, 0)
-        max_y = min(max(y_vals) * 1.1, max(y_vals) * 1.5)
-        reasonable_max = max(150, min(max_y, 300))
-        fig.update_layout(yaxis=dict(range=[min_y, reasonable_max]))
+    y_vals = np.concatenate([np.asarray(portfolio_trace.y)] + [np.asarray(trace.y) for trace in indices_traces])
+    y_vals = y_vals[np.isfinite(y_vals)]
+    if y_vals.size:
+        min_y = max(y_vals.min() * 0.9, 0)
+        max_y = max(150, y_vals.max() * 1.1)
+        fig.update_layout(yaxis=dict(range=[min_y, max_y]))
 
     return fig
 
 # Simuler l'évolution du portefeuille
-def plot_portfolio_simulation(hist_data, initial_investment=1000000, end_date_ui=None, max_traces=15, force_start_date=None):
-    if not hist_data:
+def plot_portfolio_simulation(prices, initial_investment=1000000, end_date_ui=None, max_traces=15, force_start_date=None,
+                              weights=None, rebalance="buy_and_hold", whole_shares=False,
+                              max_points=DEFAULT_MAX_POINTS):
+    """
+    Évolution d'un investissement réparti selon `weights` (équitablement par
+    défaut) à la première date commune de la matrice de prix, conservé ou
+    rééquilibré selon `rebalance` (voir nav_engine.simulate_nav).
+
+    Les courbes sont réduites à `max_points` points avant l'envoi au
+    navigateur : min / max par seau pour les lignes (tracés secondaires),
+    LTTB pour le portefeuille. Les montants renvoyés portent sur toutes
+    les séances.
+    """
+    returns = _as_returns(prices)
+    if returns is None or returns.empty:
         return None, 0, 0, 0, []
-        
-    start_dates = []
-    end_dates = []
-
-    for ticker, hist in hist_data.items():
-        if not hist.empty:
-            start_dates.append(hist.index[0])
-            end_dates.append(hist.index[-1])
 
-    if not start_dates or not end_dates:
+    window = returns.window_prices(force_start_date, end_date_ui)
+    if window.empty:
         return None, 0, 0, 0, []
 
-    start_dt = force_start_date or max(start_dates)
-    end_dt = end_date_ui or max(end_dates)
-    date_range = pd.date_range(start=start_dt, end=end_dt, freq='B')
-    num_stocks = len(hist_data)
-    invest_each = initial_investment / num_stocks
+    # Titres comptés sur les clôtures réelles, dividendes encaissés en liquidités
+    result = simulate_nav(window, _aligned_weights(weights, window.columns), initial_investment, rebalance,
+                          whole_shares=whole_shares,
+                          dividends=returns.window_dividends(force_start_date, end_date_ui))
+    start_dt, end_dt = window.index[0], window.index[-1]
+    portfolio_value = result.nav
 
-    fig = go.Figure()
-    all_values = pd.DataFrame(index=date_range)
-    stock_info = []
+    # Nombre d'actions achetées et valeur quotidienne de chaque ligne
+    num_shares = result.shares.iloc[0].to_numpy()
+    values = result.shares.to_numpy() * window.to_numpy()
 
-    for ticker, hist in hist_data.items():
-        if hist.empty:
-            continue
-        reindexed = hist['Close'].reindex(date_range, method='ffill')
-        if reindexed.empty or reindexed.isna().all() or reindexed.iloc[0] == 0:
-            continue
-        initial_price = reindexed.iloc[0]
-        num_shares = invest_each / initial_price
-        stock_info.append({
-            "ticker": ticker,
-            "num_shares": num_shares,
-            "initial_investment": invest_each
-        })
-        stock_value = reindexed * num_shares
-        all_values[ticker] = stock_value
-       
-        if len(stock_info) <= max_traces:
-            fig.add_trace(go.Scatter(
-                x=stock_value.index,
-                y=stock_value.values,
-                mode='lines',
-                name=ticker,
-                line=dict(width=1, dash='dot'),
-                opacity=0.3
-            ))
+    stock_info = [
+        {"ticker": ticker, "num_shares": shares, "initial_investment": shares * price}
+        for ticker, shares, price in zip(window.columns, num_shares, window.iloc[0].to_numpy())
+    ]
 
-    portfolio_value = all_values.sum(axis=1)
+    fig = go.Figure()
+    for i, ticker in enumerate(window.columns[:max_traces]):
+        x, y = downsample(window.index, values[:, i], max_points, method="minmax")
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=y,
+            mode='lines',
+            name=ticker,
+            line=dict(width=1, dash='dot'),
+            opacity=0.3
+        ))
+
+    x, y = downsample(portfolio_value.index, portfolio_value.to_numpy(), max_points)
     fig.add_trace(go.Scatter(
-        x=portfolio_value.index,
-        y=portfolio_value.values,
+        x=x,
+        y=y,
         mode='lines',
         name='Portefeuille Total',
         line=dict(width=3, color='#693112')
@@ -335,11 +366,16 @@ def plot_portfolio_simulation(hist_data, initial_investment=1000000, end_date_ui
         line=dict(color="black", width=2, dash="dash")
     )
 
+    title = (
+        f"Évolution d'un investissement de "
+        f"{f'{initial_investment:_}'.replace('_', ' ')} € "
+        f"{'réparti équitablement' if weights is None else 'selon les pondérations cibles'}"
+    )
+    if rebalance != "buy_and_hold":
+        title += f" – {REBALANCING_LABELS[rebalance].lower()}, rotation cumulée {result.total_turnover:.0%}"
+
     fig.update_layout(
-        title=(
-            f"Évolution d'un investissement de "
-            f"{f'{initial_investment:_}'.replace('_', ' ')} € réparti équitablement"
-        ),
+        title=title,
         xaxis_title="Date",
         yaxis_title="Valeur (€)",
         height=500,
@@ -347,56 +383,54 @@ def plot_portfolio_simulation(hist_data, initial_investment=1000000, end_date_ui
         showlegend=False
     )
 
-    if not portfolio_value.empty:
-        y_min = max(portfolio_value.min() * 0.9, 0)
-        y_max = portfolio_value.max() * 1.1
-        fig.update_layout(yaxis=dict(range=[y_min, y_max]))
+    y_min = max(portfolio_value.min() * 0.9, 0)
+    y_max = portfolio_value.max() * 1.1
+    fig.update_layout(yaxis=dict(range=[y_min, y_max]))
 
-    if portfolio_value.empty:
-        final_val = initial_investment
-        gain_loss = 0
-        pct_change = 0
-    else:
-        final_val = portfolio_value.iloc[-1]
-        gain_loss = final_val - initial_investment
-        pct_change = (gain_loss / initial_investment) * 100
+    final_val = portfolio_value.iloc[-1]
+    gain_loss = final_val - initial_investment
+    pct_change = (gain_loss / initial_investment) * 100
 
     return fig, final_val, gain_loss, pct_change, stock_info
 
 # Calculer les statistiques du portefeuille
-def calculate_portfolio_stats(hist_data, portfolio_df, start_date, end_date):
-    df_perf = []
-    
-    # Pour chaque ticker dans les données historiques
-    for ticker, hist in hist_data.items():
-        if hist.empty:
-            continue
-            
-        # Récupérer le nom de la société
-        company_name = ticker
-        company_row = portfolio_df[portfolio_df['Ticker'] == ticker]
-        if not company_row.empty and 'Société' in company_row.columns:
-            company_name = company_row.iloc[0]['Société']
-            
-        # Calculer la performance entre les dates
-        idx_start = hist.index.get_indexer([start_date], method='nearest')[0]
-        start_price = hist['Close'].iloc[idx_start]
-        end_price = hist['Close'].iloc[-1]
-        
-        if start_price > 0:
-            pct_change = (end_price - start_price) / start_price * 100
-            abs_change = end_price - start_price
-            
-            df_perf.append({
-                'Ticker': ticker,
-                'Société': company_name,
-                'Prix départ': start_price,
-                'Prix final': end_price,
-                'Var. abs.': abs_change,
-                'Var. (%)': pct_change
-            })
-    
-    return pd.DataFrame(df_perf)
+def calculate_portfolio_stats(prices, portfolio_df, start_date=None, end_date=None, attribution=None,
+                              weights=None, rebalance="buy_and_hold"):
+    """
+    Variation de chaque ticker entre sa première cotation à partir de
+    start_date et la dernière date de la matrice de prix (ou de son
+    indice cumulé), avec sa pondération initiale et sa contribution au
+    rendement du portefeuille.
+
+    Arguments:
+        attribution (dict): résultat de attribution.compute_attribution
+            (voir data_loader.get_attribution) ; à défaut, calculé ici
+            pour `weights` et `rebalance` sur la fenêtre commune
+    """
+    returns = _as_returns(prices)
+    if returns is None or returns.empty:
+        return pd.DataFrame()
+    perf = returns.period_returns(start_date, end_date)
+    if perf.empty:
+        return pd.DataFrame()
+    if attribution is None:
+        window = returns.window_index(start_date, end_date)
+        if len(window) >= 2:
+            attribution = compute_attribution(window, _aligned_weights(weights, window.columns), rebalance=rebalance)
+
+    names = dict(zip(portfolio_df['Ticker'], portfolio_df['Société'])) if 'Société' in portfolio_df.columns else {}
+    df_perf = pd.DataFrame({
+        'Ticker': perf.index,
+        'Société': [names.get(t, t) for t in perf.index],
+        'Prix départ': perf['Prix départ'].to_numpy(),
+        'Prix final': perf['Prix final'].to_numpy(),
+    })
+    df_perf['Var. abs.'] = df_perf['Prix final'] - df_perf['Prix départ']
+    df_perf['Var. (%)'] = perf['Rendement'].to_numpy() * 100
+    by_ticker = attribution["Titres"] if attribution is not None else pd.DataFrame()
+    for column in ['Pondération (%)', 'Contribution (%)', 'Contribution active (%)']:
+        df_perf[column] = df_perf['Ticker'].map(by_ticker[column]) if column in by_ticker else np.nan
+    return df_perf[df_perf['Prix départ'] > 0].reset_index(drop=True)
 
 # Afficher les principaux contributeurs
 def display_top_contributors(df_perf):
@@ -441,6 +475,225 @@ def display_top_contributors(df_perf):
             </div>
             """, unsafe_allow_html=True)
 
+# Tracer la projection Monte Carlo
+def plot_monte_carlo(bands, initial_value=1000000):
+    """
+    Éventail des percentiles de la valeur projetée du portefeuille.
+
+    Arguments:
+        bands (DataFrame): séances futures × percentiles (colonnes P5, P25, P50, P75, P95)
+    """
+    if bands is None or bands.empty:
+        return None
+
+    fig = go.Figure()
+    for low, high, opacity in [("P5", "P95", 0.15), ("P25", "P75", 0.3)]:
+        if low not in bands.columns or high not in bands.columns:
+            continue
+        fig.add_trace(go.Scatter(
+            x=bands.index, y=bands[high].to_numpy(), mode='lines',
+            line=dict(width=0), showlegend=False, hoverinfo='skip'
+        ))
+        fig.add_trace(go.Scatter(
+            x=bands.index, y=bands[low].to_numpy(), mode='lines',
+            line=dict(width=0), fill='tonexty',
+            fillcolor=f'rgba(105, 49, 18, {opacity})',
+            name=f"{low[1:]}e – {high[1:]}e percentile"
+        ))
+    if "P50" in bands.columns:
+        fig.add_trace(go.Scatter(
+            x=bands.index, y=bands["P50"].to_numpy(), mode='lines',
+            name='Médiane', line=dict(width=3, color='#693112')
+        ))
+
+    fig.add_shape(
+        type="line",
+        x0=bands.index[0],
+        y0=initial_value,
+        x1=bands.index[-1],
+        y1=initial_value,
+        line=dict(color="black", width=2, dash="dash")
+    )
+    fig.update_layout(
+        title="Projection Monte Carlo de la valeur du portefeuille",
+        xaxis_title="Date",
+        yaxis_title="Valeur (€)",
+        height=500,
+        template="plotly_white",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+# Tracer la frontière efficiente
+def plot_efficient_frontier(frontier, assets=None, portfolios=None):
+    """
+    Frontière efficiente (volatilité, rendement annualisés), titres
+    individuels et portefeuilles optimisés.
+
+    Arguments:
+        frontier (DataFrame): colonnes 'Volatilité (%)' et 'Rendement (%)'
+        assets (DataFrame): mêmes colonnes, une ligne par ticker
+        portfolios (DataFrame): mêmes colonnes, une ligne par méthode
+    """
+    if frontier is None or frontier.empty:
+        return None
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=frontier['Volatilité (%)'], y=frontier['Rendement (%)'],
+        mode='lines', name='Frontière efficiente', line=dict(width=3, color='#693112')
+    ))
+    if assets is not None and not assets.empty:
+        fig.add_trace(go.Scatter(
+            x=assets['Volatilité (%)'], y=assets['Rendement (%)'], mode='markers+text',
+            text=assets.index, textposition='top center', name='Titres',
+            marker=dict(size=8, color='#b08d74')
+        ))
+    if portfolios is not None and not portfolios.empty:
+        fig.add_trace(go.Scatter(
+            x=portfolios['Volatilité (%)'], y=portfolios['Rendement (%)'], mode='markers+text',
+            text=portfolios.index, textposition='bottom center', name='Portefeuilles',
+            marker=dict(size=12, symbol='diamond', color='#1B3D1B')
+        ))
+    fig.update_layout(
+        title="Frontière efficiente (rendements et covariance estimés sur la période)",
+        xaxis_title="Volatilité annualisée (%)",
+        yaxis_title="Rendement annualisé (%)",
+        height=500,
+        template="plotly_white",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+# Contributions des titres à la VaR
+def plot_var_contributions(contributions, title="Contributions à la VaR"):
+    """
+    Barres horizontales des contributions de chaque titre à la VaR ou à
+    la CVaR du portefeuille (une contribution négative réduit le risque).
+
+    Arguments:
+        contributions (Series): montants en euros par ticker
+    """
+    if contributions is None or contributions.empty:
+        return None
+
+    contributions = contributions.sort_values()
+    fig = go.Figure(go.Bar(
+        x=contributions.to_numpy(),
+        y=contributions.index,
+        orientation='h',
+        marker=dict(color=np.where(contributions.to_numpy() >= 0, '#693112', '#2c5f8a')),
+        text=[f"{v:,.0f} €".replace(",", " ") for v in contributions],
+        textposition='auto'
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title="Contribution (€)",
+        height=450,
+        margin=dict(l=10, r=10, t=40, b=10),
+        template="plotly_white"
+    )
+    return fig
+
+# Attribution de Brinson
+def plot_brinson(table, title="Attribution de performance"):
+    """
+    Effets d'allocation, de sélection et d'interaction de chaque groupe,
+    empilés (voir attribution.brinson).
+
+    Arguments:
+        table (DataFrame): une ligne par groupe, colonnes BRINSON_EFFECTS
+    """
+    if table is None or table.empty:
+        return None
+
+    colors = ['#693112', '#102040', '#C8AD7F']
+    fig = go.Figure()
+    for effect, color in zip(BRINSON_EFFECTS, colors):
+        fig.add_trace(go.Bar(
+            x=table.index,
+            y=table[effect].to_numpy(),
+            name=effect.replace(' (%)', ''),
+            marker=dict(color=color)
+        ))
+    fig.update_layout(
+        title=title,
+        barmode='relative',
+        yaxis_title="Effet (points de %)",
+        height=450,
+        template="plotly_white",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+# Carte de chaleur des corrélations
+def plot_correlation_heatmap(corr, title="Corrélations des rendements quotidiens"):
+    """
+    Carte de chaleur des corrélations, tickers réordonnés par
+    classification hiérarchique pour regrouper les titres liés.
+    """
+    if corr is None or corr.empty:
+        return None
+
+    order = cluster_order(corr)
+    corr = corr.loc[order, order]
+    fig = go.Figure(go.Heatmap(
+        z=corr.to_numpy(),
+        x=order,
+        y=order,
+        zmin=-1,
+        zmax=1,
+        colorscale=[[0, '#2c5f8a'], [0.5, '#f9f5f2'], [1, '#693112']],
+        text=np.round(corr.to_numpy(), 2),
+        texttemplate="%{text}",
+        hovertemplate="%{y} / %{x} : %{z:.2f}<extra></extra>"
+    ))
+    fig.update_layout(
+        title=title,
+        height=550,
+        template="plotly_white",
+        yaxis=dict(autorange="reversed")
+    )
+    return fig
+
+# Tracer une statistique glissante
+def plot_rolling_metric(values, title, yaxis_title, start_date=None, end_date=None,
+                        max_points=DEFAULT_MAX_POINTS):
+    """
+    Courbes d'une statistique glissante, une par ticker.
+
+    Arguments:
+        values (DataFrame): dates × tickers (voir rolling_stats.RollingStats)
+        max_points (int): points envoyés par courbe (LTTB, None : toutes les séances)
+    """
+    if start_date is not None:
+        values = values.loc[pd.Timestamp(start_date):]
+    if end_date is not None:
+        values = values.loc[:pd.Timestamp(end_date)]
+    values = values.dropna(axis=1, how="all")
+    if values.empty:
+        return None
+
+    fig = go.Figure()
+    for ticker in values.columns:
+        x, y = downsample(values.index, values[ticker].to_numpy(), max_points)
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=y,
+            mode='lines',
+            name=ticker,
+            line=dict(width=1.5)
+        ))
+    fig.update_layout(
+        title=title,
+        xaxis_title="Date",
+        yaxis_title=yaxis_title,
+        height=450,
+        template="plotly_white",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
 # Créer les graphiques à barres pour secteur et pays
 def create_bar_charts(df_sc):
     # Graphique secteur